@@ -1,48 +1,648 @@
 # Author: Nina Argade
 # Date: 3/11/2021
 
+import random
+from types import MappingProxyType
+
+# The board is stored as a flat bytearray of 90 small integers, one per space. A space's index is row * 9 + column,
+# where row 0 is rank 1 (Red's back rank) and column 0 is file a, so "a1" is 0, "e2" is 13 and "i10" is 89.
+# The lookup tables below are shared by every game and read-only: tuples, frozensets, and MappingProxyType views for
+# the dictionaries, so no game can change them for the others.
+
+# piece codes: the low three bits give the piece type and the BLUE bit marks a blue piece (RED pieces have it clear)
+EMPTY = 0
+GENERAL = 1
+GUARD = 2
+ELEPHANT = 3
+HORSE = 4
+CHARIOT = 5
+CANNON = 6
+SOLDIER = 7
+PIECE_TYPE = 7  # mask for the piece type bits
+
+RED = 0
+BLUE = 8
+
+# piece code to piece name as used by the 2D board and the update_board methods, and the reverse lookup
+PIECE_NAMES = (" ", "RGeneral", "RGuard", "RElephant", "RHorse", "RChariot", "RCannon", "RSoldier",
+               " ", "BGeneral", "BGuard", "BElephant", "BHorse", "BChariot", "BCannon", "BSoldier")
+PIECE_CODES = MappingProxyType({name: code if name != " " else EMPTY for code, name in enumerate(PIECE_NAMES)})
+
+# algebraic notation to board index, and board index to algebraic notation
+SQUARE_NAMES = tuple(column + str(row + 1) for row in range(10) for column in "abcdefghi")
+SQUARE_INDEX = MappingProxyType({name: square for square, name in enumerate(SQUARE_NAMES)})
+
+# palace membership and the palace spaces that have diagonal lines (corners and center)
+RED_PALACE = frozenset((3, 4, 5, 12, 13, 14, 21, 22, 23))  # d1-f3
+BLUE_PALACE = frozenset((66, 67, 68, 75, 76, 77, 84, 85, 86))  # d8-f10
+RED_DIAGONAL = frozenset((3, 5, 13, 21, 23))  # d1, f1, e2, d3, f3
+BLUE_DIAGONAL = frozenset((66, 68, 76, 84, 86))  # d8, f8, e9, d10, f10
+
+# each palace corner mapped to the palace center and the opposite corner along the same diagonal line
+PALACE_DIAGONALS = MappingProxyType({3: (13, 23), 5: (13, 21), 21: (13, 5), 23: (13, 3),
+                                     66: (76, 86), 68: (76, 84), 84: (76, 68), 86: (76, 66)})
+PALACE_CENTERS = MappingProxyType({13: (3, 5, 21, 23), 76: (66, 68, 84, 86)})  # center mapped to its four corners
+
+TEAM_COLORS = MappingProxyType({"red": RED, "blue": BLUE})  # team name as passed to is_in_check to piece color
+TURN_COLORS = MappingProxyType({"Red": RED, "Blue": BLUE})  # turn as returned by get_turn to piece color
+
+START_BOARD = (
+    5, 3, 4, 2, 0, 2, 3, 4, 5,  # rank 1
+    0, 0, 0, 0, 1, 0, 0, 0, 0,
+    0, 6, 0, 0, 0, 0, 0, 6, 0,
+    7, 0, 7, 0, 7, 0, 7, 0, 7,
+    0, 0, 0, 0, 0, 0, 0, 0, 0,
+    0, 0, 0, 0, 0, 0, 0, 0, 0,
+    15, 0, 15, 0, 15, 0, 15, 0, 15,
+    0, 14, 0, 0, 0, 0, 0, 14, 0,
+    0, 0, 0, 0, 9, 0, 0, 0, 0,
+    13, 11, 12, 10, 0, 10, 11, 12, 13,  # rank 10
+)
+
+
+def _ray_squares(square, row_step, column_step):
+    """Helper function that returns the indices walked from the passed board index (not included) to the edge of the
+    board in one direction."""
+
+    row, column = divmod(square, 9)
+    squares = []
+    row += row_step
+    column += column_step
+    while 0 <= row < 10 and 0 <= column < 9:
+        squares.append(row * 9 + column)
+        row += row_step
+        column += column_step
+    return tuple(squares)
+
+
+def _leg_moves(square, diagonal_steps):
+    """Helper function that maps every space a horse (one diagonal step) or an elephant (two diagonal steps) can reach
+    from the passed board index to the tuple of spaces it passes over, which must be empty for the move. Each move is
+    one orthogonal step followed by diagonal steps that keep going the same way and turn to one side."""
+
+    row, column = divmod(square, 9)
+    moves = {}
+    for row_step, column_step in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+        for side in (1, -1):
+            diagonal_row = row_step or side  # diagonal keeps the orthogonal direction and adds the side
+            diagonal_column = column_step or side
+            to_row = row + row_step
+            to_column = column + column_step
+            legs = []
+            for step in range(diagonal_steps):
+                legs.append(to_row * 9 + to_column)
+                to_row += diagonal_row
+                to_column += diagonal_column
+            if 0 <= to_row < 10 and 0 <= to_column < 9:  # the spaces passed over lie between, so they are on the board
+                moves[to_row * 9 + to_column] = tuple(legs)
+    return moves
+
+
+def _palace_steps(square, palace, diagonal):
+    """Helper function that returns the spaces a guard or general on the passed palace index can move to: one space
+    along a row or column, or one space along a palace diagonal line."""
+
+    row, column = divmod(square, 9)
+    steps = set()
+    for to_square in palace:
+        row_distance = abs(to_square // 9 - row)
+        column_distance = abs(to_square % 9 - column)
+        if row_distance + column_distance == 1:  # one space forward, backward or sideways
+            steps.add(to_square)
+        elif row_distance == 1 and column_distance == 1 and square in diagonal and to_square in diagonal:
+            steps.add(to_square)  # diagonal lines join each corner to the center
+    return frozenset(steps)
+
+
+def _soldier_steps(square, forward, diagonal):
+    """Helper function that returns the spaces a soldier on the passed board index can move to, given the row step
+    forward (1 for red, -1 for blue) and the diagonal spaces of the enemy palace: one space sideways or forward, or
+    one space diagonally forward along an enemy palace diagonal line."""
+
+    row, column = divmod(square, 9)
+    steps = set()
+    if column > 0:
+        steps.add(square - 1)
+    if column < 8:
+        steps.add(square + 1)
+    if 0 <= row + forward < 10:
+        steps.add(square + forward * 9)
+    if square in diagonal:  # only along a diagonal line, so both ends must be diagonal spaces
+        for to_square in diagonal:
+            if to_square // 9 == row + forward and abs(to_square % 9 - column) == 1:
+                steps.add(to_square)
+    return frozenset(steps)
+
+
+def _attack_table(moves):
+    """Helper function that turns the passed table of moves from every space around: for every target space, a tuple
+    of (from index, spaces passed over...) for each move that lands on it."""
+
+    attacks = [[] for square in range(90)]
+    for from_square, destinations in enumerate(moves):
+        for to_square, legs in destinations.items():
+            attacks[to_square].append((from_square,) + legs)
+    return tuple(tuple(moves) for moves in attacks)
+
+
+# precomputed move tables. For every board index: the four row/column rays leading out of it, the horse moves
+# (destination to the leg space that must be empty) and elephant moves (destination to the two spaces passed over),
+# the guard/general steps for palace spaces, and the soldier steps of each color. The attack tables turn the horse
+# and elephant moves around: for every target space, the (from index, leg spaces) of each move that lands on it.
+ORTHOGONAL_RAYS = tuple((_ray_squares(square, -1, 0), _ray_squares(square, 1, 0), _ray_squares(square, 0, -1),
+                         _ray_squares(square, 0, 1)) for square in range(90))
+_horse_legs = tuple(_leg_moves(square, 1) for square in range(90))
+HORSE_MOVES = tuple(MappingProxyType({to_square: legs[0] for to_square, legs in moves.items()})
+                    for moves in _horse_legs)
+HORSE_ATTACKS = _attack_table(_horse_legs)
+ELEPHANT_MOVES = tuple(MappingProxyType(_leg_moves(square, 2)) for square in range(90))
+ELEPHANT_ATTACKS = _attack_table(ELEPHANT_MOVES)
+PALACE_STEPS = MappingProxyType({square: _palace_steps(square, palace, diagonal)
+                                 for palace, diagonal in ((RED_PALACE, RED_DIAGONAL), (BLUE_PALACE, BLUE_DIAGONAL))
+                                 for square in palace})
+SOLDIER_STEPS = MappingProxyType({RED: tuple(_soldier_steps(square, 1, BLUE_DIAGONAL) for square in range(90)),
+                                  BLUE: tuple(_soldier_steps(square, -1, RED_DIAGONAL) for square in range(90))})
+SOLDIER_ATTACKS = MappingProxyType({color: _attack_table([dict.fromkeys(steps[square], ()) for square in range(90)])
+                                    for color, steps in SOLDIER_STEPS.items()})
+
+# rays followed by chariots and cannons: the four row/column rays of every space, plus the palace diagonal lines from
+# palace corners (through the center to the opposite corner) and from palace centers (to each corner). Lines run
+# both ways, so the rays reaching a space are the rays leaving it. RAY_PATHS maps every space on a ray to the spaces
+# strictly between it and the start, for checking a single move.
+SLIDING_RAYS = tuple(ORTHOGONAL_RAYS[square] + ((PALACE_DIAGONALS[square],) if square in PALACE_DIAGONALS else
+                                                tuple((corner,) for corner in PALACE_CENTERS.get(square, ())))
+                     for square in range(90))
+RAY_PATHS = tuple(MappingProxyType({to_square: ray[:index] for ray in rays for index, to_square in enumerate(ray)})
+                  for rays in SLIDING_RAYS)
+
+# Zobrist keys: a fixed random 64-bit number for every (piece code, board index) pair and one for Blue to move. The
+# hash of a position is the XOR of the keys of every occupied space, so moving a piece only XORs a few keys in and out.
+# Keys for the empty code are zero. The generator is seeded so hashes are the same in every process.
+_zobrist_random = random.Random(0x4A616E676769)
+ZOBRIST_KEYS = tuple(tuple(0 if name == " " else _zobrist_random.getrandbits(64) for square in range(90))
+                     for name in PIECE_NAMES)
+ZOBRIST_BLUE_TO_MOVE = _zobrist_random.getrandbits(64)
+
+
+def board_hash(board):
+    """Function that computes the Zobrist hash of the pieces on the passed parameter board (a sequence of 90 piece
+    codes) from scratch, not including the side to move."""
+
+    hash_value = 0
+    for square, piece in enumerate(board):
+        if piece:  # empty spaces have zero keys
+            hash_value ^= ZOBRIST_KEYS[piece][square]
+    return hash_value
+
+
+START_HASH = board_hash(START_BOARD)
+
+
+def piece_masks(board):
+    """Function that returns the piece masks of the passed parameter board (a sequence of 90 piece codes): a list of
+    two integers, for red and for blue (indexed by color >> 3), with bit n set when that side has a piece on board
+    index n."""
+
+    masks = [0, 0]
+    for square, piece in enumerate(board):
+        if piece:
+            masks[piece >> 3] |= 1 << square
+    return masks
+
+
+START_MASKS = tuple(piece_masks(START_BOARD))
+
+# material value of each piece type in centipawn-like units, indexed by piece code & PIECE_TYPE (the general is never
+# captured, so it has none)
+PIECE_VALUES = (0, 0, 300, 300, 500, 1300, 700, 200)
+
+# piece-square bonus of each piece type, written from Red's side: the first row is rank 1 and the columns run a to i.
+# Blue uses the same tables mirrored top to bottom. Generals and guards only ever stand in the palace.
+_PIECE_SQUARE_TABLES = {
+    GENERAL: (0, 0, 0, -10, -5, -10, 0, 0, 0,
+              0, 0, 0, -5, 10, -5, 0, 0, 0,
+              0, 0, 0, -20, -15, -20, 0, 0, 0) + (0,) * 63,
+    GUARD: (0, 0, 0, 5, 0, 5, 0, 0, 0,
+            0, 0, 0, 0, 10, 0, 0, 0, 0,
+            0, 0, 0, -5, 0, -5, 0, 0, 0) + (0,) * 63,
+    ELEPHANT: (0, 0, 0, 0, 0, 0, 0, 0, 0,
+               0, 0, 0, 0, 0, 0, 0, 0, 0,
+               0, 0, 5, 0, 5, 0, 5, 0, 0,
+               0, 5, 5, 5, 10, 5, 5, 5, 0,
+               0, 5, 10, 10, 10, 10, 10, 5, 0,
+               0, 5, 10, 10, 10, 10, 10, 5, 0,
+               0, 5, 10, 10, 10, 10, 10, 5, 0,
+               0, 5, 5, 10, 10, 10, 5, 5, 0,
+               0, 0, 5, 5, 5, 5, 5, 0, 0,
+               0, 0, 0, 0, 0, 0, 0, 0, 0),
+    HORSE: (-20, -10, -5, -5, -5, -5, -5, -10, -20,
+            -10, 0, 5, 0, -5, 0, 5, 0, -10,
+            -5, 5, 10, 10, 10, 10, 10, 5, -5,
+            -5, 10, 15, 15, 15, 15, 15, 10, -5,
+            -5, 10, 15, 20, 20, 20, 15, 10, -5,
+            -5, 10, 15, 20, 20, 20, 15, 10, -5,
+            -5, 10, 20, 25, 25, 25, 20, 10, -5,
+            -5, 10, 20, 30, 25, 30, 20, 10, -5,
+            -10, 5, 10, 20, 20, 20, 10, 5, -10,
+            -20, -10, 0, 0, 0, 0, 0, -10, -20),
+    CHARIOT: (-5, 0, 0, 5, 0, 5, 0, 0, -5,
+              0, 0, 0, 5, 5, 5, 0, 0, 0,
+              0, 5, 5, 5, 5, 5, 5, 5, 0,
+              0, 5, 5, 10, 10, 10, 5, 5, 0,
+              5, 10, 10, 10, 10, 10, 10, 10, 5,
+              5, 10, 10, 10, 10, 10, 10, 10, 5,
+              5, 10, 10, 15, 15, 15, 10, 10, 5,
+              10, 15, 15, 25, 20, 25, 15, 15, 10,
+              10, 15, 15, 25, 30, 25, 15, 15, 10,
+              5, 10, 10, 20, 20, 20, 10, 10, 5),
+    CANNON: (0, 0, 5, 10, 10, 10, 5, 0, 0,
+             0, 5, 5, 5, 15, 5, 5, 5, 0,
+             0, 5, 0, 0, 5, 0, 0, 5, 0,
+             0, 0, 0, 0, 5, 0, 0, 0, 0,
+             0, 0, 0, 0, 5, 0, 0, 0, 0,
+             0, 0, 0, 0, 5, 0, 0, 0, 0,
+             0, 0, 0, 0, 5, 0, 0, 0, 0,
+             0, 0, 0, 5, 10, 5, 0, 0, 0,
+             0, 0, 0, 10, 20, 10, 0, 0, 0,
+             0, 0, 0, 10, 10, 10, 0, 0, 0),
+    SOLDIER: (0,) * 36 +
+             (5, 5, 10, 15, 20, 15, 10, 5, 5,
+              10, 15, 20, 25, 30, 25, 20, 15, 10,
+              15, 20, 30, 40, 45, 40, 30, 20, 15,
+              15, 25, 35, 55, 60, 55, 35, 25, 15,
+              10, 20, 30, 60, 70, 60, 30, 20, 10,
+              0, 5, 10, 40, 30, 40, 10, 5, 0),
+}
+
+
+def _piece_square_scores(code):
+    """Helper function that returns the material value plus piece-square bonus of the passed piece code on each of
+    the 90 board indices, positive for Blue pieces and negative for Red pieces. Codes that are not pieces score 0."""
+
+    kind = code & PIECE_TYPE
+    if kind == EMPTY:
+        return (0,) * 90
+    table = _PIECE_SQUARE_TABLES[kind]
+    if code & BLUE:  # mirror the rows, so Blue's back rank reads as rank 1
+        return tuple(PIECE_VALUES[kind] + table[(9 - square // 9) * 9 + square % 9] for square in range(90))
+    return tuple(-PIECE_VALUES[kind] - table[square] for square in range(90))
+
+
+# material and piece-square score of every (piece code, board index) pair, from Blue's point of view. Like the
+# Zobrist hash, the score of a position is a sum over the occupied spaces, so a move only adds and subtracts a few.
+PIECE_SQUARE_SCORES = tuple(_piece_square_scores(code) for code in range(len(PIECE_NAMES)))
+
+
+def piece_square_score(board):
+    """Function that computes the material and piece-square score of the passed parameter board (a sequence of 90
+    piece codes) from scratch, from Blue's point of view."""
+
+    score = 0
+    for square, piece in enumerate(board):
+        if piece:
+            score += PIECE_SQUARE_SCORES[piece][square]
+    return score
+
+
+START_PIECE_SQUARE_SCORE = piece_square_score(START_BOARD)
+
+# points of each piece type for ending a game on points, indexed by piece code & PIECE_TYPE, and the deom bonus Red
+# gets for moving second. Both sides' totals are kept in one integer: Red's in the low POINTS_SHIFT bits and Blue's
+# above them, so PIECE_POINTS holds each piece code's points already shifted to its side and a capture is one
+# subtraction.
+POINT_VALUES = (0, 0, 3, 3, 5, 13, 7, 2)
+DEOM_BONUS = 1.5
+POINTS_SHIFT = 16
+PIECE_POINTS = tuple(POINT_VALUES[code & PIECE_TYPE] << (POINTS_SHIFT if code & BLUE else 0)
+                     for code in range(len(PIECE_NAMES)))
+
+
+def board_points(board):
+    """Function that returns the points of both sides' pieces on the passed parameter board (a sequence of 90 piece
+    codes), packed into one integer as described at PIECE_POINTS."""
+    return sum(PIECE_POINTS[piece] for piece in board)
+
+
+START_POINTS = board_points(START_BOARD)
+
+# opening setups: before play each side chooses the order of its horses and elephants on the b, c, g and h files of
+# its back rank, written as letters for those four files (E for elephant, H for horse). START_BOARD uses EHEH for both.
+SETUPS = ("EHEH", "HEHE", "HEEH", "EHHE")
+_SETUP_FILES = (1, 2, 6, 7)  # columns of the b, c, g and h files
+
+
+def setup_board(setup_red="EHEH", setup_blue="EHEH"):
+    """Function that returns the opening board (a tuple of 90 piece codes) with Red's and Blue's horses and elephants
+    in the passed SETUPS arrangements. Raises ValueError for an arrangement that is not in SETUPS."""
+
+    if setup_red not in SETUPS or setup_blue not in SETUPS:
+        raise ValueError("setups must be one of %s, not %r and %r" % (", ".join(SETUPS), setup_red, setup_blue))
+    board = list(START_BOARD)
+    for setup, row, color in ((setup_red, 0, RED), (setup_blue, 9, BLUE)):
+        for column, letter in zip(_SETUP_FILES, setup):
+            board[row * 9 + column] = color | (HORSE if letter == "H" else ELEPHANT)
+    return tuple(board)
+
+
+def _setup_positions():
+    """Helper function that returns a dictionary from every (red setup, blue setup) pair to what __init__ and reset
+    need for it: the opening board as bytes, its hash, its piece masks and its piece-square score. The generals and
+    the points are the same in every setup."""
+
+    positions = {}
+    for setup_red in SETUPS:
+        for setup_blue in SETUPS:
+            board = setup_board(setup_red, setup_blue)
+            positions[setup_red, setup_blue] = (bytes(board), board_hash(board), tuple(piece_masks(board)),
+                                                piece_square_score(board))
+    return positions
+
+
+# the opening positions of every pair of setups, built once on import, and their boards by hash
+SETUP_POSITIONS = MappingProxyType(_setup_positions())
+_OPENING_BOARDS = MappingProxyType({position[1]: position[0] for position in SETUP_POSITIONS.values()})
+
+# legal moves of either side in an opening position, keyed by (board hash, color), so _legal_moves only generates
+# them the first time each one is asked for
+OPENING_MOVES = {}
+
+# draw rules checked by make_move. Bikjang: the generals face each other on a file with no piece between them, and
+# the player to move does not break it, so the generals still face each other after the move. GENERALS_BETWEEN maps
+# every (red general index, blue general index) pair on the same file to the mask of the spaces between them, so the
+# test is one lookup and one AND with the piece masks. Repetition: the same position with the same player to move
+# comes up for the REPETITION_LIMIT time.
+GENERALS_BETWEEN = MappingProxyType({(red, blue): sum(1 << square for square in range(red + 9, blue, 9))
+                                     for red in RED_PALACE for blue in BLUE_PALACE if red % 9 == blue % 9})
+REPETITION_LIMIT = 3
+
+# binary position format used by to_bytes and from_bytes: 45 bytes holding two 4-bit piece codes each (the even board
+# index in the low half of the byte, the odd index in the high half), then one flags byte whose bit 0 is set when Blue
+# is to move and whose higher bits hold the index of the game state in GAME_STATES
+GAME_STATES = ("UNFINISHED", "RED_WON", "BLUE_WON", "BIKJANG_DRAW", "REPETITION_DRAW")
+POSITION_BYTES = 46
+_LOW_NIBBLES = bytes(byte & 15 for byte in range(256))  # byte value to its low 4 bits
+_HIGH_NIBBLES = bytes(byte >> 4 for byte in range(256))  # byte value to its high 4 bits
+_NIBBLE_SHIFT = bytes((byte << 4) & 255 for byte in range(256))  # piece code to the same code in the high 4 bits
+
+# FEN-style text notation used by to_fen and from_fen: "<ranks> <turn> <state>". The ranks run from rank 10 down to
+# rank 1 separated by "/", with a letter per piece (Blue upper case, Red lower case) and a digit for each run of empty
+# spaces; the turn is "b" or "r" and the state is a letter from FEN_STATES.
+START_FEN = "RBNA1ABNR/4K4/1C5C1/P1P1P1P1P/9/9/p1p1p1p1p/1c5c1/4k4/rbna1abnr b U"
+FEN_STATES = MappingProxyType({"UNFINISHED": "U", "RED_WON": "R", "BLUE_WON": "B", "BIKJANG_DRAW": "J",
+                               "REPETITION_DRAW": "D"})
+_FEN_STATE_NAMES = MappingProxyType({letter: state for state, letter in FEN_STATES.items()})
+_FEN_LETTERS = "1kabnrcp KABNRCP"  # letter of each piece code; "1" marks an empty space before runs are counted
+_FEN_INVALID = 255  # placeholder code for characters that are not pieces
+_FEN_CODES = bytes(_FEN_LETTERS.index(chr(byte)) if chr(byte) in _FEN_LETTERS and chr(byte) != " " else _FEN_INVALID
+                   for byte in range(256))  # ASCII byte to piece code
+_FEN_EXPAND = {ord(str(count)): "1" * count for count in range(2, 10)}  # empty run digit to one "1" per space
+
+
+class BoardRow(list):
+    """Class represents one row of piece names in the board returned by JanggiGame._board_space. It reads and compares
+    like a list of 9 names, and setting a space (by index or slice) puts that piece on the game's board, as if the
+    whole board had been set up again through _board_space. Changes that would add or remove spaces raise
+    TypeError."""
+
+    __slots__ = ("_game", "_row")
+
+    def __init__(self, game, row):
+        """Initializes the row with the names of the pieces on the passed row of the passed game's board."""
+        super().__init__(PIECE_NAMES[piece] for piece in game._board[row * 9:row * 9 + 9])
+        self._game = game
+        self._row = row
+
+    def __setitem__(self, index, name):
+        """Sets the space or spaces at the passed index or slice to the passed piece name (or names), in this row and
+        on the game's board. Raises KeyError for a name that is not a piece name."""
+
+        columns = range(9)[index]
+        if isinstance(columns, range):  # slice
+            names = list(name)
+            if len(names) != len(columns):
+                raise TypeError("a board row has a fixed number of spaces")
+        else:
+            columns, names = (columns,), (name,)
+        for column, piece_name in zip(columns, names):
+            self._game._set_square(self._row * 9 + column, piece_name)
+            super().__setitem__(column, piece_name)
+
+    def _fixed_size(self, *args, **kwargs):
+        """Raises TypeError for list methods that would add, remove or reorder spaces."""
+        raise TypeError("a board row has a fixed number of spaces; set them by index")
+
+    __delitem__ = __iadd__ = __imul__ = append = extend = insert = pop = remove = clear = sort = reverse = _fixed_size
+
+
+class BoardSpace(list):
+    """Class represents the board returned by JanggiGame._board_space: a list of 10 BoardRow lists, so it compares
+    equal to a plain list of lists with the same piece names. Rows cannot be replaced, added or removed (TypeError);
+    set their spaces instead."""
+
+    __slots__ = ()
+
+    def _fixed_rows(self, *args, **kwargs):
+        """Raises TypeError for list methods that would replace, add, remove or reorder rows."""
+        raise TypeError("board rows cannot be replaced; set their spaces by index")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = append = extend = insert = pop = remove = clear = sort = \
+        reverse = _fixed_rows
+
+
 # noinspection PyUnreachableCode
 class JanggiGame:
     """Class represents the Korean chess game Janggi. This class contains an init method to initialize the game board,
     turn taking and game state. The class contains many methods to execute game play for the various pieces, as well as
     a method to check if a player is in check or checkmate."""
 
-    def __init__(self):
-        """Initializes all data members for class JanggiGame, including a board representation in a 2D array, a
-        dictionary to convert algebraic notation to numbered coordinates, a turn keeper, and game state."""
-
-        # initialize board as 2-D array containing game pieces at coordinates
-        self._board_space = [
-            ["RChariot", "RElephant", "RHorse", "RGuard", " ", "RGuard", "RElephant", "RHorse", "RChariot"],
-            [" ", " ", " ", " ", "RGeneral", " ", " ", " ", " "],
-            [" ", "RCannon", " ", " ", " ", " ", " ", "RCannon", " "],
-            ["RSoldier", " ", "RSoldier", " ", "RSoldier", " ", "RSoldier", " ", "RSoldier"],
-            [" ", " ", " ", " ", " ", " ", " ", " ", " "],
-            [" ", " ", " ", " ", " ", " ", " ", " ", " "],
-            ["BSoldier", " ", "BSoldier", " ", "BSoldier", " ", "BSoldier", " ", "BSoldier"],
-            [" ", "BCannon", " ", " ", " "," ", " ", "BCannon", " "],
-            [" ", " ", " ", " ", "BGeneral", " ", " ", " ", " "],
-            ["BChariot", "BElephant", "BHorse", "BGuard", " ", "BGuard", "BElephant", "BHorse", "BChariot"],
-        ]
-
-        # initialize a dictionary to convert algebraic board notation into coordinates to access game pieces
-        self._board_dict = {"a1": "00", "b1": "01", "c1": "02", "d1": "03", "e1": "04", "f1": "05", "g1": "06",
-                            "h1": "07", "i1": "08", "a2": "10", "b2": "11", "c2": "12", "d2": "13", "e2": "14",
-                            "f2": "15", "g2": "16", "h2": "17", "i2": "18", "a3": "20", "b3": "21", "c3": "22",
-                            "d3": "23", "e3": "24", "f3": "25", "g3": "26", "h3": "27", "i3": "28", "a4": "30",
-                            "b4": "31", "c4": "32", "d4": "33", "e4": "34", "f4": "35", "g4": "36", "h4": "37",
-                            "i4": "38", "a5": "40", "b5": "41", "c5": "42", "d5": "43", "e5": "44", "f5": "45",
-                            "g5": "46", "h5": "47", "i5": "48", "a6": "50", "b6": "51", "c6": "52", "d6": "53",
-                            "e6": "54", "f6": "55", "g6": "56", "h6": "57", "i6": "58", "a7": "60", "b7": "61",
-                            "c7": "62", "d7": "63", "e7": "64", "f7": "65", "g7": "66", "h7": "67", "i7": "68",
-                            "a8": "70", "b8": "71", "c8": "72", "d8": "73", "e8": "74", "f8": "75", "g8": "76",
-                            "h8": "77", "i8": "78", "a9": "80", "b9": "81", "c9": "82", "d9": "83", "e9": "84",
-                            "f9": "85", "g9": "86", "h9": "87", "i9": "88", "a10": "90", "b10": "91", "c10": "92",
-                            "d10": "93", "e10": "94", "f10": "95", "g10": "96", "h10": "97", "i10": "98"}
+    # every game keeps only these few attributes (no per-instance __dict__); all lookup tables are module level and
+    # shared by every game, so an idle game takes a few hundred bytes
+    __slots__ = ("_board", "_hash", "_turn", "_game_state", "_move_stack", "_general_square", "_piece_masks",
+                 "_piece_square_score", "_position_counts", "_points", "_move_limit")
+
+    def __init__(self, move_limit=None, setup_red="EHEH", setup_blue="EHEH"):
+        """Initializes all data members for class JanggiGame, including a board representation as a flat bytearray
+        of piece codes, a turn keeper, and game state. With a move_limit, the game ends on points once that many moves
+        (including passes) have been made since the position was set up, see get_score. setup_red and setup_blue
+        choose each side's horse and elephant arrangement from SETUPS; the opening positions are built once in
+        SETUP_POSITIONS, so this only copies them. Raises ValueError for an arrangement that is not in SETUPS."""
+
+        start = SETUP_POSITIONS.get((setup_red, setup_blue))
+        if start is None:
+            setup_board(setup_red, setup_blue)  # raises the error for the unknown arrangement
+        board, board_hash_value, masks, score = start
+
+        self._board = bytearray(board)  # piece code of every space, indexed by board index
+
+        self._hash = board_hash_value  # Zobrist hash of the pieces on the board, updated with every move
 
         self._turn = "Blue"  # Blue player starts the game
 
-        self._game_state = "UNFINISHED"  # default game state; can change to RED_WON or BLUE_WON
+        self._game_state = "UNFINISHED"  # default game state; can change to RED_WON, BLUE_WON or one of the draws
+
+        # one (from index, to index, captured piece, previous turn, previous game state) record per move made, so
+        # every move can be taken back exactly
+        self._move_stack = []
+
+        # board index of the red and blue general (indexed by color >> 3), kept up to date as generals move so checks
+        # do not scan the board
+        self._general_square = [13, 76]
+
+        # bit n of each side's mask is set when that side has a piece on board index n (indexed by color >> 3), kept
+        # up to date move by move so each side's pieces are found without scanning the board
+        self._piece_masks = list(masks)
+
+        # material and piece-square score of the board from Blue's point of view, updated with every move
+        self._piece_square_score = score
+
+        # number of times each position (by position_hash) has come up since the position was set up, for the
+        # repetition rule; None until the first make_move, so idle games do not hold a dictionary
+        self._position_counts = None
+
+        # points of both sides' pieces packed into one integer (see PIECE_POINTS), updated as pieces are captured
+        self._points = START_POINTS
+
+        self._move_limit = move_limit  # number of moves after which the game ends on points, or None for no limit
+
+    @property
+    def _board_space(self):
+        """The board as a 2D array of piece names, indexed by [row][column]: a BoardSpace list of 10 BoardRow lists
+        built from the integer board. Setting a space in a row, as in game._board_space[3][4] = " ", writes it to the
+        board; assign a whole new 2D array to set up a position."""
+        return BoardSpace(BoardRow(self, row) for row in range(10))
+
+    @_board_space.setter
+    def _board_space(self, board_space):
+        """Sets up the board from a 2D array of piece names. Moves made before cannot be undone afterwards."""
+        self._load_board(bytearray(PIECE_CODES[name] for row in board_space for name in row))
+
+    def _set_square(self, square, name):
+        """Helper method that puts the piece with the passed name (" " for none) on the passed board index, as if the
+        whole board had been set up again through _board_space, so moves made before cannot be undone afterwards.
+        Raises KeyError for a name that is not a piece name."""
+
+        board = bytearray(self._board)
+        board[square] = PIECE_CODES[name]
+        self._load_board(board)
+
+    def _load_board(self, board):
+        """Helper method that makes the passed bytearray of 90 piece codes the board and rebuilds everything that is
+        otherwise kept up to date move by move: the hash, the general locations, the piece masks and the piece-square
+        score. The move stack is emptied, so moves made before cannot be undone afterwards."""
+
+        self._board = board
+        self._hash = board_hash(board)
+        self._move_stack = []
+        self._general_square = [board.index(RED | GENERAL) if RED | GENERAL in board else 13,
+                                board.index(BLUE | GENERAL) if BLUE | GENERAL in board else 76]
+        self._piece_masks = piece_masks(board)
+        self._piece_square_score = piece_square_score(board)
+        self._position_counts = None
+        self._points = board_points(board)
+
+    def to_bytes(self):
+        """Method to encode the position (the 90 spaces, whose turn it is and the game state) as POSITION_BYTES
+        bytes. The move stack is not included."""
+
+        board = self._board
+        packed = int.from_bytes(board[0::2], "little") | int.from_bytes(board[1::2].translate(_NIBBLE_SHIFT), "little")
+        flags = GAME_STATES.index(self._game_state) << 1 | (self._turn == "Blue")
+        return packed.to_bytes(45, "little") + bytes((flags,))
+
+    def load_bytes(self, data):
+        """Method to set up this game from the passed POSITION_BYTES bytes (any bytes-like object, such as a slice of
+        a memoryview) written by to_bytes. Moves made before cannot be undone afterwards. Raises ValueError if the data
+        is not a valid encoding."""
+
+        if len(data) != POSITION_BYTES:
+            raise ValueError("position data must be %d bytes, not %d" % (POSITION_BYTES, len(data)))
+        packed = bytes(data[:45])
+        board = bytearray(90)
+        board[0::2] = packed.translate(_LOW_NIBBLES)
+        board[1::2] = packed.translate(_HIGH_NIBBLES)
+        flags = data[45]
+        if BLUE in board or flags >> 1 >= len(GAME_STATES):  # code 8 is not a piece
+            raise ValueError("invalid position data")
+
+        self._load_board(board)
+        self._turn = "Blue" if flags & 1 else "Red"
+        self._game_state = GAME_STATES[flags >> 1]
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Method to create a new game set up from the passed POSITION_BYTES bytes written by to_bytes."""
+        game = cls.__new__(cls)  # __init__ would only build a board to replace
+        game._move_limit = None  # load_bytes sets every other attribute
+        game.load_bytes(data)
+        return game
+
+    def to_fen(self):
+        """Method to write the position (the 90 spaces, whose turn it is and the game state) in the FEN-style notation
+        described at START_FEN. The move stack is not included."""
+
+        board = self._board
+        placement = "/".join(board[row * 9:row * 9 + 9].decode("latin-1") for row in range(9, -1, -1))
+        placement = placement.translate(_FEN_LETTERS)
+        for count in range(9, 1, -1):  # longest runs of empty spaces first
+            placement = placement.replace("1" * count, str(count))
+        return "%s %s %s" % (placement, "b" if self._turn == "Blue" else "r", FEN_STATES[self._game_state])
+
+    def load_fen(self, fen):
+        """Method to set up this game from the passed string in the FEN-style notation described at START_FEN. Moves
+        made before cannot be undone afterwards. Raises ValueError if the string is not valid notation."""
+
+        fields = fen.split()
+        if len(fields) != 3 or fields[1] not in ("b", "r") or fields[2] not in _FEN_STATE_NAMES:
+            raise ValueError("invalid FEN: %r" % fen)
+        ranks = fields[0].translate(_FEN_EXPAND).split("/")
+        if len(ranks) != 10 or any(len(rank) != 9 for rank in ranks) or not fields[0].isascii():
+            raise ValueError("invalid FEN board: %r" % fields[0])
+        board = bytearray("".join(reversed(ranks)).encode("ascii").translate(_FEN_CODES))
+        if _FEN_INVALID in board:
+            raise ValueError("invalid FEN board: %r" % fields[0])
+
+        self._load_board(board)
+        self._turn = "Blue" if fields[1] == "b" else "Red"
+        self._game_state = _FEN_STATE_NAMES[fields[2]]
+
+    @classmethod
+    def from_fen(cls, fen):
+        """Method to create a new game set up from the passed string in the FEN-style notation described at
+        START_FEN."""
+        game = cls.__new__(cls)
+        game._move_limit = None  # load_fen sets every other attribute
+        game.load_fen(fen)
+        return game
+
+    def reset(self, setup_red="EHEH", setup_blue="EHEH"):
+        """Method to set the game back to the opening position with Blue to move, with each side's horses and
+        elephants in the passed SETUPS arrangements, reusing the existing board and move stack so one game object can
+        replay many games. Raises ValueError for an arrangement that is not in SETUPS."""
+
+        start = SETUP_POSITIONS.get((setup_red, setup_blue))
+        if start is None:
+            setup_board(setup_red, setup_blue)  # raises the error for the unknown arrangement
+        board, board_hash_value, masks, score = start
+
+        self._board[:] = board
+        self._hash = board_hash_value
+        self._turn = "Blue"
+        self._game_state = "UNFINISHED"
+        self._move_stack.clear()
+        self._general_square[:] = (13, 76)
+        self._piece_masks[:] = masks
+        self._piece_square_score = score
+        self._position_counts = None
+        self._points = START_POINTS
+
+    def position_hash(self):
+        """Method to get a 64-bit Zobrist hash of the position: the pieces on the board and whose turn it is. Equal
+        positions always have equal hashes, and the hash is kept up to date move by move, so this runs in constant
+        time."""
+
+        if self._turn == "Blue":
+            return self._hash ^ ZOBRIST_BLUE_TO_MOVE
+        return self._hash
 
     def get_turn(self):
         """Method to get whose turn it is."""
@@ -54,1041 +654,654 @@ class JanggiGame:
         return self._turn
 
     def get_game_state(self):
-        """Method to get game state. Default status is UNFINISHED."""
+        """Method to get game state. Default status is UNFINISHED. A won game is RED_WON or BLUE_WON, and a drawn game
+        is BIKJANG_DRAW (the generals were left facing each other) or REPETITION_DRAW (a position came up for the
+        REPETITION_LIMIT time)."""
         return self._game_state
 
+    def get_score(self):
+        """Method to get the points of each team's pieces still on the board, as a dictionary from "Red" and "Blue"
+        to points: 13 for a chariot, 7 for a cannon, 5 for a horse, 3 for an elephant or a guard and 2 for a soldier,
+        plus DEOM_BONUS for Red. The points are kept up to date as pieces are captured, so this runs in constant
+        time."""
+
+        points = self._points
+        return {"Red": (points & ((1 << POINTS_SHIFT) - 1)) + DEOM_BONUS, "Blue": points >> POINTS_SHIFT}
+
     def set_game_state(self, state):
         """Method to set the game state to the player who has won. If a team has been checkmated, the game state will
         be set the opposite team having won."""
-        self._game_state = state  # can be RED_WON or BLUE_WON
+        self._game_state = state  # can be RED_WON, BLUE_WON or one of the draws
         return self._game_state
 
-    def is_in_check(self, team):
-        """Method to check if the passed parameter team color is in check. This method is called at the end
-        of every turn, which means it is called at the end of the make_move method. Method will return True if the
-        player is in check and False if the player is not"""
-
-        if team == "red":
-            for i in range(10):  # iterate through game board rows
-                for j in range(9):  # iterate through game board columns
-                    if self._board_space[i][j] == "RGeneral":
-                        red_general_coordinate = str(i) + str(j)  # find 2D array coordinate of red general
-
-                        for algebraic_space, coordinate in self._board_dict.items():
-                            if coordinate == red_general_coordinate:
-                                red_general_space = algebraic_space   # find key space corresponding to red general
-
-                                key_list = []
-                                for key in self._board_dict:
-                                    key_list.append(key)
-                                key_list.remove(red_general_space)  # all potential piece spaces (minus king space)
-                                for key in key_list:  # check if any piece can kill king
-                                    board_space_piece = self._board_dict[key]  # convert dict key to board space
-                                    key_row = int(board_space_piece[0])
-                                    key_column = int(board_space_piece[1])
-
-                                    if self._board_space[key_row][key_column] == "BSoldier":
-                                        status = self.blue_soldier_validate_move(key, red_general_space)
-                                        if status is True:  # if piece can kill king
-                                            return True
-                                    if self._board_space[key_row][key_column] == "BCannon":
-                                        status = self.blue_cannon_validate_move(key, red_general_space)
-                                        if status is True:
-                                            return True
-                                    if self._board_space[key_row][key_column] == "BChariot":
-                                        status = self.blue_chariot_validate_move(key, red_general_space)
-                                        if status is True:
-                                            return True
-                                    if self._board_space[key_row][key_column] == "BElephant":
-                                        status = self.blue_elephant_validate_move(key, red_general_space)
-                                        if status is True:
-                                            return True
-                                    if self._board_space[key_row][key_column] == "BHorse":
-                                        status = self.blue_horse_validate_move(key, red_general_space)
-                                        if status is True:
-                                            return True
-                                    if self._board_space[key_row][key_column] == "BGuard":
-                                        status = self.blue_guard_validate_move(key, red_general_space)
-                                        if status is True:
-                                            return True
-                                    if self._board_space[key_row][key_column] == "BGeneral":
-                                        status = self.blue_general_validate_move(key, red_general_space)
-                                        if status is True:
-                                            return True
-
-                                # if none of the above is true, then king cannot be killed by opposing team piece
-                                # which means check status is False
-                                return False
-
-        if team == "blue":
-            for i in range(10):  # iterate through game board rows
-                for j in range(9):  # iterate through game board columns
-                    if self._board_space[i][j] == "BGeneral":
-                        blue_general_coordinate = str(i) + str(j)  # find 2D array coordinate of blue general
-
-                        for algebraic_space, coordinate in self._board_dict.items():
-                            if coordinate == blue_general_coordinate:
-                                blue_general_space = algebraic_space  # find key space corresponding to blue general
-
-                                key_list = []
-                                for key in self._board_dict:
-                                    key_list.append(key)
-                                key_list.remove(blue_general_space)  # all potential piece spaces (minus king space)
-                                for key in key_list:  # check if any piece can kill king
-                                    board_space_piece = self._board_dict[key]  # convert dict key to board space
-                                    key_row = int(board_space_piece[0])
-                                    key_column = int(board_space_piece[1])
-
-                                    if self._board_space[key_row][key_column] == "RSoldier":
-                                        status = self.red_soldier_validate_move(key, blue_general_space)
-                                        if status is True:  # if piece can kill king
-                                            return True
-                                    if self._board_space[key_row][key_column] == "RCannon":
-                                        status = self.red_cannon_validate_move(key, blue_general_space)
-                                        if status is True:
-                                            return True
-                                    if self._board_space[key_row][key_column] == "RChariot":
-                                        status = self.red_chariot_validate_move(key, blue_general_space)
-                                        if status is True:
-                                            return True
-                                    if self._board_space[key_row][key_column] == "RElephant":
-                                        status = self.red_elephant_validate_move(key, blue_general_space)
-                                        if status is True:
-                                            return True
-                                    if self._board_space[key_row][key_column] == "RHorse":
-                                        status = self.red_horse_validate_move(key, blue_general_space)
-                                        if status is True:
-                                            return True
-                                    if self._board_space[key_row][key_column] == "RGuard":
-                                        status = self.red_guard_validate_move(key, blue_general_space)
-                                        if status is True:
-                                            return True
-                                    if self._board_space[key_row][key_column] == "RGeneral":
-                                        status = self.red_general_validate_move(key, blue_general_space)
-                                        if status is True:
-                                            return True
-
-                                # if none of the above is true, then king cannot be killed by opposing team piece
-                                # which means check status is False
-                                return False
-
-    def is_in_checkmate_blue(self):
-        """Method to check if the Blue team has been checkmated. This method is called at the end of every turn, which
-        means it is called at the end of the make_move method, after the is_in_check method is called. Method will
-        return True if the player has been checkmated and False if the player is not."""
-
-        for i in range(10):  # iterate through game board rows
-            for j in range(9):  # iterate through game board columns
-                if self._board_space[i][j] == "BGeneral":
-                    blue_general_coordinate = str(i) + str(j)  # find 2D array coordinate of blue general
-
-                    for algebraic_space, coordinate in self._board_dict.items():
-                        if coordinate == blue_general_coordinate:
-                            blue_general_space = algebraic_space  # find key space corresponding to blue general
-
-                    # list of coordinate spaces blue king could move to to get out of check
-                    coordinate_list = [str(i)+str(j-1), str(i)+str(j+1), str(i-1)+str(j-1), str(i-1)+str(j),
-                                       str(i-1)+str(j+1), str(i+1)+str(j-1), str(i+1)+str(j), str(i+1)+str(j+1)]
-
-                    # list of board dictionary key spaces blue king could move to to get out of check
-                    potential_king_space_key_list = []
-                    for key, value in self._board_dict.items():
-                        for coordinate in coordinate_list:
-                            if value == coordinate in coordinate_list:
-                                potential_king_space_key_list.append(key)
-
-                                any_piece_key_list = []
-                                for piece_key in self._board_dict:
-                                    any_piece_key_list.append(piece_key)  # list of all piece locations
-                                any_piece_key_list.remove(blue_general_space)  # remove king location
-                                for piece_key in any_piece_key_list:  # check if any piece can kill king
-                                    board_space_piece = self._board_dict[piece_key]  # convert dict key to board coord
-                                    piece_key_row = int(board_space_piece[0])  # convert dict key to board coord row
-                                    piece_key_column = int(board_space_piece[1])  # convert dict key to coord column
-
-                                    # check if any potential king space will cause check (again)
-                                    for king_space in potential_king_space_key_list:
-                                        if self._board_space[piece_key_row][piece_key_column] == "RSoldier":
-                                            status = self.red_soldier_validate_move(piece_key, king_space)
-                                            if status is True:  # if piece can kill king
-                                                self.set_game_state("RED_WON")  # checkmate of blue king, so red wins
-                                                return True
-                                        if self._board_space[piece_key_row][piece_key_column] == "RCannon":
-                                            status = self.red_cannon_validate_move(piece_key, king_space)
-                                            if status is True:
-                                                self.set_game_state("RED_WON")
-                                                return True
-                                        if self._board_space[piece_key_row][piece_key_column] == "RChariot":
-                                            status = self.red_chariot_validate_move(piece_key, king_space)
-                                            if status is True:
-                                                self.set_game_state("RED_WON")
-                                                return True
-                                        if self._board_space[piece_key_row][piece_key_column] == "RElephant":
-                                            status = self.red_elephant_validate_move(piece_key, king_space)
-                                            if status is True:
-                                                self.set_game_state("RED_WON")
-                                                return True
-                                        if self._board_space[piece_key_row][piece_key_column] == "RHorse":
-                                            status = self.red_horse_validate_move(piece_key, king_space)
-                                            if status is True:
-                                                self.set_game_state("RED_WON")
-                                                return True
-                                        if self._board_space[piece_key_row][piece_key_column] == "RGuard":
-                                            status = self.red_guard_validate_move(piece_key, king_space)
-                                            if status is True:
-                                                self.set_game_state("RED_WON")
-                                                return True
-                                        if self._board_space[piece_key_row][piece_key_column] == "RGeneral":
-                                            status = self.red_general_validate_move(piece_key, king_space)
-                                            if status is True:
-                                                self.set_game_state("RED_WON")
-                                                return True
-
-                                # if none of the above is true, then king can move to a space to not be in check
-                                # which means checkmate status is False
-                                return False
-
-    def is_in_checkmate_red(self):
-        """Method to check if the Red team has been checkmated. This method is called at the end of every turn, which
-        means it is called at the end of the make_move method, after the is_in_check method is called. Method will
-        return True if the player has been checkmated and False if the player is not."""
-
-        for i in range(10):  # iterate through game board rows
-            for j in range(9):  # iterate through game board columns
-                if self._board_space[i][j] == "RGeneral":
-                    red_general_coordinate = str(i) + str(j)  # find 2D array coordinate of red general
-
-                    for algebraic_space, coordinate in self._board_dict.items():
-                        if coordinate == red_general_coordinate:
-                            red_general_space = algebraic_space  # find key space corresponding to red general
-
-                    # list of coordinate spaces blue king could move to to get out of check
-                    coordinate_list = [str(i)+str(j-1), str(i)+str(j+1), str(i-1)+str(j-1), str(i-1)+str(j),
-                                       str(i-1)+str(j+1), str(i+1)+str(j-1), str(i+1)+str(j), str(i+1)+str(j+1)]
-
-                    # list of board dictionary key spaces blue king could move to to get out of check
-                    potential_king_space_key_list = []
-                    for key, value in self._board_dict.items():
-                        for coordinate in coordinate_list:
-                            if value == coordinate in coordinate_list:
-                                potential_king_space_key_list.append(key)
-
-                                any_piece_key_list = []
-                                for piece_key in self._board_dict:
-                                    any_piece_key_list.append(piece_key)  # list of all piece locations
-                                any_piece_key_list.remove(red_general_space)  # remove king location
-
-                                for piece_key in any_piece_key_list:  # check if any piece can kill king
-                                    board_space_piece = self._board_dict[piece_key]  # convert dict key to board coord
-                                    piece_key_row = int(board_space_piece[0])  # convert dict key to board coord row
-                                    piece_key_column = int(board_space_piece[1])  # convert dict key to coord column
-
-                                    # check if any potential king space will cause check (again)
-                                    for king_space in potential_king_space_key_list:
-                                        if self._board_space[piece_key_row][piece_key_column] == "BSoldier":
-                                            status = self.red_soldier_validate_move(piece_key, king_space)
-                                            if status is True:  # if piece can kill king
-                                                self.set_game_state("BLUE_WON")  # checkmate of red king, so blue wins
-                                                return True
-                                        if self._board_space[piece_key_row][piece_key_column] == "BCannon":
-                                            status = self.red_cannon_validate_move(piece_key, king_space)
-                                            if status is True:
-                                                self.set_game_state("BLUE_WON")
-                                                return True
-                                        if self._board_space[piece_key_row][piece_key_column] == "BChariot":
-                                            status = self.red_chariot_validate_move(piece_key, king_space)
-                                            if status is True:
-                                                self.set_game_state("BLUE_WON")
-                                                return True
-                                        if self._board_space[piece_key_row][piece_key_column] == "BElephant":
-                                            status = self.red_elephant_validate_move(piece_key, king_space)
-                                            if status is True:
-                                                self.set_game_state("BLUE_WON")
-                                                return True
-                                        if self._board_space[piece_key_row][piece_key_column] == "BHorse":
-                                            status = self.red_horse_validate_move(piece_key, king_space)
-                                            if status is True:
-                                                self.set_game_state("BLUE_WON")
-                                                return True
-                                        if self._board_space[piece_key_row][piece_key_column] == "BGuard":
-                                            status = self.red_guard_validate_move(piece_key, king_space)
-                                            if status is True:
-                                                self.set_game_state("BLUE_WON")
-                                                return True
-                                        if self._board_space[piece_key_row][piece_key_column] == "BGeneral":
-                                            status = self.red_general_validate_move(piece_key, king_space)
-                                            if status is True:
-                                                self.set_game_state("BLUE_WON")
-                                                return True
-
-                                # if none of the above is true, then king can move to a space to not be in check
-                                # which means checkmate status is False
-                                return False
-
-    def make_move(self, from_location, to_location):
-        """Method that is called to move pieces on the board. The two parameters represent the square from which to
-        move the piece and the square to which the piece will be moved. If the square from_location does not contain a
-        piece belonging to the player whose turn it is, the method will return False. False will also be returned if the
-        proposed move is not legal or if the game has already been won. If the proposed move is valid, the indicated
-        piece will be moved, any captured piece will be removed, the game state and turn will be updated and the
-        function will return True. After identifying the piece that is being moved, this method relies on many helper
-        functions to verify the board functionality of each piece."""
-
-        if self.get_game_state() != "UNFINISHED":  # if the game has already been won
-            return False
-
-        if from_location not in self._board_dict:  # if from_location is not on the board
-            return False
-
-        if to_location not in self._board_dict:  # if to_location is not on the board
-            return False
-
-        board_space = self._board_dict[from_location]  # convert from_location to coordinate to identify piece
-        row = int(board_space[0])
-        column = int(board_space[1])
-
-        piece = self._board_space[row][column]  # find piece based on from_location coordinate
-
-        if self.get_turn()[0] != piece[0]:  # if the piece being moved does not belong to the player whose turn it is
-            return False  # or if there is no piece at the specified space
-
-        if from_location == to_location:  # player is passing their turn
-            if self.get_turn() == "Red":
-                self.set_turn("Blue")  # switch turn to other player
-                return True
-            if self.get_turn() == "Blue":
-                self.set_turn("Red")  # switch turn to other player
-                return True
-
-        if "RChariot" in piece:  # if piece to be moved is red chariot
-
-            move_status = self.red_chariot_validate_move(from_location, to_location)
-
-            if move_status is True:  # if legal move can be made
-                self.red_update_board("RChariot", from_location, to_location)  # update board in memory
-
-                check_red_status = self.is_in_check("red")  # check if player whose turn it is put themselves in check
-
-                if check_red_status is False:  # if legal move does not put player in check
-
-                    check_blue_status = self.is_in_check("blue")  # check if other player was put in check
-
-                    if check_blue_status is False:  # if other player was not put in check
-                        return True  # board has been updated, as well as turn status. It is now other player's turn.
-
-                    else:  # if other player was put in check
-                        if self.is_in_checkmate_blue() is True:  # check if other player was put in checkmate
-                            return True  # main purpose of this is to update game state if a player has won
-                        else:
-                            return True
-
-                else:  # if legal move puts player in check
-                    return self.red_reverse_board("RChariot", from_location, to_location)  # reverse board in memory
-                    # return False and it is still the same player's turn
-
-            else:  # if legal move cannot be made
-                return False
-
-        if "BChariot" in piece:  # if piece to be moved is blue chariot
-
-            move_status = self.blue_chariot_validate_move(from_location, to_location)
-
-            if move_status is True:  # if legal move can be made
-                self.blue_update_board("BChariot", from_location, to_location)  # update board in memory
-
-                check_blue_status = self.is_in_check("blue")  # check if player whose turn it is put themselves in check
-
-                if check_blue_status is False:  # if legal move does not put player in check
-
-                    check_red_status = self.is_in_check("red")  # check if other player was put in check
-
-                    if check_red_status is False:  # if other player was not put in check
-                        return True  # board has been updated, as well as turn status. It is now other player's turn.
-
-                    else:  # if other player was put in check
-                        if self.is_in_checkmate_red() is True:  # check if other player was put in checkmate
-                            return True  # main purpose of this is to update game state if a player has won
-                        else:
-                            return True
-
-                else:  # if legal move puts player in check
-                    return self.blue_reverse_board("BChariot", from_location, to_location)  # reverse board in memory
-                    # return False and it is still the same player's turn
-
-            else:  # if legal move cannot be made
-                return False
-
-        if "RElephant" in piece:  # if piece to be moved is red elephant
-
-            move_status = self.red_elephant_validate_move(from_location, to_location)
-
-            if move_status is True:  # if legal move can be made
-                self.red_update_board("RElephant", from_location, to_location)  # update board in memory
-
-                check_red_status = self.is_in_check("red")  # check if player whose turn it is put themselves in check
-
-                if check_red_status is False:  # if legal move does not put player in check
-
-                    check_blue_status = self.is_in_check("blue")  # check if other player was put in check
-
-                    if check_blue_status is False:  # if other player was not put in check
-                        return True  # board has been updated, as well as turn status. It is now other player's turn.
-
-                    else:  # if other player was put in check
-                        if self.is_in_checkmate_blue() is True:  # check if other player was put in checkmate
-                            return True  # main purpose of this is to update game state if a player has won
-                        else:
-                            return True
-
-                else:  # if legal move puts player in check
-                    return self.red_reverse_board("RElephant", from_location, to_location)  # reverse board in memory
-                    # return False and it is still the same player's turn
-
-            else:  # if legal move cannot be made
-                return False
-
-        if "BElephant" in piece:  # if piece to be moved is blue elephant
-
-            move_status = self.blue_elephant_validate_move(from_location, to_location)
-
-            if move_status is True:  # if legal move can be made
-                self.blue_update_board("BElephant", from_location, to_location)  # update board in memory
-
-                check_blue_status = self.is_in_check("blue")  # check if player whose turn it is put themselves in check
-
-                if check_blue_status is False:  # if legal move does not put player in check
-
-                    check_red_status = self.is_in_check("red")  # check if other player was put in check
-
-                    if check_red_status is False:  # if other player was not put in check
-                        return True  # board has been updated, as well as turn status. It is now other player's turn.
-
-                    else:  # if other player was put in check
-                        if self.is_in_checkmate_red() is True:  # check if other player was put in checkmate
-                            return True  # main purpose of this is to update game state if a player has won
-                        else:
-                            return True
-
-                else:  # if legal move puts player in check
-                    return self.blue_reverse_board("BElephant", from_location, to_location)  # reverse board in memory
-                    # return False and it is still the same player's turn
-
-            else:  # if legal move cannot be made
-                return False
-
-        if "RHorse" in piece:  # if piece to be moved is red horse
-
-            move_status = self.red_horse_validate_move(from_location, to_location)
-
-            if move_status is True:  # if legal move can be made
-                self.red_update_board("RHorse", from_location, to_location)  # update board in memory
-
-                check_red_status = self.is_in_check("red")  # check if player whose turn it is put themselves in check
-
-                if check_red_status is False:  # if legal move does not put player in check
-
-                    check_blue_status = self.is_in_check("blue")  # check if other player was put in check
-
-                    if check_blue_status is False:  # if other player was not put in check
-                        return True  # board has been updated, as well as turn status. It is now other player's turn.
-
-                    else:  # if other player was put in check
-                        if self.is_in_checkmate_blue() is True:  # check if other player was put in checkmate
-                            return True  # main purpose of this is to update game state if a player has won
-                        else:
-                            return True
-
-                else:  # if legal move puts player in check
-                    return self.red_reverse_board("RHorse", from_location, to_location)  # reverse board in memory
-                    # return False and it is still the same player's turn
-
-            else:  # if legal move cannot be made
-                return False
-
-        if "BHorse" in piece:  # if piece to be moved is blue horse
-
-            move_status = self.blue_horse_validate_move(from_location, to_location)
-
-            if move_status is True:  # if legal move can be made
-                self.blue_update_board("BHorse", from_location, to_location)  # update board in memory
-
-                check_blue_status = self.is_in_check("blue")  # check if player whose turn it is put themselves in check
-
-                if check_blue_status is False:  # if legal move does not put player in check
-
-                    check_red_status = self.is_in_check("red")  # check if other player was put in check
-
-                    if check_red_status is False:  # if other player was not put in check
-                        return True  # board has been updated, as well as turn status. It is now other player's turn.
-
-                    else:  # if other player was put in check
-                        if self.is_in_checkmate_red() is True:  # check if other player was put in checkmate
-                            return True  # main purpose of this is to update game state if a player has won
-                        else:
-                            return True
-
-                else:  # if legal move puts player in check
-                    return self.blue_reverse_board("BHorse", from_location, to_location)  # reverse board in memory
-                    # return False and it is still the same player's turn
-
-            else:  # if legal move cannot be made
-                return False
-
-        if "RCannon" in piece:  # if piece to be moved is red cannon
-
-            move_status = self.red_cannon_validate_move(from_location, to_location)
-
-            if move_status is True:  # if legal move can be made
-                self.red_update_board("RCannon", from_location, to_location)  # update board in memory
-
-                check_red_status = self.is_in_check("red")  # check if player whose turn it is put themselves in check
-
-                if check_red_status is False:  # if legal move does not put player in check
-
-                    check_blue_status = self.is_in_check("blue")  # check if other player was put in check
-
-                    if check_blue_status is False:  # if other player was not put in check
-                        return True  # board has been updated, as well as turn status. It is now other player's turn.
-
-                    else:  # if other player was put in check
-                        if self.is_in_checkmate_blue() is True:  # check if other player was put in checkmate
-                            return True  # main purpose of this is to update game state if a player has won
-                        else:
-                            return True
-
-                else:  # if legal move puts player in check
-                    return self.red_reverse_board("RCannon", from_location, to_location)  # reverse board in memory
-                    # return False and it is still the same player's turn
+    def _find_general(self, color):
+        """Method to find the board index of the passed parameter color's general. The location is tracked as the
+        general moves, so it is only verified against the board; the board is only searched again if it was changed
+        without going through the update methods. Returns None if the general is not on the board."""
 
-            else:  # if legal move cannot be made
-                return False
-
-        if "BCannon" in piece:  # if piece to be moved is blue cannon
-
-            move_status = self.blue_cannon_validate_move(from_location, to_location)
-
-            if move_status is True:  # if legal move can be made
-                self.blue_update_board("BCannon", from_location, to_location)  # update board in memory
-
-                check_blue_status = self.is_in_check("blue")  # check if player whose turn it is put themselves in check
-
-                if check_blue_status is False:  # if legal move does not put player in check
-
-                    check_red_status = self.is_in_check("red")  # check if other player was put in check
-
-                    if check_red_status is False:  # if other player was not put in check
-                        return True  # board has been updated, as well as turn status. It is now other player's turn.
+        general = color | GENERAL
 
-                    else:  # if other player was put in check
-                        if self.is_in_checkmate_red() is True:  # check if other player was put in checkmate
-                            return True  # main purpose of this is to update game state if a player has won
-                        else:
-                            return True
-
-                else:  # if legal move puts player in check
-                    return self.blue_reverse_board("BCannon", from_location, to_location)  # reverse board in memory
-                    # return False and it is still the same player's turn
-
-            else:  # if legal move cannot be made
-                return False
+        square = self._general_square[color >> 3]
+        if self._board[square] == general:  # tracked location is still correct
+            return square
 
-        if "RGuard" in piece:  # if piece to be moved is red guard
+        if general in self._board:
+            square = self._board.index(general)
+            self._general_square[color >> 3] = square  # remember new location for the next check
+            return square
 
-            move_status = self.red_guard_validate_move(from_location, to_location)
+        return None
 
-            if move_status is True:  # if legal move can be made
-                self.red_update_board("RGuard", from_location, to_location)  # update board in memory
+    def _generals_facing(self):
+        """Checks if the two generals stand on the same file with no piece between them (bikjang)."""
 
-                check_red_status = self.is_in_check("red")  # check if player whose turn it is put themselves in check
+        between = GENERALS_BETWEEN.get((self._find_general(RED), self._find_general(BLUE)))
+        return between is not None and not (self._piece_masks[0] | self._piece_masks[1]) & between
 
-                if check_red_status is False:  # if legal move does not put player in check
+    def _is_attacked(self, square, enemy):
+        """Method to check if any piece of the passed parameter enemy color can move to the passed board index, which
+        must not hold one of the enemy's own pieces. Only the spaces that could reach the index are examined: the
+        first and second piece along each sliding ray (a chariot first or a cannon second), and the spaces the attack
+        tables list for soldiers, guards, generals, horses and elephants, which only need their legs to be empty."""
 
-                    check_blue_status = self.is_in_check("blue")  # check if other player was put in check
+        board = self._board
+        chariot = enemy | CHARIOT
+        cannon = enemy | CANNON
+        cannon_target = board[square] & PIECE_TYPE == CANNON  # cannons cannot capture cannons
 
-                    if check_blue_status is False:  # if other player was not put in check
-                        return True  # board has been updated, as well as turn status. It is now other player's turn.
-
-                    else:  # if other player was put in check
-                        if self.is_in_checkmate_blue() is True:  # check if other player was put in checkmate
-                            return True  # main purpose of this is to update game state if a player has won
-                        else:
+        for ray in SLIDING_RAYS[square]:  # rows, columns and palace diagonals run both ways
+            screened = False
+            for from_square in ray:
+                piece = board[from_square]
+                if piece:
+                    if screened:  # second piece: only a cannon jumping the first one attacks
+                        if piece == cannon and not cannon_target:
                             return True
+                        break
+                    if piece == chariot:  # first piece: a chariot attacks
+                        return True
+                    if piece & PIECE_TYPE == CANNON:  # cannons cannot jump over cannons
+                        break
+                    screened = True
 
-                else:  # if legal move puts player in check
-                    return self.red_reverse_board("RGuard", from_location, to_location)  # reverse board in memory
-                    # return False and it is still the same player's turn
-
-            else:  # if legal move cannot be made
-                return False
-
-        if "BGuard" in piece:  # if piece to be moved is blue guard
-
-            move_status = self.blue_guard_validate_move(from_location, to_location)
-
-            if move_status is True:  # if legal move can be made
-                self.blue_update_board("BGuard", from_location, to_location)  # update board in memory
-
-                check_blue_status = self.is_in_check("blue")  # check if player whose turn it is put themselves in check
-
-                if check_blue_status is False:  # if legal move does not put player in check
-
-                    check_red_status = self.is_in_check("red")  # check if other player was put in check
-
-                    if check_red_status is False:  # if other player was not put in check
-                        return True  # board has been updated, as well as turn status. It is now other player's turn.
-
-                    else:  # if other player was put in check
-                        if self.is_in_checkmate_red() is True:  # check if other player was put in checkmate
-                            return True  # main purpose of this is to update game state if a player has won
-                        else:
-                            return True
-
-                else:  # if legal move puts player in check
-                    return self.blue_reverse_board("BGuard", from_location, to_location)  # reverse board in memory
-                    # return False and it is still the same player's turn
-
-            else:  # if legal move cannot be made
-                return False
-
-        if "RGeneral" in piece:  # if piece to be moved is red general
-
-            move_status = self.red_general_validate_move(from_location, to_location)
-
-            if move_status is True:  # if legal move can be made
-                self.red_update_board("RGeneral", from_location, to_location)  # update board in memory
-
-                check_red_status = self.is_in_check("red")  # check if player whose turn it is put themselves in check
-
-                if check_red_status is False:  # if legal move does not put player in check
-
-                    check_blue_status = self.is_in_check("blue")  # check if other player was put in check
-
-                    if check_blue_status is False:  # if other player was not put in check
-                        return True  # board has been updated, as well as turn status. It is now other player's turn.
+        for attack in self._short_range_attackers(square, enemy):
+            if not any(board[leg] for leg in attack[1:]):  # every leg space is empty
+                return True
+        return False
 
-                    else:  # if other player was put in check
-                        if self.is_in_checkmate_blue() is True:  # check if other player was put in checkmate
-                            return True  # main purpose of this is to update game state if a player has won
-                        else:
-                            return True
+    def _short_range_attackers(self, square, enemy):
+        """Generator that yields a tuple (from index, leg spaces...) for every soldier, guard, general, horse and
+        elephant of the passed parameter enemy color standing where its movement rule reaches the passed board index.
+        The leg spaces (none for soldiers, guards and generals) must be empty for the piece to attack. _is_attacked and
+        _pins_and_checkers both read the short-range attacks from here."""
 
-                else:  # if legal move puts player in check
-                    return self.red_reverse_board("RGeneral", from_location, to_location)  # reverse board in memory
-                    # return False and it is still the same player's turn
+        board = self._board
 
-            else:  # if legal move cannot be made
-                return False
+        soldier = enemy | SOLDIER
+        for attack in SOLDIER_ATTACKS[enemy][square]:
+            if board[attack[0]] == soldier:
+                yield attack
 
-        if "BGeneral" in piece:  # if piece to be moved is blue general
+        if square in (RED_PALACE if enemy == RED else BLUE_PALACE):  # guards and generals never leave their palace
+            for from_square in PALACE_STEPS[square]:  # palace steps work the same both ways
+                if board[from_square] in (enemy | GUARD, enemy | GENERAL):
+                    yield from_square,
 
-            move_status = self.blue_general_validate_move(from_location, to_location)
+        horse = enemy | HORSE
+        for attack in HORSE_ATTACKS[square]:
+            if board[attack[0]] == horse:
+                yield attack
 
-            if move_status is True:  # if legal move can be made
-                self.blue_update_board("BGeneral", from_location, to_location)  # update board in memory
+        elephant = enemy | ELEPHANT
+        for attack in ELEPHANT_ATTACKS[square]:
+            if board[attack[0]] == elephant:
+                yield attack
 
-                check_blue_status = self.is_in_check("blue")  # check if player whose turn it is put themselves in check
+    def _in_check(self, color):
+        """Method to check if the passed parameter color's general can be captured. Returns None if the general is not
+        on the board."""
 
-                if check_blue_status is False:  # if legal move does not put player in check
+        general = self._find_general(color)
+        if general is None:  # no general on the board
+            return None
+        return self._is_attacked(general, color ^ BLUE)
 
-                    check_red_status = self.is_in_check("red")  # check if other player was put in check
-
-                    if check_red_status is False:  # if other player was not put in check
-                        return True  # board has been updated, as well as turn status. It is now other player's turn.
+    def is_in_check(self, team):
+        """Method to check if the passed parameter team color is in check. This method is called at the end
+        of every turn, which means it is called at the end of the make_move method. Method will return True if the
+        player is in check and False if the player is not."""
 
-                    else:  # if other player was put in check
-                        if self.is_in_checkmate_red() is True:  # check if other player was put in checkmate
-                            return True  # main purpose of this is to update game state if a player has won
-                        else:
-                            return True
+        if team == "red":
+            return self._in_check(RED)
+        if team == "blue":
+            return self._in_check(BLUE)
+        return None
+
+    def _pseudo_moves(self, color):
+        """Generator that yields a (from index, to index) pair for every move the passed parameter color's pieces can
+        make by their movement rules, without checking whether the move would leave their own general in check.
+        Chariots and cannons walk their sliding rays; every other piece reads its moves from the precomputed move
+        tables."""
+
+        board = self._board
+        own_palace = RED_PALACE if color == RED else BLUE_PALACE
+
+        mask = self._piece_masks[color >> 3]
+        while mask:  # only the passed color's pieces, lowest board index first
+            lowest = mask & -mask
+            mask ^= lowest
+            from_square = lowest.bit_length() - 1
+            kind = board[from_square] & PIECE_TYPE
+
+            if kind == CHARIOT:
+                for ray in SLIDING_RAYS[from_square]:
+                    for to_square in ray:
+                        target = board[to_square]
+                        if not target:  # empty space, keep sliding
+                            yield from_square, to_square
+                            continue
+                        if target & BLUE != color:  # capture, then stop
+                            yield from_square, to_square
+                        break
+
+            elif kind == CANNON:
+                for ray in SLIDING_RAYS[from_square]:
+                    screened = False
+                    for to_square in ray:
+                        target = board[to_square]
+                        if not screened:  # looking for the piece to jump over, which cannot be a cannon
+                            if target:
+                                if target & PIECE_TYPE == CANNON:
+                                    break
+                                screened = True
+                            continue
+                        if not target:  # empty space beyond the screen
+                            yield from_square, to_square
+                            continue
+                        if target & BLUE != color and target & PIECE_TYPE != CANNON:  # capture, then stop
+                            yield from_square, to_square
+                        break
+
+            elif kind == HORSE:
+                for to_square, leg in HORSE_MOVES[from_square].items():
+                    target = board[to_square]
+                    if not board[leg] and not (target and target & BLUE == color):  # leg open, not own piece
+                        yield from_square, to_square
+
+            elif kind == ELEPHANT:
+                for to_square, (first, second) in ELEPHANT_MOVES[from_square].items():
+                    target = board[to_square]
+                    if not board[first] and not board[second] and not (target and target & BLUE == color):
+                        yield from_square, to_square
+
+            else:
+                if kind == SOLDIER:
+                    candidates = SOLDIER_STEPS[color][from_square]
+                else:  # guards and generals step within their own palace
+                    candidates = PALACE_STEPS[from_square] if from_square in own_palace else ()
+                for to_square in candidates:
+                    target = board[to_square]
+                    if not (target and target & BLUE == color):  # only needs to not be own piece
+                        yield from_square, to_square
+
+    def _pins_and_checkers(self, color):
+        """Method that finds the enemy pieces checking the passed parameter color's general and the spaces where one of
+        the color's moves could expose it. Returns None if the general is not on the board, or (general index, checks,
+        pins): checks lists, for every checking piece, the tuple of its space and the spaces its attack passes over, so
+        a move that touches none of them leaves that check in place; pins is the set of spaces along the lines that
+        one move could open up: the spaces up to an enemy chariot with at most one piece in front of it or an enemy
+        cannon with at most two (a cannon also checks when a screen is added), and the single blocked leg of an enemy
+        horse or elephant. While not in check, a move of any piece but the general from and to spaces outside pins
+        cannot expose the general."""
+
+        general = self._find_general(color)
+        if general is None:  # no general on the board
+            return None
+
+        board = self._board
+        enemy = color ^ BLUE
+        chariot = enemy | CHARIOT
+        cannon = enemy | CANNON
+        checks = []
+        pins = set()
+
+        for ray in SLIDING_RAYS[general]:  # rows, columns and palace diagonals run both ways
+            blockers = 0  # pieces between the general and the first enemy chariot or cannon
+            screen = EMPTY
+            for index, square in enumerate(ray):
+                piece = board[square]
+                if piece == chariot or piece == cannon:
+                    line = ray[:index + 1]
+                    if piece == chariot:
+                        if not blockers:
+                            checks.append(line)
+                        elif blockers == 1:  # pinned piece
+                            pins.update(line)
+                    elif blockers == 1 and screen & PIECE_TYPE != CANNON:  # cannon jumps the screen
+                        checks.append(line)
+                    elif blockers <= 2:  # taking a screen away or adding one could give check
+                        pins.update(line)
+                    break
+                if piece:
+                    blockers += 1
+                    if blockers > 2:  # too many pieces in front for one move to open the line
+                        break
+                    screen = piece
+
+        for attack in self._short_range_attackers(general, enemy):
+            blocked = [leg for leg in attack[1:] if board[leg]]
+            if not blocked:
+                checks.append(attack)
+            elif len(blocked) == 1:  # a single piece on the legs, so moving it away gives check
+                pins.add(blocked[0])
+
+        return general, checks, pins
+
+    def _is_safe_move(self, color, from_square, to_square):
+        """Method to check if moving the piece on from_square to to_square leaves the passed parameter color's general
+        out of check, the same test make_move uses to accept a move. The board is left unchanged."""
+
+        self._push_move(from_square, to_square)
+        safe = self._in_check(color) is False
+        self._pop_move()
+        return safe
+
+    def _safe_moves(self, color):
+        """Generator that yields the moves of _pseudo_moves that do not leave the passed parameter color's general in
+        check. Most moves are settled from _pins_and_checkers alone: while in check, a move that touches none of the
+        spaces of some check is rejected, and otherwise a move from and to spaces outside the pins is accepted. Only
+        general moves and moves along a pin or check line are made and taken back to test them."""
+
+        found = self._pins_and_checkers(color)
+        if found is None:  # no general on the board, so no move is safe
+            return
+        general, checks, pins = found
+
+        for move in self._pseudo_moves(color):
+            from_square, to_square = move
+            if from_square != general:
+                if checks:
+                    if any(from_square not in squares and to_square not in squares for squares in checks):
+                        continue  # that check is still there
+                elif from_square not in pins and to_square not in pins:
+                    yield move
+                    continue
+            if self._is_safe_move(color, from_square, to_square):
+                yield move
+
+    def _legal_moves(self, color):
+        """Method that lists a (from index, to index) pair for every move of the passed parameter color's pieces that
+        does not leave their own general in check. Opening positions are answered from OPENING_MOVES, which is
+        filled the first time each opening position is asked for."""
+
+        if not self._move_stack:  # only a freshly set up game can be at an opening position
+            opening = _OPENING_BOARDS.get(self._hash)
+            if opening is not None and self._board == opening:
+                moves = OPENING_MOVES.get((self._hash, color))
+                if moves is None:
+                    moves = OPENING_MOVES[self._hash, color] = tuple(self._safe_moves(color))
+                return list(moves)
+        return list(self._safe_moves(color))
+
+    def _has_legal_move(self, color):
+        """Method to check if the passed parameter color has at least one move that does not leave their own general in
+        check. Stops at the first such move, so positions with many replies are answered quickly."""
+
+        for move in self._safe_moves(color):
+            return True
+        return False
 
-                else:  # if legal move puts player in check
-                    return self.blue_reverse_board("BGeneral", from_location, to_location)  # reverse board in memory
-                    # return False and it is still the same player's turn
+    def generate_legal_moves(self, team):
+        """Method to list every move the passed parameter team ("red" or "blue") could make if it were their turn, as
+        (from_location, to_location) pairs in algebraic notation. These are exactly the piece moves make_move would
+        accept; passing the turn (moving a piece to its own space) is accepted only when the team is not in check,
+        and passes are never listed. Returns an empty list if the game has already been won."""
 
-            else:  # if legal move cannot be made
-                return False
+        color = TEAM_COLORS.get(team.lower())
+        if color is None or self.get_game_state() != "UNFINISHED":
+            return []
+        return [(SQUARE_NAMES[from_square], SQUARE_NAMES[to_square])
+                for from_square, to_square in self._legal_moves(color)]
 
-        if "RSoldier" in piece:  # if piece to be moved is red soldier
+    def is_in_checkmate_blue(self):
+        """Method to check if the Blue team has been checkmated. This method is called at the end of every turn, which
+        means it is called at the end of the make_move method, after the is_in_check method is called. Blue is
+        checkmated when in check with no move of any piece (general escape, block or capture) that removes the check.
+        If so, the game state is set to RED_WON. Method will return True if the player has been checkmated and False
+        if the player is not."""
+
+        if self._in_check(BLUE) is True and not self._has_legal_move(BLUE):
+            self.set_game_state("RED_WON")  # checkmate of blue king, so red wins
+            return True
+        return False
 
-            move_status = self.red_soldier_validate_move(from_location, to_location)
+    def is_in_checkmate_red(self):
+        """Method to check if the Red team has been checkmated. This method is called at the end of every turn, which
+        means it is called at the end of the make_move method, after the is_in_check method is called. Red is
+        checkmated when in check with no move of any piece (general escape, block or capture) that removes the check.
+        If so, the game state is set to BLUE_WON. Method will return True if the player has been checkmated and False
+        if the player is not."""
+
+        if self._in_check(RED) is True and not self._has_legal_move(RED):
+            self.set_game_state("BLUE_WON")  # checkmate of red king, so blue wins
+            return True
+        return False
 
-            if move_status is True:  # if legal move can be made
-                self.red_update_board("RSoldier", from_location, to_location)  # update board in memory
+    def is_in_stalemate(self, team):
+        """Method to check if the passed parameter team color is not in check but has no piece that can legally move.
+        A stalemated player may still pass, so the game state is not changed."""
 
-                check_red_status = self.is_in_check("red")  # check if player whose turn it is put themselves in check
+        color = TEAM_COLORS.get(team.lower())
+        if color is None:
+            return None
+        return self._in_check(color) is False and not self._has_legal_move(color)
 
-                if check_red_status is False:  # if legal move does not put player in check
+    def make_move(self, from_location, to_location):
+        """Method that is called to move pieces on the board. The two parameters represent the square from which to
+        move the piece and the square to which the piece will be moved. If the square from_location does not contain a
+        piece belonging to the player whose turn it is, the method will return False. False will also be returned if the
+        proposed move is not legal or if the game has already been won. If the proposed move is valid, the indicated
+        piece will be moved, any captured piece will be removed, the game state and turn will be updated and the
+        function will return True. The piece's movement rules are checked by the validator that _MOVE_VALIDATORS lists
+        for its piece type; every piece then shares the same check and checkmate tests. Passing (moving a piece to its
+        own space) is refused while the player is in check. A move that does not win can still end the game in a draw
+        by bikjang or repetition, see _record_position."""
 
-                    check_blue_status = self.is_in_check("blue")  # check if other player was put in check
+        if self._game_state != "UNFINISHED":  # if the game is already over
+            return False
 
-                    if check_blue_status is False:  # if other player was not put in check
-                        return True  # board has been updated, as well as turn status. It is now other player's turn.
+        from_square = SQUARE_INDEX.get(from_location)  # None if from_location is not on the board
+        to_square = SQUARE_INDEX.get(to_location)  # None if to_location is not on the board
+        if from_square is None or to_square is None:
+            return False
 
-                    else:  # if other player was put in check
-                        if self.is_in_checkmate_blue() is True:  # check if other player was put in checkmate
-                            return True  # main purpose of this is to update game state if a player has won
-                        else:
-                            return True
+        piece = self._board[from_square]  # find piece based on from_location index
+        color = piece & BLUE
+        if not piece or TURN_COLORS.get(self._turn) != color:  # no piece at the specified space, or the piece does
+            return False  # not belong to the player whose turn it is
 
-                else:  # if legal move puts player in check
-                    return self.red_reverse_board("RSoldier", from_location, to_location)  # reverse board in memory
-                    # return False and it is still the same player's turn
+        facing = self._generals_facing()  # before the move, for the bikjang rule
+        if self._position_counts is None:  # first move since the position was set up, which counts as seen once
+            self._position_counts = {self.position_hash(): 1}
 
-            else:  # if legal move cannot be made
+        if from_square == to_square:  # player is passing their turn
+            if self._in_check(color) is not False:  # a player in check has to get out of it, not pass
                 return False
+            self._push_move(from_square, from_square)  # switch turn to other player, recorded so it can be undone
+            self._record_position(facing)
+            return True
 
-        if "BSoldier" in piece:  # if piece to be moved is blue soldier
-
-            move_status = self.blue_soldier_validate_move(from_location, to_location)
-
-            if move_status is True:  # if legal move can be made
-                self.blue_update_board("BSoldier", from_location, to_location)  # update board in memory
-
-                check_blue_status = self.is_in_check("blue")  # check if player whose turn it is put themselves in check
-
-                if check_blue_status is False:  # if legal move does not put player in check
-
-                    check_red_status = self.is_in_check("red")  # check if other player was put in check
-
-                    if check_red_status is False:  # if other player was not put in check
-                        return True  # board has been updated, as well as turn status. It is now other player's turn.
+        if not self._MOVE_VALIDATORS[piece & PIECE_TYPE](self, color, from_square, to_square):
+            return False  # if legal move cannot be made
 
-                    else:  # if other player was put in check
-                        if self.is_in_checkmate_red() is True:  # check if other player was put in checkmate
-                            return True  # main purpose of this is to update game state if a player has won
-                        else:
-                            return True
+        self._push_move(from_square, to_square)  # update board in memory and pass the turn
+        if self._in_check(color) is not False:  # if the move puts the player whose turn it was in check
+            self._pop_move()  # reverse board in memory, so it is still the same player's turn
+            return False
 
-                else:  # if legal move puts player in check
-                    return self.blue_reverse_board("BSoldier", from_location, to_location)  # reverse board in memory
-                    # return False and it is still the same player's turn
+        enemy = color ^ BLUE
+        if self._in_check(enemy) is True and not self._has_legal_move(enemy):  # if other player was put in checkmate
+            self.set_game_state("BLUE_WON" if enemy == RED else "RED_WON")
+        self._record_position(facing)
+        return True
+
+    def _record_position(self, was_facing):
+        """Helper method that make_move calls after making a move, with whether the generals faced each other before
+        it. Counts the new position for the repetition rule and, unless the move won the game, sets BIKJANG_DRAW if
+        the generals still face each other or REPETITION_DRAW if the position has now come up REPETITION_LIMIT times.
+        Otherwise, once the move limit is reached, the team with more points (see get_score) wins. These are a few
+        lookups, so this takes constant time."""
+
+        key = self.position_hash()
+        count = self._position_counts.get(key, 0) + 1
+        self._position_counts[key] = count
+
+        if self._game_state != "UNFINISHED":  # checkmate
+            return
+        if was_facing and self._generals_facing():  # the player to move did not break bikjang
+            self._game_state = "BIKJANG_DRAW"
+        elif count >= REPETITION_LIMIT:
+            self._game_state = "REPETITION_DRAW"
+        elif self._move_limit is not None and len(self._move_stack) >= self._move_limit:
+            score = self.get_score()  # the deom bonus means points cannot be tied
+            self._game_state = "RED_WON" if score["Red"] > score["Blue"] else "BLUE_WON"
+
+    def _push_move(self, from_square, to_square):
+        """Method that moves the piece on from_square to to_square without checking the move, records what is needed
+        to take it back on the move stack, and passes the turn to the other player. A move from a space to itself
+        only passes the turn. Runs in constant time and copies nothing."""
+
+        board = self._board
+        piece = board[from_square]
+        captured = board[to_square]
+        self._move_stack.append((from_square, to_square, captured, self._turn, self._game_state))
+
+        if from_square != to_square:
+            board[from_square] = EMPTY  # make indicated move
+            board[to_square] = piece  # replace captured piece
+            self._hash ^= ZOBRIST_KEYS[piece][from_square] ^ ZOBRIST_KEYS[captured][to_square] ^ \
+                ZOBRIST_KEYS[piece][to_square]
+            moved = PIECE_SQUARE_SCORES[piece]
+            self._piece_square_score += moved[to_square] - moved[from_square] - PIECE_SQUARE_SCORES[captured][to_square]
+            self._piece_masks[piece >> 3] ^= (1 << from_square) | (1 << to_square)
+            if captured:
+                self._piece_masks[captured >> 3] ^= 1 << to_square  # captured piece leaves the other side's mask
+                self._points -= PIECE_POINTS[captured]
+            if piece & PIECE_TYPE == GENERAL:  # keep track of where the general is
+                self._general_square[piece >> 3] = to_square
+
+        self._turn = "Red" if self._turn == "Blue" else "Blue"
+
+    def _pop_move(self):
+        """Method that takes back the last move on the move stack, putting back any captured piece and restoring the
+        turn and game state from before the move. Returns the (from index, to index) of the move taken back."""
+
+        from_square, to_square, captured, self._turn, self._game_state = self._move_stack.pop()
+
+        if from_square != to_square:
+            board = self._board
+            piece = board[to_square]
+            board[to_square] = captured  # put back captured piece
+            board[from_square] = piece  # reverse making the move
+            self._hash ^= ZOBRIST_KEYS[piece][from_square] ^ ZOBRIST_KEYS[captured][to_square] ^ \
+                ZOBRIST_KEYS[piece][to_square]
+            moved = PIECE_SQUARE_SCORES[piece]
+            self._piece_square_score -= moved[to_square] - moved[from_square] - PIECE_SQUARE_SCORES[captured][to_square]
+            self._piece_masks[piece >> 3] ^= (1 << from_square) | (1 << to_square)
+            if captured:
+                self._piece_masks[captured >> 3] ^= 1 << to_square
+                self._points += PIECE_POINTS[captured]
+            if piece & PIECE_TYPE == GENERAL:  # general moves back to where it was
+                self._general_square[piece >> 3] = from_square
+
+        return from_square, to_square
+
+    def undo_move(self):
+        """Method to take back the last move accepted by make_move (including a pass), restoring the board, any
+        captured piece, the turn and the game state. Returns False if no move has been made."""
+
+        if not self._move_stack:
+            return False
 
-            else:  # if legal move cannot be made
-                return False
+        counts = self._position_counts
+        if counts:  # the position being taken back no longer counts for the repetition rule
+            key = self.position_hash()
+            count = counts.get(key, 0)
+            if count > 1:
+                counts[key] = count - 1
+            elif count:
+                del counts[key]
+        self._pop_move()
+        return True
+
+    def _update_board(self, piece, from_location, to_location, next_turn):
+        """Helper method for the update_board methods that moves the passed piece (a name such as "RChariot") between
+        the passed locations without checking the move, records it on the move stack and gives the turn to next_turn.
+        Returns False, changing nothing, if a location is not on the board or the piece is not on from_location."""
+
+        from_square = SQUARE_INDEX.get(from_location)
+        to_square = SQUARE_INDEX.get(to_location)
+        if from_square is None or to_square is None or PIECE_NAMES[self._board[from_square]] != piece:
+            return False
+        self._push_move(from_square, to_square)
+        self.set_turn(next_turn)  # update turn
+        return True
+
+    def _reverse_board(self, piece, from_location, to_location, turn):
+        """Helper method for the reverse_board methods that takes back the last move on the move stack, putting back
+        any captured piece, if it is the passed piece's move between the passed locations, and gives the turn back to
+        the passed turn. The move stack is left alone if it is empty or its last move is a different one."""
+
+        if self._move_stack:
+            from_square, to_square = self._move_stack[-1][:2]
+            if SQUARE_NAMES[from_square] == from_location and SQUARE_NAMES[to_square] == to_location and \
+                    PIECE_NAMES[self._board[to_square]] == piece:
+                self._pop_move()  # puts back any captured piece
+                self.set_turn(turn)
+        return False
 
     def red_update_board(self, piece, from_location, to_location):
         """This method updates the board to reflect a move that has been made by team Red. It will move the parameter
-        piece from and to the passed locations."""
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        self._board_space[from_row][from_column] = " "  # make indicated move
-        self._board_space[to_row][to_column] = piece  # replace captured piece
-        self.set_turn("Blue")  # update turn
+        piece from and to the passed locations. Kept for callers of the original interface; make_move records moves
+        with _push_move. Returns True, or False without changing anything if the piece is not on from_location."""
+        return self._update_board(piece, from_location, to_location, "Blue")
 
     def red_reverse_board(self, piece, from_location, to_location):
         """This method reverses the updated board to reflect the board's state prior to when a move was attempted by
         the Red team. The purpose of this method is to undo the board state after checking if a move would result in a
         check for the team making the move (which is considered an illegal move). After this method is executed, the
-        board state is undone, it is still the same player's turn, and False is returned."""
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        self._board_space[from_row][from_column] = piece  # reverse making the move
-        self._board_space[to_row][to_column] = " "  # do not replace captured piece
-        self.set_turn("Red")  # since player put themselves in check, it is still their turn
-        return False
+        board state is undone, it is still the same player's turn, and False is returned. Kept for callers of the
+        original interface: only the last move on the move stack can be reversed, and only if it is the passed move;
+        otherwise nothing is changed."""
+        return self._reverse_board(piece, from_location, to_location, "Red")
 
     def blue_update_board(self, piece, from_location, to_location):
         """This method updates the board to reflect a move that has been made by team Blue. It will move the parameter
-        piece from and to the passed locations."""
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        self._board_space[from_row][from_column] = " "  # make indicated move
-        self._board_space[to_row][to_column] = piece  # replace captured piece
-        self.set_turn("Red")  # update turn
+        piece from and to the passed locations. Kept for callers of the original interface; make_move records moves
+        with _push_move. Returns True, or False without changing anything if the piece is not on from_location."""
+        return self._update_board(piece, from_location, to_location, "Red")
 
     def blue_reverse_board(self, piece, from_location, to_location):
         """This method reverses the updated board to reflect the board's state prior to when a move was attempted by
         the Blue team. The purpose of this method is to undo the board state after checking if a move would result in a
         check for the team making the move (which is considered an illegal move). After this method is executed, the
-        board state is undone, it is still the same player's turn, and False is returned."""
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        self._board_space[from_row][from_column] = piece  # do not make move
-        self._board_space[to_row][to_column] = " "  # do not replace captured piece
-        self.set_turn("Blue")  # update turn to keep at current player
-        return False
-
-    def red_cannon_validate_move(self, from_location, to_location):
-        """Checks if a proposed move is valid for a Red Cannon. A red cannon can move in a straight line sideways or
-        forwards/backwards by jumping over an intervening piece. A cannon cannot capture another cannon and also cannot
-        jump over another cannon. Cannons may operate along diagonal lines within the palace, which requires an
-        intervening piece at the center of the palace."""
+        board state is undone, it is still the same player's turn, and False is returned. Kept for callers of the
+        original interface: only the last move on the move stack can be reversed, and only if it is the passed move;
+        otherwise nothing is changed."""
+        return self._reverse_board(piece, from_location, to_location, "Blue")
+
+    def _validate_cannon(self, color, from_square, to_square):
+        """Checks if a cannon of the passed parameter color can move between the passed board indices. See
+        red_cannon_validate_move for the rules."""
+
+        board = self._board
+        target = board[to_square]
+        if target and target & BLUE == color:  # if moving to a space that contains own team's piece
+            return False  # cannot capture own piece
 
-        red_fortress = ["d1", "e1", "f1", "d2", "e2", "f2", "d3", "e3", "f3"]
-        blue_fortress = ["d8", "e8", "f8", "d9", "e9", "f9", "d10", "e10", "f10"]
+        path = RAY_PATHS[from_square].get(to_square)  # spaces jumped over, along a row, column or palace diagonal
+        if path is None or target & PIECE_TYPE == CANNON:  # the cannon must not try to capture other cannon
+            return False
 
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
+        screened = False
+        for square in path:
+            piece = board[square]
+            if piece:
+                if screened or piece & PIECE_TYPE == CANNON:  # one intervening piece, and never a cannon
+                    return False
+                screened = True
+        return screened  # intervening piece count must equal 1
 
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
+    def _validate_elephant(self, color, from_square, to_square):
+        """Checks if an elephant of the passed parameter color can move between the passed board indices. See
+        red_elephant_validate_move for the rules."""
 
-        if "R" in str(self._board_space[to_row][to_column]):  # if moving to a space that contains own team's piece
+        board = self._board
+        target = board[to_square]
+        if target and target & BLUE == color:  # if moving to a space that contains own team's piece
             return False  # cannot capture own piece
 
-        if from_row == to_row:
-            if from_column != to_column:  # moving side to side in a row
-                if to_column > from_column:  # moving to the right in a row
-                    row = self._board_space[from_row]  # isolate row from board
-                    row_segment = row[(from_column + 1):to_column]  # isolate portion containing spaces in cannon's path
-                    count = 0  # initialize intervening piece count to 1
-                    for space in row_segment:  # iterate through each space in cannon's path
-                        if "Cannon" not in space:  # make sure intervening piece is not a cannon
-                            if space != " ":  # if there is an intervening piece
-                                count += 1  # add 1 to intervening piece count
-
-                    if count == 1:  # intervening piece count must equal 1
-                        if "Cannon" not in self._board_space[to_row][to_column]:  # must not try to capture other cannon
-                            return True
+        legs = ELEPHANT_MOVES[from_square].get(to_square)
+        if legs is None:
+            return False  # if no legal move was made
 
-                    return False
+        return board[legs[0]] == EMPTY and board[legs[1]] == EMPTY  # first and second movement not blocked
 
-                if to_column < from_column:  # moving to the left in a row
-                    row = self._board_space[from_row]  # isolate row from board
-                    row_segment = row[(to_column + 1):from_column]  # isolate portion containing spaces in cannon's path
-                    count = 0  # initialize intervening piece count to 1
-                    for space in row_segment:  # iterate through each space in cannon's path
-                        if "Cannon" not in space:  # make sure intervening piece is not a cannon
-                            if space != " ":  # if there is an intervening piece
-                                count += 1  # add 1 to intervening piece count
-
-                    if count == 1:  # intervening piece count must equal 1
-                        if "Cannon" not in self._board_space[to_row][to_column]:  # must not try to capture other cannon
-                            return True
-                    return False
+    def _validate_horse(self, color, from_square, to_square):
+        """Checks if a horse of the passed parameter color can move between the passed board indices. See
+        red_horse_validate_move for the rules."""
 
-        if from_column == to_column:
-            if from_row != to_row:  # moving up and down
-                if to_row > from_row:  # moving down in a column
-                    # initialize a list of all spaces in the specified column
-                    column = [self._board_space[0][from_column], self._board_space[1][from_column],
-                              self._board_space[2][from_column], self._board_space[3][from_column],
-                              self._board_space[4][from_column], self._board_space[5][from_column],
-                              self._board_space[6][from_column], self._board_space[7][from_column],
-                              self._board_space[8][from_column], self._board_space[9][
-                                  from_column]]
-
-                    column_segment = column[(from_row + 1):to_row]  # isolate portion containing spaces in cannon's path
-                    count = 0  # initialize intervening piece count to 1
-                    for space in column_segment:  # iterate through each space in cannon's path
-                        if "Cannon" not in space:  # make sure intervening piece is not a cannon
-                            if space != " ":  # if there is an intervening piece
-                                count += 1  # add 1 to intervening piece count
-
-                    if count == 1:  # intervening piece count must equal 1
-                        if "Cannon" not in self._board_space[to_row][to_column]:  # must not try to capture other cannon
-                            return True
-                    return False
+        board = self._board
+        target = board[to_square]
+        if target and target & BLUE == color:  # if moving to a space that contains own team's piece
+            return False  # cannot capture own piece
 
-                if to_row < from_row:  # moving up in a column
-                    # initialize a list of all spaces in the specified column
-                    column = [self._board_space[0][from_column], self._board_space[1][from_column],
-                              self._board_space[2][from_column], self._board_space[3][from_column],
-                              self._board_space[4][from_column], self._board_space[5][from_column],
-                              self._board_space[6][from_column], self._board_space[7][from_column],
-                              self._board_space[8][from_column], self._board_space[9][
-                                  from_column]]
-
-                    column_segment = column[(to_row + 1):from_row]  # isolate portion containing spaces in cannon's path
-                    count = 0  # initialize intervening piece count to 1
-                    for space in column_segment:  # iterate through each space in cannon's path
-                        if "Cannon" not in space:  # make sure intervening piece is not a cannon
-                            if space != " ":  # if there is an intervening piece
-                                count += 1  # add 1 to intervening piece count
-
-                    if count == 1:  # intervening piece count must equal 1
-                        if "Cannon" not in self._board_space[to_row][to_column]:  # must not try to capture other cannon
-                            return True
-                    return False
+        leg = HORSE_MOVES[from_square].get(to_square)
+        if leg is None:
+            return False  # if legal move was not made
 
-        if from_location in red_fortress:
-            if to_location in red_fortress:  # if moving within red palace
-                if from_location == "d1":
-                    if to_location == "f3" and self._board_space[1][4] != " ":  # make sure E2 is obstructed
-                        return True
-                if from_location == "d3":
-                    if to_location == "f1" and self._board_space[1][4] != " ":
-                        return True
-                if from_location == "f1":
-                    if to_location == "d3" and self._board_space[1][4] != " ":
-                        return True
-                if from_location == "f3":
-                    if to_location == "d1" and self._board_space[1][4] != " ":
-                        return True
+        return board[leg] == EMPTY  # not blocked
 
-        if from_location in blue_fortress:
-            if to_location in blue_fortress:  # if moving within blue palace
-                if from_location == "d8":
-                    if to_location == "f10" and self._board_space[8][4] != " ":  # make sure E9 is obstructed
-                        return True
-                if from_location == "d10":
-                    if to_location == "f8" and self._board_space[8][4] != " ":
-                        return True
-                if from_location == "f8":
-                    if to_location == "d10" and self._board_space[8][4] != " ":
-                        return True
-                if from_location == "f10":
-                    if to_location == "d8" and self._board_space[8][4] != " ":
-                        return True
+    def _validate_chariot(self, color, from_square, to_square):
+        """Checks if a chariot of the passed parameter color can move between the passed board indices. See
+        red_chariot_validate_move for the rules."""
 
-        return False  # if no legal move was made
+        board = self._board
+        target = board[to_square]
+        if target and target & BLUE == color:  # if moving to a space that contains own team's piece
+            return False  # cannot capture own piece
 
-    def blue_cannon_validate_move(self, from_location, to_location):
-        """Checks if a proposed move is valid for a Blue Cannon. A blue cannon can move in a straight line sideways or
-        forwards/backwards by jumping over an intervening piece. A cannon cannot capture another cannon and also cannot
-        jump over another cannon. Cannons may operate along diagonal lines within the palace, which requires an
-        intervening piece at the center of the palace."""
+        path = RAY_PATHS[from_square].get(to_square)  # spaces passed, along a row, column or palace diagonal
+        if path is None:
+            return False  # if no legal move was made
 
-        red_fortress = ["d1", "e1", "f1", "d2", "e2", "f2", "d3", "e3", "f3"]
-        blue_fortress = ["d8", "e8", "f8", "d9", "e9", "f9", "d10", "e10", "f10"]
+        for square in path:
+            if board[square]:  # every single space must be clear
+                return False
+        return True
 
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
+    def _validate_palace_piece(self, color, from_square, to_square):
+        """Checks if a guard or general of the passed parameter color can move between the passed board indices. See
+        red_guard_validate_move and red_general_validate_move for the rules."""
 
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
+        if from_square not in (RED_PALACE if color == RED else BLUE_PALACE):  # may never leave the palace
+            return False
 
-        if "B" in str(self._board_space[to_row][to_column]):  # if moving to a space that contains own team's piece
+        target = self._board[to_square]
+        if target and target & BLUE == color:  # if moving to a space that contains own team's piece
             return False  # cannot capture own piece
 
-        if from_row == to_row:
-            if from_column != to_column:  # moving side to side in a row
-                if to_column > from_column:  # moving to the right in a row
-                    row = self._board_space[from_row]  # isolate row from board
-                    row_segment = row[(from_column + 1):to_column]  # isolate portion containing spaces in cannon's path
-                    count = 0  # initialize intervening piece count to 1
-                    for space in row_segment:  # iterate through each space in cannon's path
-                        if "Cannon" not in space:  # make sure intervening piece is not a cannon
-                            if space != " ":  # if there is an intervening piece
-                                count += 1  # add 1 to intervening piece count
-
-                    if count == 1:  # intervening piece count must equal 1
-                        if "Cannon" not in self._board_space[to_row][to_column]:  # must not try to capture other cannon
-                            return True
-                    return False
+        # one space along a row or column, or along a diagonal line, without leaving the palace
+        return to_square in PALACE_STEPS[from_square]
 
-                if to_column < from_column:  # moving to the left in a row
-                    row = self._board_space[from_row]  # isolate row from board
-                    row_segment = row[(to_column + 1):from_column]  # isolate portion containing spaces in cannon's path
-                    count = 0  # initialize intervening piece count to 1
-                    for space in row_segment:  # iterate through each space in cannon's path
-                        if "Cannon" not in space:  # make sure intervening piece is not a cannon
-                            if space != " ":  # if there is an intervening piece
-                                count += 1  # add 1 to intervening piece count
-
-                    if count == 1:  # intervening piece count must equal 1
-                        if "Cannon" not in self._board_space[to_row][to_column]:  # must not try to capture other cannon
-                            return True
-                    return False
+    def _validate_soldier(self, color, from_square, to_square):
+        """Checks if a soldier of the passed parameter color can move between the passed board indices. See
+        red_soldier_validate_move for the rules."""
 
-        if from_column == to_column:
-            if from_row != to_row:  # moving up and down
-                if to_row > from_row:  # moving down in a column
-                    # initialize a list of all spaces in the specified column
-                    column = [self._board_space[0][from_column], self._board_space[1][from_column],
-                              self._board_space[2][from_column], self._board_space[3][from_column],
-                              self._board_space[4][from_column], self._board_space[5][from_column],
-                              self._board_space[6][from_column], self._board_space[7][from_column],
-                              self._board_space[8][from_column], self._board_space[9][
-                                  from_column]]
-
-                    column_segment = column[(from_row + 1):to_row]  # isolate portion containing spaces in cannon's path
-                    count = 0  # initialize intervening piece count to 1
-                    for space in column_segment:  # iterate through each space in cannon's path
-                        if "Cannon" not in space:  # make sure intervening piece is not a cannon
-                            if space != " ":  # if there is an intervening piece
-                                count += 1  # add 1 to intervening piece count
-
-                    if count == 1:  # intervening piece count must equal 1
-                        if "Cannon" not in self._board_space[to_row][to_column]:  # must not try to capture other cannon
-                            return True
-                    return False
+        target = self._board[to_square]
+        if target and target & BLUE == color:  # if moving to a space that contains own piece
+            return False  # cannot capture own piece
 
-                if to_row < from_row:  # moving up in a column
-                    # initialize a list of all spaces in the specified column
-                    column = [self._board_space[0][from_column], self._board_space[1][from_column],
-                              self._board_space[2][from_column], self._board_space[3][from_column],
-                              self._board_space[4][from_column], self._board_space[5][from_column],
-                              self._board_space[6][from_column], self._board_space[7][from_column],
-                              self._board_space[8][from_column], self._board_space[9][
-                                  from_column]]
-
-                    column_segment = column[(to_row + 1):from_row]  # isolate portion containing spaces in cannon's path
-                    count = 0  # initialize intervening piece count to 1
-                    for space in column_segment:  # iterate through each space in cannon's path
-                        # print(column_segment)
-                        if "Cannon" not in space:  # make sure intervening piece is not a cannon
-                            if space != " ":  # if there is an intervening piece
-                                count += 1  # add 1 to intervening piece count
-
-                    if count == 1:  # intervening piece count must equal 1
-                        if "Cannon" not in self._board_space[to_row][to_column]:  # must not try to capture other cannon
-                            return True
-                    return False
+        # one space sideways or forward, or diagonally forward along a diagonal line of the enemy palace
+        return to_square in SOLDIER_STEPS[color][from_square]
 
-        if from_location in red_fortress:
-            if to_location in red_fortress:  # if moving within red palace
-                if from_location == "d1":
-                    if to_location == "f3" and self._board_space[1][4] != " ":  # make sure E2 is obstructed
-                        return True
-                if from_location == "d3":
-                    if to_location == "f1" and self._board_space[1][4] != " ":
-                        return True
-                if from_location == "f1":
-                    if to_location == "d3" and self._board_space[1][4] != " ":
-                        return True
-                if from_location == "f3":
-                    if to_location == "d1" and self._board_space[1][4] != " ":
-                        return True
+    # movement rule check for each piece type, indexed by piece code & PIECE_TYPE, called by make_move
+    _MOVE_VALIDATORS = (None, _validate_palace_piece, _validate_palace_piece, _validate_elephant, _validate_horse,
+                        _validate_chariot, _validate_cannon, _validate_soldier)
 
-        if from_location in blue_fortress:
-            if to_location in blue_fortress:  # if moving within blue palace
-                if from_location == "d8":
-                    if to_location == "f10" and self._board_space[8][4] != " ":  # make sure E9 is obstructed
-                        return True
-                if from_location == "d10":
-                    if to_location == "f8" and self._board_space[8][4] != " ":
-                        return True
-                if from_location == "f8":
-                    if to_location == "d10" and self._board_space[8][4] != " ":
-                        return True
-                if from_location == "f10":
-                    if to_location == "d8" and self._board_space[8][4] != " ":
-                        return True
+    def red_cannon_validate_move(self, from_location, to_location):
+        """Checks if a proposed move is valid for a Red Cannon. A red cannon can move in a straight line sideways or
+        forwards/backwards by jumping over an intervening piece. A cannon cannot capture another cannon and also cannot
+        jump over another cannon. Cannons may operate along diagonal lines within the palace, which requires an
+        intervening piece at the center of the palace."""
+        return self._validate_cannon(RED, SQUARE_INDEX[from_location], SQUARE_INDEX[to_location])
 
-        return False  # if no legal move was made
+    def blue_cannon_validate_move(self, from_location, to_location):
+        """Checks if a proposed move is valid for a Blue Cannon. A blue cannon can move in a straight line sideways or
+        forwards/backwards by jumping over an intervening piece. A cannon cannot capture another cannon and also cannot
+        jump over another cannon. Cannons may operate along diagonal lines within the palace, which requires an
+        intervening piece at the center of the palace."""
+        return self._validate_cannon(BLUE, SQUARE_INDEX[from_location], SQUARE_INDEX[to_location])
 
     def red_elephant_validate_move(self, from_location, to_location):
         """Checks if a proposed move is valid for a Red Elephant. A Red elephant may move one space forward then two
@@ -1096,59 +1309,7 @@ class JanggiGame:
         Elephants can be blocked by another piece during their first movement (forward or sideways) and even during
         their second diagonal movement in the intermediate diagonal space. Elephants must not be blocked in order to
         fully execute a move."""
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        if "R" in str(self._board_space[to_row][to_column]):  # if moving to a space that contains own team's piece
-            return False  # cannot capture own piece
-
-        if from_row + 3 == to_row:
-            if from_column + 2 == to_column:
-                if self._board_space[from_row + 1][from_column] == " ":  # first movement not blocked
-                    if self._board_space[from_row + 2][from_column + 1] == " ":  # second movement not blocked
-                        return True
-            if from_column - 2 == to_column:
-                if self._board_space[from_row + 1][from_column] == " ":
-                    if self._board_space[from_row + 2][from_column - 1] == " ":
-                        return True
-
-        if from_row + 2 == to_row:
-            if from_column + 3 == to_column:
-                if self._board_space[from_row][from_column + 1] == " ":
-                    if self._board_space[from_row + 1][from_column + 2] == " ":
-                        return True
-            if from_column - 3 == to_column:
-                if self._board_space[from_row][from_column - 1] == " ":
-                    if self._board_space[from_row + 1][from_column - 2] == " ":
-                        return True
-
-        if from_row - 2 == to_row:
-            if from_column + 3 == to_column:
-                if self._board_space[from_row][from_column + 1] == " ":
-                    if self._board_space[from_row + 1][from_column + 2] == " ":
-                        return True
-            if from_column - 3 == to_column:
-                if self._board_space[from_row][from_column - 1] == " ":
-                    if self._board_space[from_row - 1][from_column - 2] == " ":
-                        return True
-
-        if from_row - 3 == to_row:
-            if from_column + 2 == to_column:
-                if self._board_space[from_row - 1][from_column] == " ":
-                    if self._board_space[from_row - 2][from_column + 1] == " ":
-                        return True
-            if from_column - 2 == to_column:
-                if self._board_space[from_row - 1][from_column] == " ":
-                    if self._board_space[from_row - 2][from_column - 1] == " ":
-                        return True
-
-        return False  # if no legal move was made
+        return self._validate_elephant(RED, SQUARE_INDEX[from_location], SQUARE_INDEX[to_location])
 
     def blue_elephant_validate_move(self, from_location, to_location):
         """Checks if a proposed move is valid for a Blue Elephant. A Blue elephant may move one space forward then two
@@ -1156,736 +1317,81 @@ class JanggiGame:
         Elephants can be blocked by another piece during their first movement (forward or sideways) and even during
         their second diagonal movement in the intermediate diagonal space. Elephants must not be blocked in order to
         fully execute a move."""
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        if "B" in str(self._board_space[to_row][to_column]):  # if moving to a space that contains own team's piece
-            return False  # cannot capture own piece
-
-        if from_row + 3 == to_row:
-            if from_column + 2 == to_column:
-                if self._board_space[from_row + 1][from_column] == " ":  # first movement not blocked
-                    if self._board_space[from_row + 2][from_column + 1] == " ":  # second movement not blocked
-                        return True
-            if from_column - 2 == to_column:
-                if self._board_space[from_row + 1][from_column] == " ":
-                    if self._board_space[from_row + 2][from_column - 1] == " ":
-                        return True
-
-        if from_row + 2 == to_row:
-            if from_column + 3 == to_column:
-                if self._board_space[from_row][from_column + 1] == " ":
-                    if self._board_space[from_row + 1][from_column + 2] == " ":
-                        return True
-            if from_column - 3 == to_column:
-                if self._board_space[from_row][from_column - 1] == " ":
-                    if self._board_space[from_row + 1][from_column - 2] == " ":
-                        return True
-
-        if from_row - 2 == to_row:
-            if from_column + 3 == to_column:
-                if self._board_space[from_row][from_column + 1] == " ":
-                    if self._board_space[from_row + 1][from_column + 2] == " ":
-                        return True
-            if from_column - 3 == to_column:
-                if self._board_space[from_row][from_column - 1] == " ":
-                    if self._board_space[from_row - 1][from_column - 2] == " ":
-                        return True
-
-        if from_row - 3 == to_row:
-            if from_column + 2 == to_column:
-                if self._board_space[from_row - 1][from_column] == " ":
-                    if self._board_space[from_row - 2][from_column + 1] == " ":
-                        return True
-            if from_column - 2 == to_column:
-                if self._board_space[from_row - 1][from_column] == " ":
-                    if self._board_space[from_row - 2][from_column - 1] == " ":
-                        return True
-
-        return False  # if no legal move was made
+        return self._validate_elephant(BLUE, SQUARE_INDEX[from_location], SQUARE_INDEX[to_location])
 
     def red_horse_validate_move(self, from_location, to_location):
         """Checks if a proposed move is valid for a Red Horse.  A Red horse can move one space forward then one
         space diagonally. Alternatively, it can move one space sideways then one space diagonally. Horses can be
         blocked by another piece during their first movement (forward or sideways), which does not allow the move to
         be executed. Horses must not be blocked in order to fully execute a move."""
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        if "R" in str(self._board_space[to_row][to_column]):  # if moving to a space that contains own team's piece
-            return False  # cannot capture own piece
-
-        if from_row + 2 == to_row:
-            if from_column + 1 == to_column:
-                if self._board_space[from_row + 1][from_column] == " ":  # not blocked
-                    return True
-            if from_column - 1 == to_column:
-                if self._board_space[from_row + 1][from_column] == " ":
-                    return True
-
-        if from_row + 1 == to_row:
-            if from_column + 2 == to_column:
-                if self._board_space[from_row][from_column + 1] == " ":
-                    return True
-            if from_column - 2 == to_column:
-                if self._board_space[from_row][from_column - 1] == " ":
-                    return True
-
-        if from_row - 1 == to_row:
-            if from_column + 2 == to_column:
-                if self._board_space[from_row][from_column + 1] == " ":
-                    return True
-            if from_column - 2 == to_column:
-                if self._board_space[from_row][from_column - 1] == " ":
-                    return True
-
-        if from_row - 2 == to_row:
-            if from_column + 1 == to_column:
-                if self._board_space[from_row - 1][from_column] == " ":
-                    return True
-            if from_column - 1 == to_column:
-                if self._board_space[from_row - 1][from_column] == " ":
-                    return True
-
-        return False  # if legal move was not made
+        return self._validate_horse(RED, SQUARE_INDEX[from_location], SQUARE_INDEX[to_location])
 
     def blue_horse_validate_move(self, from_location, to_location):
         """Checks if a proposed move is valid for a Blue Horse.  A Blue horse can move one space forward then one
         space diagonally. Alternatively, it can move one space sideways then one space diagonally. Horses can be
         blocked by another piece during their first movement (forward or sideways), which does not allow the move to
         be executed. Horses must not be blocked in order to fully execute a move."""
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        if "B" in str(self._board_space[to_row][to_column]):  # if moving to a space that contains own team's piece
-            return False  # cannot capture own piece
-
-        if from_row + 2 == to_row:
-            if from_column + 1 == to_column:
-                if self._board_space[from_row + 1][from_column] == " ":  # not blocked
-                    return True
-            if from_column - 1 == to_column:
-                if self._board_space[from_row + 1][from_column] == " ":
-                    return True
-
-        if from_row + 1 == to_row:
-            if from_column + 2 == to_column:
-                if self._board_space[from_row][from_column + 1] == " ":
-                    return True
-            if from_column - 2 == to_column:
-                if self._board_space[from_row][from_column - 1] == " ":
-                    return True
-
-        if from_row - 1 == to_row:
-            if from_column + 2 == to_column:
-                if self._board_space[from_row][from_column + 1] == " ":
-                    return True
-            if from_column - 2 == to_column:
-                if self._board_space[from_row][from_column - 1] == " ":
-                    return True
-
-        if from_row - 2 == to_row:
-            if from_column + 1 == to_column:
-                if self._board_space[from_row - 1][from_column] == " ":
-                    return True
-            if from_column - 1 == to_column:
-                if self._board_space[from_row - 1][from_column] == " ":
-                    return True
-
-        return False  # if no legal move was made
+        return self._validate_horse(BLUE, SQUARE_INDEX[from_location], SQUARE_INDEX[to_location])
 
     def red_chariot_validate_move(self, from_location, to_location):
         """Checks if a proposed move is valid for a Red Chariot.  A Red chariot can move an unlimited number of
         spaces in a straight line, vertically or horizontally.  If the chariot is in a palace, it can move along the
         designated diagonal lines within the palace."""
-
-        red_fortress = ["d1", "e1", "f1", "d2", "e2", "f2", "d3", "e3", "f3"]
-        blue_fortress = ["d8", "e8", "f8", "d9", "e9", "f9", "d10", "e10", "f10"]
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        if "R" in str(self._board_space[to_row][to_column]):  # if moving to a space that contains own team's piece
-            return False  # cannot capture own piece
-
-        if from_row == to_row:
-            if from_column != to_column:  # moving side to side in a row
-                if to_column > from_column:  # moving to the right in a row
-                    row = self._board_space[from_row]  # isolate row from board
-                    row_segment = row[(from_column + 1):to_column]  # isolate portion with spaces in chariot's path
-                    count = 0
-                    for space in row_segment:  # iterate through each space in chariot's path
-                        if space == " ":  # if there is no intervening piece
-                            count += 1
-
-                    if count == len(row_segment):  # if every single space is clear
-                        return True
-                    return False
-
-                if to_column < from_column:  # moving to the left in a row
-                    row = self._board_space[from_row]  # isolate row from board
-                    row_segment = row[(to_column + 1):from_column]  # isolate portion with spaces in chariot's path
-                    count = 0
-                    for space in row_segment:  # iterate through each space in chariot's path
-                        if space == " ":  # if there is no intervening piece
-                            count += 1
-
-                    if count == len(row_segment):  # if every single space is clear
-                        return True
-                    return False
-
-        if from_column == to_column:
-            if from_row != to_row:  # moving up and down
-                if to_row > from_row:  # moving down in a column
-                    # initialize a list of all spaces in the specified column
-                    column = [self._board_space[0][from_column], self._board_space[1][from_column],
-                              self._board_space[2][from_column], self._board_space[3][from_column],
-                              self._board_space[4][from_column], self._board_space[5][from_column],
-                              self._board_space[6][from_column], self._board_space[7][from_column],
-                              self._board_space[8][from_column], self._board_space[9][
-                                  from_column]]
-
-                    column_segment = column[(from_row + 1):to_row]  # isolate portion with spaces in chariot's path
-                    count = 0
-                    for space in column_segment:  # iterate through each space in chariot's path
-                        if space == " ":  # if there is no intervening piece
-                            count += 1
-
-                    if count == len(column_segment):  # if every single space is clear
-                        return True
-                    return False
-
-                if to_row < from_row:  # moving up in a column
-                    # initialize a list of all spaces in the specified column
-                    column = [self._board_space[0][from_column], self._board_space[1][from_column],
-                              self._board_space[2][from_column], self._board_space[3][from_column],
-                              self._board_space[4][from_column], self._board_space[5][from_column],
-                              self._board_space[6][from_column], self._board_space[7][from_column],
-                              self._board_space[8][from_column], self._board_space[9][
-                                  from_column]]
-
-                    column_segment = column[(to_row + 1):from_row]  # isolate portion with spaces in chariot's path
-                    count = 0
-                    for space in column_segment:  # iterate through each space in chariot's path
-                        if space == " ":  # if there is no intervening piece
-                            count += 1
-
-                    if count == len(column_segment):  # if every single space is clear
-                        return True
-                    return False
-
-        if from_location in red_fortress:
-            if to_location in red_fortress:  # if moving within red palace
-                if from_location == "e2":
-                    if to_location == "d1" or to_location == "d3" or to_location == "f1" or to_location == "f3":
-                        return True
-                if from_location == "d1":
-                    if to_location == "e2":
-                        return True
-                    if to_location == "f3" and self._board_space[1][4] == " ":  # make sure E2 is unobstructed
-                        return True
-                if from_location == "d3":
-                    if to_location == "e2":
-                        return True
-                    if to_location == "f1" and self._board_space[1][4] == " ":
-                        return True
-                if from_location == "f1":
-                    if to_location == "e2":
-                        return True
-                    if to_location == "d3" and self._board_space[1][4] == " ":
-                        return True
-                if from_location == "f3":
-                    if to_location == "e2":
-                        return True
-                    if to_location == "d1" and self._board_space[1][4] == " ":
-                        return True
-
-        if from_location in blue_fortress:
-            if to_location in blue_fortress:  # if moving within blue palace
-                if from_location == "e9":
-                    if to_location == "d8" or to_location == "d10" or to_location == "f8" or to_location == "f10":
-                        return True
-                if from_location == "d8":
-                    if to_location == "e9":
-                        return True
-                    if to_location == "f10" and self._board_space[8][4] == " ":  # make sure E9 is unobstructed
-                        return True
-                if from_location == "d10":
-                    if to_location == "e9":
-                        return True
-                    if to_location == "f8" and self._board_space[8][4] == " ":
-                        return True
-                if from_location == "f8":
-                    if to_location == "e9":
-                        return True
-                    if to_location == "d10" and self._board_space[8][4] == " ":
-                        return True
-                if from_location == "f10":
-                    if to_location == "e9":
-                        return True
-                    if to_location == "d8" and self._board_space[8][4] == " ":
-                        return True
-
-        return False  # if no legal move was made
+        return self._validate_chariot(RED, SQUARE_INDEX[from_location], SQUARE_INDEX[to_location])
 
     def blue_chariot_validate_move(self, from_location, to_location):
         """Checks if a proposed move is valid for a Blue Chariot.  A Blue chariot can move an unlimited number of
         spaces in a straight line, vertically or horizontally.  If the chariot is in a palace, it can move along the
         designated diagonal lines within the palace."""
-
-        red_fortress = ["d1", "e1", "f1", "d2", "e2", "f2", "d3", "e3", "f3"]
-        blue_fortress = ["d8", "e8", "f8", "d9", "e9", "f9", "d10", "e10", "f10"]
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        if "B" in str(self._board_space[to_row][to_column]):  # if moving to a space that contains own team's piece
-            return False  # cannot capture own piece
-
-        if from_row == to_row:
-            if from_column != to_column:  # moving side to side in a row
-                if to_column > from_column:  # moving to the right in a row
-                    row = self._board_space[from_row]  # isolate row from board
-                    row_segment = row[(from_column + 1):to_column]  # isolate portion with spaces in chariot's path
-                    count = 0
-                    for space in row_segment:  # iterate through each space in chariot's path
-                        if space == " ":  # if there is no intervening piece
-                            count += 1
-
-                    if count == len(row_segment):  # if every single space is clear
-                        return True
-                    return False
-
-                if to_column < from_column:  # moving to the left in a row
-                    row = self._board_space[from_row]  # isolate row from board
-                    row_segment = row[(to_column + 1):from_column]  # isolate portion with spaces in chariot's path
-                    count = 0
-                    for space in row_segment:  # iterate through each space in chariot's path
-                        if space == " ":  # if there is no intervening piece
-                            count += 1
-
-                    if count == len(row_segment):  # if every single space is clear
-                        return True
-                    return False
-
-        if from_column == to_column:
-            if from_row != to_row:  # moving up and down
-                if to_row > from_row:  # moving down in a column
-                    # initialize a list of all spaces in the specified column
-                    column = [self._board_space[0][from_column], self._board_space[1][from_column],
-                              self._board_space[2][from_column], self._board_space[3][from_column],
-                              self._board_space[4][from_column], self._board_space[5][from_column],
-                              self._board_space[6][from_column], self._board_space[7][from_column],
-                              self._board_space[8][from_column], self._board_space[9][
-                                  from_column]]
-
-                    column_segment = column[(from_row + 1):to_row]  # isolate portion with spaces in chariot's path
-                    count = 0
-                    for space in column_segment:  # iterate through each space in chariot's path
-                        if space == " ":  # if there is no intervening piece
-                            count += 1
-
-                    if count == len(column_segment):  # if every single space is clear
-                        return True
-                    return False
-
-                if to_row < from_row:  # moving up in a column
-                    # initialize a list of all spaces in the specified column
-                    column = [self._board_space[0][from_column], self._board_space[1][from_column],
-                              self._board_space[2][from_column], self._board_space[3][from_column],
-                              self._board_space[4][from_column], self._board_space[5][from_column],
-                              self._board_space[6][from_column], self._board_space[7][from_column],
-                              self._board_space[8][from_column], self._board_space[9][
-                                  from_column]]
-
-                    column_segment = column[(to_row + 1):from_row]  # isolate portion with spaces in chariot's path
-                    count = 0
-                    for space in column_segment:  # iterate through each space in chariot's path
-                        if space == " ":  # if there is no intervening piece
-                            count += 1
-
-                    if count == len(column_segment):  # if every single space is clear
-                        return True
-                    return False
-
-        if from_location in red_fortress:
-            if to_location in red_fortress:  # if moving within red palace
-                if from_location == "e2":
-                    if to_location == "d1" or to_location == "d3" or to_location == "f1" or to_location == "f3":
-                        return True
-                if from_location == "d1":
-                    if to_location == "e2":
-                        return True
-                    if to_location == "f3" and self._board_space[1][4] == " ":  # make sure E2 is unobstructed
-                        return True
-                if from_location == "d3":
-                    if to_location == "e2":
-                        return True
-                    if to_location == "f1" and self._board_space[1][4] == " ":
-                        return True
-                if from_location == "f1":
-                    if to_location == "e2":
-                        return True
-                    if to_location == "d3" and self._board_space[1][4] == " ":
-                        return True
-                if from_location == "f3":
-                    if to_location == "e2":
-                        return True
-                    if to_location == "d1" and self._board_space[1][4] == " ":
-                        return True
-
-        if from_location in blue_fortress:
-            if to_location in blue_fortress:  # if moving within blue palace
-                if from_location == "e9":
-                    if to_location == "d8" or to_location == "d10" or to_location == "f8" or to_location == "f10":
-                        return True
-                if from_location == "d8":
-                    if to_location == "e9":
-                        return True
-                    if to_location == "f10" and self._board_space[8][4] == " ":  # make sure E9 is unobstructed
-                        return True
-                if from_location == "d10":
-                    if to_location == "e9":
-                        return True
-                    if to_location == "f8" and self._board_space[8][4] == " ":
-                        return True
-                if from_location == "f8":
-                    if to_location == "e9":
-                        return True
-                    if to_location == "d10" and self._board_space[8][4] == " ":
-                        return True
-                if from_location == "f10":
-                    if to_location == "e9":
-                        return True
-                    if to_location == "d8" and self._board_space[8][4] == " ":
-                        return True
-
-        return False  # if no legal move was made
+        return self._validate_chariot(BLUE, SQUARE_INDEX[from_location], SQUARE_INDEX[to_location])
 
     def red_guard_validate_move(self, from_location, to_location):
         """Checks if a proposed move is valid for a Red Guard. A Red guard may never leave the palace. He can move one
         space in any direction (including along designated diagonal spaces) within the palace."""
-
-        red_fortress = ["d1", "e1", "f1", "d2", "e2", "f2", "d3", "e3", "f3"]  # red palace board spaces
-        red_diagonal = ["d1", "d3", "e2", "f1", "f3"]  # red palace diagonal access spaces
-
-        if from_location not in red_fortress:  # guard is not in palace (illegal move)
-            return False
-
-        if to_location not in red_fortress:  # guard is trying to leave palace (illegal move)
-            return False
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        if "R" in str(self._board_space[to_row][to_column]):  # if moving to a space that contains own team's piece
-            return False  # cannot capture own piece
-
-        if from_row == to_row:
-            if from_column + 1 == to_column:  # moving one space to the right
-                return True
-            if from_column - 1 == to_column:  # moving one space to the left
-                return True
-
-        if from_column == to_column:
-            if from_row + 1 == to_row:  # moving one space forward
-                return True
-            if from_row - 1 == to_row:  # moving one space backward
-                return True
-
-        if from_column + 1 == to_column:
-            if from_row + 1 == to_row:  # moving diagonally right and forward
-                if to_location in red_diagonal:  # accounting for a diagonal space
-                    return True
-            if from_row - 1 == to_row:  # moving diagonally right and backward
-                if to_location in red_diagonal:  # accounting for a diagonal space
-                    return True
-
-        if from_column - 1 == to_column:
-            if from_row + 1 == to_row:  # moving diagonally left and forward
-                if to_location in red_diagonal:  # accounting for a diagonal space
-                    return True
-            if from_row - 1 == to_row:  # moving diagonally left and backward
-                if to_location in red_diagonal:  # accounting for a diagonal space
-                    return True
-
-        return False  # if no legal move was made
+        return self._validate_palace_piece(RED, SQUARE_INDEX[from_location], SQUARE_INDEX[to_location])
 
     def blue_guard_validate_move(self, from_location, to_location):
         """Checks if a proposed move is valid for a Blue Guard. A Blue guard may never leave the palace. He can move one
         space in any direction (including along designated diagonal spaces) within the palace."""
-
-        blue_fortress = ["d8", "e8", "f8", "d9", "e9", "f9", "d10", "e10", "f10"]  # blue palace board spaces
-        blue_diagonal = ["d8", "d10", "e9", "f8", "f10"]  # blue palace diagonal access spaces
-
-        if from_location not in blue_fortress:  # guard is not in palace (illegal move)
-            return False
-
-        if to_location not in blue_fortress:  # guard is trying to leave palace (illegal move)
-            return False
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        if "B" in str(self._board_space[to_row][to_column]):  # if moving to a space that contains own piece
-            return False  # cannot capture own piece
-
-        if from_row == to_row:
-            if from_column + 1 == to_column:  # moving one space to the right
-                return True
-            if from_column - 1 == to_column:  # moving one space to the left
-                return True
-
-        if from_column == to_column:
-            if from_row + 1 == to_row:  # moving one space backward
-                return True
-            if from_row - 1 == to_row:  # moving one space forward
-                return True
-
-        if from_column + 1 == to_column:
-            if from_row + 1 == to_row:  # moving diagonally right and backward
-                if to_location in blue_diagonal:  # accounting for a diagonal space
-                    return True
-            if from_row - 1 == to_row:  # moving diagonally right and forward
-                if to_location in blue_diagonal:  # accounting for a diagonal space
-                    return True
-
-        if from_column - 1 == to_column:
-            if from_row + 1 == to_row:  # moving diagonally left and backward
-                if to_location in blue_diagonal:  # accounting for a diagonal space
-                    return True
-            if from_row - 1 == to_row:  # moving diagonally left and forward
-                if to_location in blue_diagonal:  # accounting for a diagonal space
-                    return True
-
-        return False  # if no legal move was made
+        return self._validate_palace_piece(BLUE, SQUARE_INDEX[from_location], SQUARE_INDEX[to_location])
 
     def red_general_validate_move(self, from_location, to_location):
         """Checks if the proposed move is valid for a Red General. A Red general is never allowed to leave his palace.
         He can only move one space forward, backward, or sideways within the palace. He may also move one space along
         designated diagonal lines in the palace."""
-
-        red_fortress = ["d1", "e1", "f1", "d2", "e2", "f2", "d3", "e3", "f3"]  # red palace board spaces
-        red_diagonal = ["d1", "d3", "e2", "f1", "f3"]  # red palace diagonal access spaces
-
-        if from_location not in red_fortress:  # general is not in palace (illegal move)
-            return False
-
-        if to_location not in red_fortress:  # general is trying to leave palace (illegal move)
-            return False
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        if "R" in str(self._board_space[to_row][to_column]):  # if moving to a space that contains own team's piece
-            return False  # cannot capture own piece
-
-        if from_row == to_row:
-            if from_column + 1 == to_column:  # moving one space to the right
-                return True
-            if from_column - 1 == to_column:  # moving one space to the left
-                return True
-
-        if from_column == to_column:
-            if from_row + 1 == to_row:  # moving one space forward
-                return True
-            if from_row - 1 == to_row:  # moving one space backward
-                return True
-
-        if from_column + 1 == to_column:
-            if from_row + 1 == to_row:  # moving diagonally right and forward
-                if to_location in red_diagonal:  # accounting for a diagonal space
-                    return True
-            if from_row - 1 == to_row:  # moving diagonally right and backward
-                if to_location in red_diagonal:  # accounting for a diagonal space
-                    return True
-
-        if from_column - 1 == to_column:
-            if from_row + 1 == to_row:  # moving diagonally left and forward
-                if to_location in red_diagonal:  # accounting for a diagonal space
-                    return True
-
-            if from_row - 1 == to_row:  # moving diagonally left and backward
-                if to_location in red_diagonal:  # accounting for a diagonal space
-                    return True
-
-        return False  # if no legal move was made
+        return self._validate_palace_piece(RED, SQUARE_INDEX[from_location], SQUARE_INDEX[to_location])
 
     def blue_general_validate_move(self, from_location, to_location):
         """Checks if the proposed move is valid for a Blue General. A Blue general is never allowed to leave his palace.
         He can only move one space forward, backward, or sideways within the palace. He may also move one space along
         designated diagonal lines in the palace."""
-
-        blue_fortress = ["d8", "e8", "f8", "d9", "e9", "f9", "d10", "e10", "f10"]  # blue palace board spaces
-        blue_diagonal = ["d8", "d10", "e9", "f8", "f10"]  # blue palace diagonal access spaces
-
-        if from_location not in blue_fortress:  # general is not in palace (illegal move)
-            return False
-
-        if to_location not in blue_fortress:  # general is trying to leave palace (illegal move)
-            return False
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        if "B" in str(self._board_space[to_row][to_column]):  # if moving to a space that contains own piece
-            return False  # cannot capture own piece
-
-        if from_row == to_row:
-            if from_column + 1 == to_column:  # moving one space to the right
-                return True
-            if from_column - 1 == to_column:  # moving one space to the left
-                return True
-
-        if from_column == to_column:
-            if from_row + 1 == to_row:  # moving one space backward
-                return True
-            if from_row - 1 == to_row:  # moving one space forward
-                return True
-
-        if from_column + 1 == to_column:
-            if from_row + 1 == to_row:  # moving diagonally right and backward
-                if to_location in blue_diagonal:  # accounting for a diagonal space
-                    return True
-            if from_row - 1 == to_row:  # moving diagonally right and forward
-                if to_location in blue_diagonal:  # accounting for a diagonal space
-                    return True
-
-        if from_column - 1 == to_column:
-            if from_row + 1 == to_row:  # moving diagonally left and backward
-                if to_location in blue_diagonal:  # accounting for a diagonal space
-                    return True
-            if from_row - 1 == to_row:  # moving diagonally left and forward
-                if to_location in blue_diagonal:  # accounting for a diagonal space
-                    return True
-
-        return False  # if no legal move was made
+        return self._validate_palace_piece(BLUE, SQUARE_INDEX[from_location], SQUARE_INDEX[to_location])
 
     def red_soldier_validate_move(self, from_location, to_location):
         """Checks if the proposed move is valid for a Red Soldier. A Red soldier can move one space forward or one
         space sideways. A soldier can never move backward. Once in the enemy team's palace, the soldier may move along
         designated diagonal lines."""
-
-        blue_diagonal = ["d8", "d10", "e9", "f8", "f10"]  # blue palace diagonal access spaces
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
-
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        if "R" in str(self._board_space[to_row][to_column]):  # if moving to a space that contains own piece
-            return False  # cannot capture own piece
-
-        if from_row + 1 == to_row:
-            if from_column == to_column:  # moving one space forwards
-                return True
-
-        if from_row == to_row:
-            if from_column - 1 == to_column:  # moving one space left
-                return True
-            if from_column + 1 == to_column:  # moving one space right
-                return True
-
-        if from_column + 1 == to_column:
-            if from_row + 1 == to_row:  # moving diagonally right and forward
-                if to_location in blue_diagonal:  # only allowed when in blue palace
-                    return True
-
-        if from_column - 1 == to_column:
-            if from_row + 1 == to_row:  # moving diagonally left and forward
-                if to_location in blue_diagonal:  # only allowed when in blue palace
-                    return True
-
-        return False  # if no legal move was made
+        return self._validate_soldier(RED, SQUARE_INDEX[from_location], SQUARE_INDEX[to_location])
 
     def blue_soldier_validate_move(self, from_location, to_location):
         """Checks if the proposed move is valid for a Blue Soldier. A Blue soldier can move one space forward or one
         space sideways. A soldier can never move backward. Once in the enemy team's palace, the soldier may move along
         designated diagonal lines."""
+        return self._validate_soldier(BLUE, SQUARE_INDEX[from_location], SQUARE_INDEX[to_location])
 
-        red_diagonal = ["d1", "d3", "e2", "f1", "f3"]  # red palace diagonal access spaces
-
-        board_space_from = self._board_dict[from_location]  # convert from_location parameter to board_space coordinate
-        from_row = int(board_space_from[0])
-        from_column = int(board_space_from[1])
 
-        board_space_to = self._board_dict[to_location]  # convert to_location parameter to board_space coordinate
-        to_row = int(board_space_to[0])
-        to_column = int(board_space_to[1])
-
-        if "B" in str(self._board_space[to_row][to_column]):  # if moving to a space that contains own piece
-            return False  # cannot capture own piece
-
-        if from_row - 1 == to_row:
-            if from_column == to_column:  # moving one space forward
-                return True
-
-        if from_row == to_row:
-            if from_column - 1 == to_column:  # moving one space left
-                return True
-            if from_column + 1 == to_column:  # moving one space right
-                return True
+def dump_positions(games):
+    """Function that encodes every game in the passed iterable with to_bytes into one contiguous bytes object."""
+    return b"".join(game.to_bytes() for game in games)
 
-        if from_column + 1 == to_column:
-            if from_row - 1 == to_row:  # moving diagonally right and forward
-                if to_location in red_diagonal:  # only allowed when in red palace
-                    return True
 
-        if from_column - 1 == to_column:
-            if from_row - 1 == to_row:  # moving diagonally left and forward
-                if to_location in red_diagonal:  # only allowed when in red palace
-                    return True
+def load_positions(buffer):
+    """Function that decodes a contiguous buffer of positions written by to_bytes or dump_positions (bytes, a bytearray
+    or an mmap, for example) into a list of JanggiGame objects. The buffer is read through a memoryview, so it is not
+    copied. Raises ValueError if the buffer length is not a multiple of POSITION_BYTES or a position is invalid."""
 
-        return False  # if no legal move was made
-    
+    view = memoryview(buffer).cast("B")
+    if len(view) % POSITION_BYTES:
+        raise ValueError("buffer length %d is not a multiple of %d" % (len(view), POSITION_BYTES))
+    from_bytes = JanggiGame.from_bytes
+    return [from_bytes(view[offset:offset + POSITION_BYTES]) for offset in range(0, len(view), POSITION_BYTES)]
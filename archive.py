@@ -0,0 +1,134 @@
+# Memory-mapped archive of Janggi games with random access by game index.
+#
+# File layout (all integers little-endian):
+#     header   16 bytes: magic b"JGAR", format version (2 bytes), 2 unused bytes, index offset (8 bytes)
+#     moves    every game's moves one after another, two bytes per move: from board index, to board index
+#     index    (game count + 1) 8-byte offsets into the file; game i's moves run from offset i to offset i + 1
+#
+# Games are written as they come, so the index is only known at the end and goes after the moves. The archive is
+# read through mmap, so opening it reads only the header, and finding game N is two index lookups.
+
+import mmap
+import struct
+import sys
+from array import array
+
+from Janggi import JanggiGame, SQUARE_INDEX, SQUARE_NAMES
+from batch import replay_game
+
+MAGIC = b"JGAR"
+VERSION = 1
+_HEADER = struct.Struct("<4sHxxQ")
+
+
+class ArchiveError(ValueError):
+    """Raised when a file is not a game archive this module can read."""
+
+
+def write_archive(path, games):
+    """Writes the passed iterable of games, each a sequence of (from_location, to_location) pairs played from the
+    opening position, to a new archive file at the passed path. Games are written one at a time as the iterable
+    produces them. Returns the number of games written."""
+
+    offsets = array("Q")
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, 0))  # index offset is filled in at the end
+        position = _HEADER.size
+        for moves in games:
+            offsets.append(position)
+            data = bytes(square for from_location, to_location in moves
+                         for square in (SQUARE_INDEX[from_location], SQUARE_INDEX[to_location]))
+            file.write(data)
+            position += len(data)
+        offsets.append(position)
+
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        offsets.tofile(file)
+        file.seek(0)
+        file.write(_HEADER.pack(MAGIC, VERSION, position))
+    return len(offsets) - 1
+
+
+class GameArchive:
+    """Class represents an archive file opened for reading. Games are looked up by index with archive[index] as lists
+    of (from_location, to_location) pairs, or as raw two-byte moves with raw_moves(index). The file is memory-mapped,
+    so only the pages that are read are loaded. Use it as a context manager, or call close() when done."""
+
+    def __init__(self, path):
+        """Opens and memory-maps the archive at the passed path. Raises ArchiveError if it is not an archive."""
+
+        self._file = open(path, "rb")
+        self._map = self._view = self._offsets = None
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self.close()
+            raise ArchiveError("%s is not a game archive" % path) from None
+
+        if len(self._map) < _HEADER.size:
+            self.close()
+            raise ArchiveError("%s is not a game archive" % path)
+        magic, version, index_offset = _HEADER.unpack_from(self._map)
+        index_bytes = len(self._map) - index_offset
+        if magic != MAGIC or version != VERSION or index_bytes < 8 or index_bytes % 8:
+            self.close()
+            raise ArchiveError("%s is not a game archive" % path)
+
+        self._view = memoryview(self._map)
+        if sys.byteorder == "big":  # the index is little-endian on disk, so it has to be copied and swapped
+            self._offsets = array("Q", self._view[index_offset:])
+            self._offsets.byteswap()
+        else:
+            self._offsets = self._view[index_offset:].cast("Q")
+
+    def __len__(self):
+        """Returns the number of games in the archive."""
+        return len(self._offsets) - 1
+
+    def raw_moves(self, index):
+        """Method to get the moves of the game at the passed index as a memoryview of the archive, two bytes (from
+        board index, to board index) per move, without copying them. The view has to be released (or dropped) before
+        the archive is closed. Raises IndexError for an index outside the archive."""
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("game index out of range")
+        return self._view[self._offsets[index]:self._offsets[index + 1]]
+
+    def __getitem__(self, index):
+        """Returns the moves of the game at the passed index as a list of (from_location, to_location) pairs."""
+        data = self.raw_moves(index)
+        return [(SQUARE_NAMES[data[move]], SQUARE_NAMES[data[move + 1]]) for move in range(0, len(data), 2)]
+
+    def __iter__(self):
+        """Yields the moves of every game in order, as lists of (from_location, to_location) pairs."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def replay(self, index, game=None):
+        """Method to replay the game at the passed index with make_move, on the passed JanggiGame or a new one, and
+        return its ReplayResult. The game is left at the final position."""
+        return replay_game(game if game is not None else JanggiGame(), self[index])
+
+    def close(self):
+        """Method to release the memory map and close the file."""
+
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        if self._view is not None:
+            self._view.release()
+        self._offsets = self._view = None
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        """Returns the archive for use in a with statement."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the archive at the end of a with statement."""
+        self.close()
@@ -0,0 +1,77 @@
+# Batch replay of recorded JanggiGame games.
+#
+# replay_games takes many games, each a sequence of (from_location, to_location) moves, and replays them with
+# make_move. One JanggiGame is reset between games instead of building a new one per game, and the games can be
+# spread across a process pool.
+
+import multiprocessing
+
+from Janggi import JanggiGame
+
+
+class ReplayResult:
+    """Class represents the outcome of replaying one game: whether make_move accepted each move, the game state after
+    the last move, and the index and (from_location, to_location) pair of the first rejected move, or None if every
+    move was accepted."""
+
+    def __init__(self, accepted, game_state, first_illegal):
+        """Initializes the result with the accepted flags, the final game state and the first illegal move."""
+        self.accepted = accepted
+        self.game_state = game_state
+        self.first_illegal = first_illegal
+
+    def __eq__(self, other):
+        """Checks if the passed parameter other is a ReplayResult with the same values."""
+        return (isinstance(other, ReplayResult) and self.accepted == other.accepted and
+                self.game_state == other.game_state and self.first_illegal == other.first_illegal)
+
+    def __repr__(self):
+        """Returns a short description of the result."""
+        return "ReplayResult(moves=%d, rejected=%d, game_state=%s, first_illegal=%r)" % (
+            len(self.accepted), self.accepted.count(False), self.game_state, self.first_illegal)
+
+
+def replay_game(game, moves, start_fen=None):
+    """Resets the passed game to the opening position, or to the passed FEN-style start_fen position, and plays the
+    passed moves on it. Rejected moves leave the position unchanged and replay carries on with the next move. Returns
+    a ReplayResult."""
+
+    if start_fen is None:
+        game.reset()
+    else:
+        game.load_fen(start_fen)
+    make_move = game.make_move
+    accepted = []
+    first_illegal = None
+    for index, (from_location, to_location) in enumerate(moves):
+        if make_move(from_location, to_location):
+            accepted.append(True)
+        else:
+            accepted.append(False)
+            if first_illegal is None:
+                first_illegal = (index, (from_location, to_location))
+    return ReplayResult(accepted, game.get_game_state(), first_illegal)
+
+
+def _replay_chunk(games):
+    """Helper function that replays a list of games on a single JanggiGame; run in each worker process."""
+
+    game = JanggiGame()
+    return [replay_game(game, moves) for moves in games]
+
+
+def replay_games(games, processes=None, chunk_size=256):
+    """Replays each game in the passed list of games, where a game is a sequence of (from_location, to_location)
+    pairs. Returns a list with one ReplayResult per game, in the same order. With processes greater than 1 the games
+    are split into chunks of chunk_size games and replayed in a multiprocessing pool of that many workers."""
+
+    games = list(games)
+    if not processes or processes <= 1 or len(games) <= chunk_size:
+        return _replay_chunk(games)
+
+    chunks = [games[start:start + chunk_size] for start in range(0, len(games), chunk_size)]
+    with multiprocessing.Pool(processes) as pool:
+        results = []
+        for chunk_results in pool.imap(_replay_chunk, chunks):
+            results.extend(chunk_results)
+    return results
@@ -0,0 +1,124 @@
+# Benchmarks for JanggiGame resource use.
+#
+# Run "python -m benchmarks memory" to report the bytes of memory held by each idle game (a new game with no moves
+# made), measured with tracemalloc over many live games. Run "python -m benchmarks batch-eval" to report how many
+# positions per second evaluate_batch scores (needs NumPy). Run "python -m benchmarks make-move" to report the median
+# time make_move takes for a move of each piece type.
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from Janggi import JanggiGame, BLUE, RED, PIECE_TYPE, SQUARE_NAMES
+from evaluation import evaluate_batch, games_to_array
+from perft import position
+
+PIECE_TYPE_NAMES = ("", "General", "Guard", "Elephant", "Horse", "Chariot", "Cannon", "Soldier")  # by piece type
+
+
+def memory_per_game(count=10000):
+    """Returns the average number of bytes allocated per game while the passed count of new JanggiGame objects are
+    alive. Shared module-level tables are not counted, since they are built once on import."""
+
+    JanggiGame()  # make sure anything created lazily on first use is not counted
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        games = [JanggiGame() for game in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / len(games)
+
+
+def random_games(count, seed=0, max_moves=80):
+    """Returns the passed count of games, each played from the opening with up to max_moves random legal moves. The
+    generator is seeded, so the same games come back every time."""
+
+    generator = random.Random(seed)
+    games = []
+    for index in range(count):
+        game = JanggiGame()
+        for move in range(generator.randrange(max_moves + 1)):
+            moves = list(game._legal_moves(BLUE if game._turn == "Blue" else RED))
+            if not moves:
+                break
+            game._push_move(*generator.choice(moves))
+        games.append(game)
+    return games
+
+
+def batch_evaluation_rate(count=1000000, repeat=3):
+    """Returns the number of positions per second scored by evaluate_batch over the passed count of boards (copies of
+    a few hundred random games), the best of repeat runs. Raises ImportError if NumPy is not installed."""
+
+    boards = games_to_array(random_games(500))
+    boards = boards.repeat(-(-count // len(boards)), axis=0)[:count]
+    best = None
+    for run in range(repeat):
+        start = time.perf_counter()
+        evaluate_batch(boards)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return count / best
+
+
+def make_move_latency(repeat=2000, game=None):
+    """Returns a dictionary from piece type name to the median time in nanoseconds make_move takes for one move of
+    that type, timed repeat times and taken back with undo_move after each. The moves are the first legal moves of
+    each type for the side to move in the passed game (by default the "horses" perft position, where every piece type
+    can move) that do not give check."""
+
+    game = game if game is not None else position("horses")
+    color = BLUE if game.get_turn() == "Blue" else RED
+    moves = {}
+    for from_square, to_square in game._legal_moves(color):
+        kind = game._board[from_square] & PIECE_TYPE
+        if kind in moves:
+            continue
+        game._push_move(from_square, to_square)
+        gives_check = game._in_check(color ^ BLUE)
+        game._pop_move()
+        if not gives_check:
+            moves[kind] = (SQUARE_NAMES[from_square], SQUARE_NAMES[to_square])
+
+    latency = {}
+    for kind, (from_location, to_location) in sorted(moves.items()):
+        times = []
+        for run in range(repeat):
+            start = time.perf_counter_ns()
+            game.make_move(from_location, to_location)
+            times.append(time.perf_counter_ns() - start)
+            game.undo_move()
+        times.sort()
+        latency[PIECE_TYPE_NAMES[kind]] = times[len(times) // 2]
+    return latency
+
+
+def main(argv=None):
+    """Runs the requested benchmark and prints the results."""
+
+    parser = argparse.ArgumentParser(description="Benchmark JanggiGame resource use.")
+    parser.add_argument("benchmark", choices=["memory", "batch-eval", "make-move"], help="benchmark to run")
+    parser.add_argument("--games", type=int, default=None,
+                        help="number of games to create (default 10000) or positions to score (default 1000000)")
+    args = parser.parse_args(argv)
+
+    if args.benchmark == "memory":
+        games = args.games or 10000
+        print("%d bytes per idle game (%d games)" % (memory_per_game(games), games))
+    elif args.benchmark == "batch-eval":
+        positions = args.games or 1000000
+        try:
+            rate = batch_evaluation_rate(positions)
+        except ImportError as error:
+            parser.error(str(error))
+        print("%d positions per second (%d positions)" % (rate, positions))
+    elif args.benchmark == "make-move":
+        for name, nanoseconds in make_move_latency().items():
+            print("%-8s %6.2f us" % (name, nanoseconds / 1000))
+
+
+if __name__ == "__main__":
+    main()
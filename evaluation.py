@@ -0,0 +1,298 @@
+# Static evaluation of JanggiGame positions, for the search and for the analysis evaluation bar.
+#
+# Scores are in centipawn-like units (a soldier is 200) and positive scores favour Blue. A score is the sum of four
+# terms: material and piece-square bonuses, which the game keeps up to date move by move, plus palace safety and
+# mobility, which are worked out here from each side's palace and its chariots and horses. Nothing walks the board in
+# Python, so evaluate() is cheap enough to call at every node of a search (about 10 microseconds).
+#
+# For scoring many positions at once, games_to_array() stacks boards into an (N, 10, 9) int8 array laid out like
+# _board_space, and evaluate_batch() scores the whole array with vectorized NumPy operations. NumPy is optional: only
+# these two functions need it.
+
+from Janggi import (BLUE, RED, EMPTY, GENERAL, GUARD, ELEPHANT, HORSE, CHARIOT, CANNON, SOLDIER, PIECE_TYPE,
+                    PIECE_VALUES, PIECE_SQUARE_SCORES, RED_PALACE, BLUE_PALACE, HORSE_MOVES, ELEPHANT_MOVES,
+                    PALACE_STEPS, SOLDIER_STEPS, SLIDING_RAYS)
+
+try:
+    import numpy as np
+except ImportError:  # batch evaluation is unavailable, everything else works without NumPy
+    np = None
+
+GUARD_SHIELD = 20  # bonus for each guard standing in its own palace
+PALACE_INTRUDER = 40  # penalty for each enemy piece inside a side's palace
+CHARIOT_MOBILITY = 3  # bonus for each space a chariot can move to
+HORSE_MOBILITY = 6  # bonus for each space a horse can move to
+
+# bit mask of each side's own palace, indexed by color >> 3
+_PALACE_MASKS = (sum(1 << square for square in RED_PALACE), sum(1 << square for square in BLUE_PALACE))
+
+
+def evaluate(game):
+    """Function to score the passed parameter game's position from the point of view of the side to move."""
+
+    score = game._piece_square_score + _palace_safety(game) + _mobility(game)
+    return score if game._turn == "Blue" else -score
+
+
+def evaluation_terms(game):
+    """Function to get each term of the passed parameter game's score, from Blue's point of view, as a dictionary
+    with the keys material, piece_square, palace, mobility and total."""
+
+    board = game._board
+    material = 0
+    for color, mask in ((RED, game._piece_masks[0]), (BLUE, game._piece_masks[1])):
+        side = 0
+        while mask:
+            lowest = mask & -mask
+            mask ^= lowest
+            side += PIECE_VALUES[board[lowest.bit_length() - 1] & PIECE_TYPE]
+        material += side if color == BLUE else -side
+
+    palace = _palace_safety(game)
+    mobility = _mobility(game)
+    return {"material": material, "piece_square": game._piece_square_score - material, "palace": palace,
+            "mobility": mobility, "total": game._piece_square_score + palace + mobility}
+
+
+def _palace_safety(game):
+    """Helper function that scores how well each general's palace is defended, from Blue's point of view: a bonus
+    for each guard at home and a penalty for each enemy piece inside the palace."""
+
+    board = game._board
+    masks = game._piece_masks
+    score = 0
+    for index, sign in ((0, -1), (1, 1)):  # red, then blue
+        palace = _PALACE_MASKS[index]
+        own = masks[index] & palace
+        side = -PALACE_INTRUDER * (masks[1 - index] & palace).bit_count()
+        while own:  # at most the general and two guards
+            lowest = own & -own
+            own ^= lowest
+            if board[lowest.bit_length() - 1] & PIECE_TYPE == GUARD:
+                side += GUARD_SHIELD
+        score += sign * side
+    return score
+
+
+def _mobility(game):
+    """Helper function that scores the spaces each side's chariots and horses can move to, from Blue's point of view.
+    Moves that would leave the general in check are counted too; the other pieces are left to the piece-square
+    tables, since their moves are short or need a screen."""
+
+    board = game._board
+    score = 0
+    for color, sign in ((RED, -1), (BLUE, 1)):
+        side = 0
+        from_square = board.find(color | CHARIOT)  # at most two of each, so finding them is cheaper than a mask walk
+        while from_square >= 0:
+            for ray in SLIDING_RAYS[from_square]:
+                for to_square in ray:
+                    target = board[to_square]
+                    if target == EMPTY:
+                        side += CHARIOT_MOBILITY
+                        continue
+                    if target & BLUE != color:  # can capture the first enemy piece on the line
+                        side += CHARIOT_MOBILITY
+                    break
+            from_square = board.find(color | CHARIOT, from_square + 1)
+
+        from_square = board.find(color | HORSE)
+        while from_square >= 0:
+            for to_square, leg in HORSE_MOVES[from_square].items():
+                if board[leg] == EMPTY and (board[to_square] == EMPTY or board[to_square] & BLUE != color):
+                    side += HORSE_MOBILITY
+            from_square = board.find(color | HORSE, from_square + 1)
+        score += sign * side
+    return score
+
+
+BATCH_CHUNK = 8192  # boards scored at a time by evaluate_batch, so the temporary arrays stay in cache
+
+
+def _require_numpy():
+    """Helper function that raises ImportError if NumPy is not installed."""
+    if np is None:
+        raise ImportError("batch evaluation requires NumPy")
+
+
+def _step_blocks(moves_by_square):
+    """Helper function that groups the passed list of 90 {to index: spaces passed over} dictionaries by the shape of
+    each move (where the destination and the spaces passed over lie relative to the start). When the start spaces of
+    a shape fill a rectangle of the board, the shape becomes one block: the (rows, columns) slices of the start
+    spaces, of the destinations and of each space passed over. Returns the blocks and a list of the other moves as
+    (from index, to index, spaces passed over) tuples."""
+
+    shapes = {}
+    for from_square, moves in enumerate(moves_by_square):
+        row, column = divmod(from_square, 9)
+        for to_square, legs in moves.items():
+            shape = tuple((square // 9 - row, square % 9 - column) for square in (to_square,) + tuple(legs))
+            shapes.setdefault(shape, []).append((from_square, to_square, tuple(legs)))
+
+    blocks, singles = [], []
+    for shape, moves in shapes.items():
+        rows = [from_square // 9 for from_square, to_square, legs in moves]
+        columns = [from_square % 9 for from_square, to_square, legs in moves]
+        top, bottom, left, right = min(rows), max(rows) + 1, min(columns), max(columns) + 1
+        if len(moves) == (bottom - top) * (right - left):
+            blocks.append([(slice(top + row, bottom + row), slice(left + column, right + column))
+                           for row, column in ((0, 0),) + shape])
+        else:
+            singles.extend(moves)
+    return blocks, singles
+
+
+def _batch_tables():
+    """Helper function that builds the tables used by evaluate_batch: the piece-square scores of pairs of spaces, the
+    move blocks of each color's short-range pieces, and the palace diagonal rays."""
+
+    # score of every pair of neighbouring spaces (2k, 2k + 1) for each pair of piece codes, indexed by
+    # k * 256 + first code * 16 + second code, so a board is scored with 45 lookups
+    single = np.array(PIECE_SQUARE_SCORES, dtype=np.int32)
+    scores = (single[:, 0::2].T[:, :, None] + single[:, 1::2].T[:, None, :]).ravel()
+
+    steps = {}
+    for color, palace in ((RED, RED_PALACE), (BLUE, BLUE_PALACE)):
+        palace_moves = [dict.fromkeys(PALACE_STEPS[square], ()) if square in palace else {} for square in range(90)]
+        steps[color] = (((GENERAL, GUARD), _step_blocks(palace_moves)),
+                        ((ELEPHANT,), _step_blocks(ELEPHANT_MOVES)),
+                        ((HORSE,), _step_blocks([{to_square: (leg,) for to_square, leg in moves.items()}
+                                                 for moves in HORSE_MOVES])),
+                        ((SOLDIER,), _step_blocks([dict.fromkeys(moves, ()) for moves in SOLDIER_STEPS[color]])))
+
+    # rows and columns are scanned whole in _line_scan; only the palace diagonals, one or two spaces long, are
+    # followed ray by ray. Lines run both ways, so the rays leaving a target are the rays reaching it.
+    rays = [(target, ray) for target in range(90) for ray in SLIDING_RAYS[target][4:]]
+    diagonals = tuple(np.array([[target] + list(ray) for target, ray in rays if len(ray) == length], dtype=np.intp).T
+                      for length in (1, 2))
+    return scores, steps, diagonals
+
+
+_BATCH_TABLES = _batch_tables() if np is not None else None
+_PAIR_OFFSETS = np.arange(0, 45 * 256, 256)[:, None] if np is not None else None
+
+
+def games_to_array(games):
+    """Function to stack the boards of the passed list of JanggiGame objects into an (N, 10, 9) int8 NumPy array of
+    piece codes, indexed like _board_space by [game][row][column]."""
+
+    _require_numpy()
+    data = b"".join(bytes(game._board) for game in games)
+    return np.frombuffer(data, dtype=np.int8).reshape(len(games), 10, 9).copy()
+
+
+def evaluate_batch(boards):
+    """Function to score every board in the passed (N, 10, 9) array of piece codes with vectorized NumPy operations.
+    Returns two arrays: the material and piece-square score of each board from Blue's point of view, shape (N,), and
+    the number of enemy pieces each side attacks, shape (N, 2) with Red's count first. Attacks follow the movement
+    rules only, like _pseudo_moves: a pinned piece still counts as attacking."""
+
+    _require_numpy()
+    boards = np.asarray(boards, dtype=np.int8).reshape(-1, 90)
+    scores = np.empty(len(boards), dtype=np.int32)
+    attacks = np.empty((len(boards), 2), dtype=np.int32)
+    for start in range(0, len(boards), BATCH_CHUNK):
+        chunk = slice(start, start + BATCH_CHUNK)
+        scores[chunk], attacks[chunk] = _evaluate_chunk(boards[chunk])
+    return scores, attacks
+
+
+def _evaluate_chunk(boards):
+    """Helper function that scores the passed (n, 90) int8 array of boards for evaluate_batch. The attacks are worked
+    out on bit planes, (10, 9, bytes) arrays with one bit per board for every space, packed eight boards to a byte,
+    so each operation covers eight boards per byte and a move shape covers every space it can start from at once."""
+
+    score_table, steps, diagonals = _BATCH_TABLES
+    count = len(boards)
+    columns = np.ascontiguousarray(boards.T)  # (90, n): one row of boards per space
+    pairs = (columns[0::2].view(np.uint8) << 4) | columns[1::2].view(np.uint8)
+    scores = score_table.take(pairs + _PAIR_OFFSETS).sum(axis=0, dtype=np.int32)
+
+    def plane(mask):  # packs a (90, n) mask into a (10, 9, bytes) bit plane
+        return np.packbits(mask, axis=1).reshape(10, 9, -1)
+
+    empty = plane(columns == EMPTY)
+    occupied = ~empty
+    blue = plane(columns & BLUE != 0)
+    kinds = columns & PIECE_TYPE
+    pieces = {kind: plane(kinds == kind) for kind in (GENERAL, GUARD, ELEPHANT, HORSE, CHARIOT, CANNON, SOLDIER)}
+    sides = {RED: ~blue, BLUE: blue}
+    attacked = {color: np.zeros_like(empty) for color in (RED, BLUE)}  # spaces each color attacks
+
+    for color in (RED, BLUE):
+        reached = attacked[color]
+        for kinds_moving, (blocks, singles) in steps[color]:
+            movers = sides[color] & pieces[kinds_moving[0]]
+            for kind in kinds_moving[1:]:
+                movers |= sides[color] & pieces[kind]
+            for start, target, *legs in blocks:
+                hits = movers[start]
+                for leg in legs:  # every space passed over has to be empty
+                    hits = hits & empty[leg]
+                reached[target] |= hits
+            movers_at, empty_at, reached_at = (array.reshape(90, -1) for array in (movers, empty, reached))
+            for from_square, to_square, legs in singles:  # moves that do not fit a block, by board index
+                hits = movers_at[from_square]
+                for leg in legs:
+                    hits = hits & empty_at[leg]
+                reached_at[to_square] |= hits
+
+    # chariots attack the first piece along a line; cannons attack the piece after a single screen that is not a
+    # cannon, and cannot capture cannons
+    not_cannon = ~pieces[CANNON]
+    for axis in (0, 1):
+        first_chariot, first_blue, second_cannon, second_blue = _line_scan(occupied, pieces[CHARIOT], pieces[CANNON],
+                                                                           blue, axis)
+        second_cannon &= not_cannon
+        attacked[RED] |= np.bitwise_or.reduce(first_chariot & ~first_blue | second_cannon & ~second_blue, axis=0)
+        attacked[BLUE] |= np.bitwise_or.reduce(first_chariot & first_blue | second_cannon & second_blue, axis=0)
+
+    # palace diagonals: from the center one space to a corner, where only a chariot can attack, or from a corner
+    # through the center to the opposite corner
+    occupied_at, chariot_at, cannon_at = (array.reshape(90, -1) for array in (occupied, pieces[CHARIOT],
+                                                                              pieces[CANNON]))
+    (centers, corners), (targets, middle, far) = diagonals
+    for color in (RED, BLUE):
+        side_at = sides[color].reshape(90, -1)
+        np.bitwise_or.at(attacked[color].reshape(90, -1), centers, chariot_at[corners] & side_at[corners])
+        hits = chariot_at[middle] & side_at[middle] | ~occupied_at[middle] & chariot_at[far] & side_at[far]
+        hits |= occupied_at[middle] & ~cannon_at[middle] & cannon_at[far] & side_at[far] & ~cannon_at[targets]
+        np.bitwise_or.at(attacked[color].reshape(90, -1), targets, hits)
+
+    attacks = np.empty((count, 2), dtype=np.int32)
+    for color in (RED, BLUE):
+        enemy = (occupied & sides[color ^ BLUE]).reshape(90, -1)  # pieces of the other color
+        hits = attacked[color].reshape(90, -1) & enemy
+        attacks[:, color >> 3] = np.unpackbits(hits, axis=1, count=count).sum(axis=0, dtype=np.uint8)
+    return scores, attacks
+
+
+def _line_scan(occupied, chariots, cannons, blue, axis):
+    """Helper function that looks from every space both ways along its column (axis 0) or row (axis 1) on the passed
+    (10, 9, bytes) bit planes. Returns four arrays of planes, one for each direction: the first piece met is a
+    chariot, the first piece is blue, the second piece is a cannon after a screen that is not a cannon, and the
+    second piece is blue. Each space takes what it needs from its neighbour, so a line is scanned once for all its
+    spaces, and both directions are scanned together."""
+
+    planes = []
+    for plane in (occupied, chariots, cannons, ~cannons, blue):
+        plane = np.moveaxis(plane, axis, 0)
+        planes.append(np.stack((plane, plane[::-1])))  # the second copy is scanned from the other end
+    occupied, chariots, cannons, screens, blue = planes
+    results = np.zeros((5,) + occupied.shape, dtype=np.uint8)
+    first_chariot, first_blue, first_cannon, second_cannon, second_blue = results
+    for index in range(1, occupied.shape[1]):
+        before = index - 1
+        here = occupied[:, before]  # the neighbour: when it holds a piece it is the first piece, else look past it
+        _select(here, chariots[:, before], first_chariot[:, before], first_chariot[:, index])
+        _select(here, blue[:, before], first_blue[:, before], first_blue[:, index])
+        _select(here, cannons[:, before], first_cannon[:, before], first_cannon[:, index])
+        _select(here, screens[:, before] & first_cannon[:, before], second_cannon[:, before], second_cannon[:, index])
+        _select(here, first_blue[:, before], second_blue[:, before], second_blue[:, index])
+    return [np.moveaxis(np.stack((result[0], result[1, ::-1])), 1, axis + 1)
+            for result in (first_chariot, first_blue, second_cannon, second_blue)]
+
+
+def _select(mask, chosen, other, out):
+    """Helper function that writes to out the bits of chosen where the mask bit is set and of other elsewhere."""
+    np.bitwise_xor(other, mask & (chosen ^ other), out=out)
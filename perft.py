@@ -0,0 +1,99 @@
+# Perft (performance test) for the JanggiGame move generator.
+#
+# perft counts the positions reached after every sequence of legal moves to a fixed depth. The totals catch move
+# generation and check detection regressions (they must not change unless the rules do) and the nodes per second
+# catch speed regressions. Passing is not counted as a move.
+#
+# Run "python -m perft --depth 3" for the opening position, "python -m perft --position all --depth 2" for every named
+# position, or add "--divide" to list the count below each root move.
+
+import argparse
+import time
+
+from Janggi import JanggiGame, BLUE, RED, SQUARE_NAMES, START_FEN
+
+# named test positions in the FEN-style notation read by JanggiGame.from_fen
+POSITIONS = {
+    "start": START_FEN,
+    # both sides develop their horses
+    "horses": "RB1A1AB1R/4K4/1C1N2NC1/P1P1P1P1P/9/9/p1p1p1p1p/1c1n2nc1/4k4/rb1a1ab1r b U",
+    # chariots see the river
+    "open-files": "RBNA1ABNR/4K4/1C5C1/1PP1P1PP1/9/9/1pp1p1pp1/1c5c1/4k4/rbna1abnr b U",
+    # cannons on the e-file behind soldiers
+    "cannons": "RB1A1ABNR/4K4/3NC2C1/P1P1P1P2/8P/8p/p1p1p1p2/3nc2c1/4k4/rb1a1abnr b U",
+    # blue's cannon gives check over e4
+    "check": "RB1A1ABNR/4K4/3NC2C1/P1P2PP1P/9/p8/2p1p1p1p/1c1n3c1/4k4/rb1a1abnr r U",
+    # blue's chariot checks along the red palace diagonal
+    "palace": "3A1A3/4K4/9/9/9/9/9/3R1c3/4k4/3a1a3 r U",
+}
+
+
+def _count(game, depth):
+    """Helper function that returns the number of move sequences of the passed depth from the game's position. Moves
+    are made and taken back with the game's move stack."""
+
+    moves = game._legal_moves(BLUE if game._turn == "Blue" else RED)  # moves that do not leave the general in check
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for from_square, to_square in moves:
+        game._push_move(from_square, to_square)
+        nodes += _count(game, depth - 1)
+        game._pop_move()
+    return nodes
+
+
+def perft(game, depth):
+    """Returns the number of leaf positions reached by playing every legal move sequence of the passed depth from the
+    passed game's position. The game is left as it was."""
+
+    if depth <= 0:
+        return 1
+    return _count(game, depth)
+
+
+def divide(game, depth):
+    """Returns a list of (from_location, to_location, nodes) for every legal root move, where nodes is the perft count
+    of the passed depth below that move. The counts add up to perft(game, depth)."""
+
+    results = []
+    for from_square, to_square in game._legal_moves(BLUE if game._turn == "Blue" else RED):
+        game._push_move(from_square, to_square)
+        results.append((SQUARE_NAMES[from_square], SQUARE_NAMES[to_square], perft(game, depth - 1)))
+        game._pop_move()
+    return results
+
+
+def position(name):
+    """Returns a new JanggiGame set up at the passed named test position. Raises KeyError for an unknown name."""
+    return JanggiGame.from_fen(POSITIONS[name])
+
+
+def main(argv=None):
+    """Runs perft on the requested positions and prints the node counts, time and nodes per second."""
+
+    parser = argparse.ArgumentParser(description="Count Janggi move sequences to a fixed depth.")
+    parser.add_argument("--depth", type=int, default=3, help="depth in plies (default 3)")
+    parser.add_argument("--position", default="start", choices=sorted(POSITIONS) + ["all"],
+                        help="named position to count from, or all (default start)")
+    parser.add_argument("--divide", action="store_true", help="print the count below each root move")
+    args = parser.parse_args(argv)
+
+    names = sorted(POSITIONS) if args.position == "all" else [args.position]
+    for name in names:
+        game = position(name)
+        start = time.perf_counter()
+        if args.divide:
+            results = divide(game, args.depth)
+            for from_location, to_location, nodes in results:
+                print("%s-%s %d" % (from_location, to_location, nodes))
+            nodes = sum(result[2] for result in results)
+        else:
+            nodes = perft(game, args.depth)
+        elapsed = time.perf_counter() - start
+        print("%-10s depth %d  nodes %10d  time %7.2fs  nps %8d" % (
+            name, args.depth, nodes, elapsed, nodes / elapsed if elapsed > 0 else 0))
+
+
+if __name__ == "__main__":
+    main()
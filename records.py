@@ -0,0 +1,161 @@
+# Streaming reader and writer for Janggi game records.
+#
+# A record file holds any number of games. Each game is a block of header lines such as [Blue "Kim"] or
+# [Result "BLUE_WON"], followed by the moves, written as from-to pairs in algebraic notation (c7-c6, with a pass
+# written as a move to the same space) and optionally numbered ("1. c7-c6 c1-d3 2. ..."). An [FEN "..."] header gives
+# a start position other than the opening. Games are separated by a blank line:
+#
+#     [Event "Club match"]
+#     [Result "UNFINISHED"]
+#
+#     1. c7-c6 c1-d3 2. h10-g8
+#
+# Files are read and written one line at a time, so memory use does not depend on the file size. Run
+# "python -m records games.jgr" to check every game in a file by replaying it with make_move.
+
+import argparse
+import re
+
+from Janggi import JanggiGame
+from batch import replay_game
+
+_HEADER = re.compile(r'\[(\w+)\s+"((?:[^"\\]|\\.)*)"\]$')
+_MOVE = re.compile(r"([a-i](?:10|[1-9]))-([a-i](?:10|[1-9]))$")
+_MOVE_NUMBER = re.compile(r"\d+\.$")
+_UNESCAPE = re.compile(r"\\(.)")
+
+MOVES_PER_LINE = 8  # moves written on each move line, with a move number before each Blue and Red pair
+
+
+class RecordError(ValueError):
+    """Raised when a record file is not in the game record format. The message includes the line number."""
+
+
+class GameRecord:
+    """Class represents one game read from or written to a record file: its headers as a dictionary in file order,
+    its moves as (from_location, to_location) pairs, and, once checked by read_games, the ReplayResult of playing
+    the moves with make_move."""
+
+    def __init__(self, headers=None, moves=None):
+        """Initializes the record with the passed headers and moves, or none."""
+        self.headers = headers if headers is not None else {}
+        self.moves = moves if moves is not None else []
+        self.replay = None
+
+    def __repr__(self):
+        """Returns a short description of the record."""
+        return "GameRecord(headers=%r, moves=%d)" % (self.headers, len(self.moves))
+
+
+def read_games(lines, validate=True):
+    """Generator that yields a GameRecord for every game in the passed iterable of lines, such as an open record file,
+    reading one line at a time. With validate, each game is replayed with make_move on a single reused JanggiGame and
+    the outcome is stored in the record's replay attribute before it is yielded. Raises RecordError on a line that is
+    not a header, a move or a move number."""
+
+    game = JanggiGame() if validate else None
+    record = None
+    in_headers = False  # True until the blank line after a game's headers; a header after that starts the next game
+
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            if record is not None and record.moves:  # blank line after the moves ends the game
+                yield _finish(record, game)
+                record = None
+            in_headers = False
+            continue
+
+        if line[0] == "[":
+            match = _HEADER.match(line)
+            if match is None:
+                raise RecordError("line %d: invalid header %r" % (line_number, line))
+            if record is not None and not in_headers:  # headers after the moves or the gap start the next game
+                yield _finish(record, game)
+                record = None
+            if record is None:
+                record = GameRecord()
+            record.headers[match.group(1)] = _UNESCAPE.sub(r"\1", match.group(2))
+            in_headers = True
+            continue
+
+        if record is None:
+            record = GameRecord()
+        in_headers = False
+        for token in line.split():
+            match = _MOVE.match(token)
+            if match is not None:
+                record.moves.append(match.groups())
+            elif _MOVE_NUMBER.match(token) is None:
+                raise RecordError("line %d: invalid move %r" % (line_number, token))
+
+    if record is not None:
+        yield _finish(record, game)
+
+
+def _finish(record, game):
+    """Helper function that replays the passed record's moves on the passed game, if any, and returns the record."""
+
+    if game is not None:
+        start_fen = record.headers.get("FEN")
+        try:
+            record.replay = replay_game(game, record.moves, start_fen)
+        except ValueError:
+            raise RecordError("invalid FEN header %r" % start_fen) from None
+    return record
+
+
+def write_game(file, record):
+    """Writes the passed GameRecord to the passed text file: its headers, a blank line, its numbered moves and a
+    blank line to separate it from the next game."""
+
+    for key, value in record.headers.items():
+        file.write('[%s "%s"]\n' % (key, value.replace("\\", "\\\\").replace('"', '\\"')))
+    file.write("\n")
+
+    tokens = []
+    for index, (from_location, to_location) in enumerate(record.moves):
+        if index % 2 == 0:
+            tokens.append("%d." % (index // 2 + 1))
+        tokens.append(from_location + "-" + to_location)
+        if index % MOVES_PER_LINE == MOVES_PER_LINE - 1:
+            file.write(" ".join(tokens) + "\n")
+            tokens = []
+    if tokens:
+        file.write(" ".join(tokens) + "\n")
+    file.write("\n")
+
+
+def write_games(file, records):
+    """Writes every GameRecord from the passed iterable to the passed text file as it is produced, so records can be
+    generated one at a time. Returns the number of games written."""
+
+    count = 0
+    for record in records:
+        write_game(file, record)
+        count += 1
+    return count
+
+
+def main(argv=None):
+    """Replays every game in the passed record files and prints the games with illegal moves and a summary."""
+
+    parser = argparse.ArgumentParser(description="Check Janggi game record files by replaying every game.")
+    parser.add_argument("files", nargs="+", help="record files to check")
+    args = parser.parse_args(argv)
+
+    for path in args.files:
+        games = illegal = 0
+        with open(path) as file:
+            for record in read_games(file):
+                games += 1
+                if record.replay.first_illegal is not None:
+                    illegal += 1
+                    index, (from_location, to_location) = record.replay.first_illegal
+                    print("%s: game %d: move %d %s-%s is illegal" % (path, games, index + 1, from_location,
+                                                                     to_location))
+        print("%s: %d games, %d with illegal moves" % (path, games, illegal))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+# Alpha-beta search for a computer opponent playing JanggiGame positions.
+#
+# Run "python -m search --depth 3" to search the opening position to a fixed depth and report the best move, the
+# principal variation and nodes per second for each iteration.
+
+import argparse
+import time
+from array import array
+
+from Janggi import JanggiGame, BLUE, RED, EMPTY, PIECE_TYPE, PIECE_VALUES, SQUARE_NAMES
+from evaluation import evaluate
+
+MATE_SCORE = 100000  # score for delivering checkmate; mates found sooner score higher
+INFINITE = MATE_SCORE + 1
+
+CHECK_INTERVAL = 1024  # nodes searched between time/node budget checks
+
+# transposition table bound types: the stored score is exact, a lower bound (beta cutoff) or an upper bound (no move
+# raised alpha); zero marks an empty slot
+EXACT = 1
+LOWER_BOUND = 2
+UPPER_BOUND = 3
+
+DEFAULT_TABLE_MB = 16  # transposition table size used when none is passed to Searcher
+SLOT_BYTES = 16  # one 64-bit key and one 64-bit packed entry per slot
+BUCKET_SLOTS = 2  # a depth-preferred slot and an always-replace slot per bucket
+
+# bit layout of a packed entry: | score + SCORE_OFFSET | age (6) | depth (8) | bound (2) | move + 1 (13) |
+SCORE_OFFSET = INFINITE
+MATE_BOUND = MATE_SCORE - 1000  # scores beyond this are mates, stored relative to the node rather than the root
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time or node budget runs out, to unwind to the root."""
+
+
+class SearchResult:
+    """Class represents the outcome of a search: the best move found as a (from_location, to_location) pair in
+    algebraic notation, its score in centipawn-like units from the point of view of the side to move, the deepest
+    completed depth, the principal variation, the number of nodes searched and the time taken in seconds."""
+
+    def __init__(self, best_move, score, depth, principal_variation, nodes, elapsed):
+        """Initializes all data members for class SearchResult."""
+        self.best_move = best_move
+        self.score = score
+        self.depth = depth
+        self.principal_variation = principal_variation
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def nodes_per_second(self):
+        """Method to get the search speed in nodes per second."""
+        if self.elapsed <= 0:
+            return 0
+        return int(self.nodes / self.elapsed)
+
+    def __repr__(self):
+        return "SearchResult(best_move=%r, score=%d, depth=%d, nodes=%d, nps=%d)" % (
+            self.best_move, self.score, self.depth, self.nodes, self.nodes_per_second())
+
+
+class TranspositionTable:
+    """Class represents a fixed-size transposition table keyed by position hash. Each bucket has a depth-preferred
+    slot, which keeps the deepest result seen for the bucket unless it is left over from an earlier search, and an
+    always-replace slot, which takes every other result. Keys and packed entries live in two flat 64-bit arrays, so
+    the memory used is fixed by the size in megabytes passed at creation and never grows."""
+
+    def __init__(self, size_mb=DEFAULT_TABLE_MB):
+        """Initializes a table of at most size_mb megabytes (at least one bucket) and zeroes the counters."""
+
+        self._buckets = max(1, int(size_mb * 1024 * 1024) // (SLOT_BYTES * BUCKET_SLOTS))
+        self._keys = array("Q", bytes(8 * BUCKET_SLOTS * self._buckets))
+        self._entries = array("Q", bytes(8 * BUCKET_SLOTS * self._buckets))
+        self._age = 0
+        self.hits = 0  # probes that found the position
+        self.misses = 0  # probes that did not find the position
+        self.collisions = 0  # misses where the bucket was holding other positions
+
+    def memory_bytes(self):
+        """Method to get the number of bytes used by the table's slots."""
+        return self._buckets * BUCKET_SLOTS * SLOT_BYTES
+
+    def clear(self):
+        """Method to empty every slot and zero the counters."""
+        self._keys = array("Q", bytes(8 * BUCKET_SLOTS * self._buckets))
+        self._entries = array("Q", bytes(8 * BUCKET_SLOTS * self._buckets))
+        self._age = 0
+        self.hits = self.misses = self.collisions = 0
+
+    def new_search(self):
+        """Method to start a new search generation, so entries left from earlier searches give way in the
+        depth-preferred slots."""
+        self._age = (self._age + 1) & 63
+
+    def probe(self, key):
+        """Method to look up the passed position hash. Returns (depth, score, bound, move) with the move as a (from
+        index, to index) pair or None, or returns None if the position is not stored."""
+
+        slot = (key % self._buckets) * BUCKET_SLOTS
+        keys = self._keys
+        for index in (slot, slot + 1):
+            if keys[index] == key:
+                data = self._entries[index]
+                if data:
+                    self.hits += 1
+                    move = (data & 8191) - 1
+                    return ((data >> 15) & 255, (data >> 29) - SCORE_OFFSET, (data >> 13) & 3,
+                            divmod(move, 90) if move >= 0 else None)
+        self.misses += 1
+        if self._entries[slot] or self._entries[slot + 1]:
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, score, bound, move):
+        """Method to store the search result for the passed position hash: the depth searched, the score, its bound
+        type and the best (from index, to index) move, or None."""
+
+        slot = (key % self._buckets) * BUCKET_SLOTS
+        data = (((score + SCORE_OFFSET) << 29) | (self._age << 23) | (depth << 15) | (bound << 13) |
+                (move[0] * 90 + move[1] + 1 if move is not None else 0))
+
+        preferred = self._entries[slot]
+        if (not preferred or self._keys[slot] == key or depth >= (preferred >> 15) & 255 or
+                (preferred >> 23) & 63 != self._age):
+            index = slot  # depth-preferred slot: empty, same position, shallower or from an earlier search
+        else:
+            index = slot + 1  # always-replace slot
+        self._keys[index] = key
+        self._entries[index] = data
+
+    def stats(self):
+        """Method to get the hit, miss and collision counters and the hit rate as a dictionary."""
+        probes = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "collisions": self.collisions,
+                "hit_rate": self.hits / probes if probes else 0.0}
+
+
+class Searcher:
+    """Class runs a negamax search with alpha-beta pruning and iterative deepening on a JanggiGame. Moves are made
+    and taken back on the game itself with its move stack, so the game is left exactly as it was after a search.
+    Results are kept in a transposition table, which can be shared by searches of successive moves of a game."""
+
+    def __init__(self, game, table=None):
+        """Initializes the searcher for the passed parameter game, using the passed TranspositionTable or a new one of
+        DEFAULT_TABLE_MB megabytes."""
+        self._game = game
+        self.table = table if table is not None else TranspositionTable()
+        self._nodes = 0
+        self._deadline = None
+        self._node_limit = None
+        self._pv = []  # principal variation found below each ply, as lists of (from index, to index) moves
+        self._previous_pv = []  # principal variation of the last completed depth, searched first
+
+    def evaluate(self):
+        """Method to score the position on the board from the point of view of the side to move, with the static
+        evaluation in evaluation.py."""
+        return evaluate(self._game)
+
+    def search(self, max_depth=64, time_limit=None, node_limit=None):
+        """Method to search the game's current position, deepening one ply at a time up to max_depth, until the
+        optional time_limit (seconds) or node_limit is used up. Returns the SearchResult of the deepest completed
+        iteration, or None if the side to move has no legal move."""
+
+        result = None
+        for result in self.iterative_deepening(max_depth, time_limit, node_limit):
+            pass
+        return result
+
+    def iterative_deepening(self, max_depth=64, time_limit=None, node_limit=None):
+        """Generator that deepens the search of the game's current position one ply at a time up to max_depth, until
+        the optional time_limit (seconds) or node_limit is used up, yielding the SearchResult of every completed depth.
+        The principal variation of each depth is searched first at the next depth."""
+
+        game = self._game
+        start = time.perf_counter()
+        self._nodes = 0
+        self._deadline = start + time_limit if time_limit is not None else None
+        self._node_limit = node_limit
+        base = len(game._move_stack)
+        self._previous_pv = []
+        self.table.new_search()
+
+        for depth in range(1, max_depth + 1):
+            self._pv = [[] for ply in range(depth + 1)]
+            try:
+                score = self._negamax(depth, -INFINITE, INFINITE, 0)
+            except SearchTimeout:
+                while len(game._move_stack) > base:  # unwind the moves made by the interrupted iteration
+                    game._pop_move()
+                return
+
+            if not self._pv[0]:  # no legal move at the root
+                return
+            self._previous_pv = self._pv[0]
+            principal_variation = [(SQUARE_NAMES[from_square], SQUARE_NAMES[to_square])
+                                   for from_square, to_square in self._pv[0]]
+            yield SearchResult(principal_variation[0], score, depth, principal_variation, self._nodes,
+                               time.perf_counter() - start)
+
+            if abs(score) >= MATE_SCORE - max_depth:  # a forced mate was found, deeper search cannot improve it
+                return
+
+    def _ordered_moves(self, color, ply, table_move):
+        """Method to list the pseudo-legal moves of the passed color, with the transposition table move and the
+        previous iteration's principal variation move first, then captures of the most valuable pieces by the least
+        valuable attackers."""
+
+        board = self._game._board
+        moves = list(self._game._pseudo_moves(color))
+        previous = self._previous_pv[ply] if ply < len(self._previous_pv) else None
+
+        def order(move):
+            if move == table_move:
+                return -INFINITE - 1
+            if move == previous:
+                return -INFINITE
+            captured = board[move[1]]
+            if captured == EMPTY:
+                return 0
+            return -10 * PIECE_VALUES[captured & PIECE_TYPE] + PIECE_VALUES[board[move[0]] & PIECE_TYPE]
+
+        moves.sort(key=order)
+        return moves
+
+    def _negamax(self, depth, alpha, beta, ply):
+        """Method to score the current position from the point of view of the side to move by searching depth plies
+        ahead with alpha-beta pruning, storing the principal variation below this ply."""
+
+        self._nodes += 1
+        if self._nodes % CHECK_INTERVAL == 0:
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                raise SearchTimeout()
+            if self._node_limit is not None and self._nodes >= self._node_limit:
+                raise SearchTimeout()
+
+        self._pv[ply] = []
+        if depth == 0:
+            return self.evaluate()
+
+        game = self._game
+        key = game.position_hash()
+        table_move = None
+        entry = self.table.probe(key)
+        if entry is not None:
+            stored_depth, score, bound, table_move = entry
+            if score > MATE_BOUND:  # mate scores are stored relative to the node
+                score -= ply
+            elif score < -MATE_BOUND:
+                score += ply
+            if stored_depth >= depth and ply > 0:  # deep enough to reuse, except at the root
+                if bound == EXACT:
+                    return score
+                if bound == LOWER_BOUND and score >= beta:
+                    return score
+                if bound == UPPER_BOUND and score <= alpha:
+                    return score
+
+        color = BLUE if game._turn == "Blue" else RED
+        original_alpha = alpha
+        legal_moves = 0
+        best = -INFINITE
+        best_move = None
+
+        for move in self._ordered_moves(color, ply, table_move):
+            game._push_move(move[0], move[1])
+            if game._in_check(color) is not False:  # move leaves own general in check
+                game._pop_move()
+                continue
+            legal_moves += 1
+            score = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            game._pop_move()
+
+            if score > best:
+                best = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    self._pv[ply] = [move] + self._pv[ply + 1]
+                    if alpha >= beta:  # opponent will avoid this line
+                        break
+
+        if legal_moves == 0:
+            if game._in_check(color):
+                return -MATE_SCORE + ply  # checkmated
+            return self.evaluate()  # no piece can move, but the player may still pass
+
+        if best >= beta:
+            bound = LOWER_BOUND
+        elif best > original_alpha:
+            bound = EXACT
+        else:
+            bound = UPPER_BOUND
+        stored = best
+        if stored > MATE_BOUND:
+            stored += ply
+        elif stored < -MATE_BOUND:
+            stored -= ply
+        self.table.store(key, depth, stored, bound, best_move)
+        return best
+
+
+def find_best_move(game, max_depth=4, time_limit=None, node_limit=None):
+    """Function to search the passed parameter game's position and return the best move found as a (from_location,
+    to_location) pair ready for make_move, or None if the side to move has no legal move."""
+
+    result = Searcher(game).search(max_depth, time_limit, node_limit)
+    if result is None:
+        return None
+    return result.best_move
+
+
+def main(argv=None):
+    """Searches the opening position (or the position after the passed moves) and prints every iteration."""
+
+    parser = argparse.ArgumentParser(description="Search a Janggi position with iterative deepening alpha-beta.")
+    parser.add_argument("--depth", type=int, default=3, help="maximum search depth in plies (default 3)")
+    parser.add_argument("--time", type=float, default=None, help="time budget in seconds")
+    parser.add_argument("--nodes", type=int, default=None, help="node budget")
+    parser.add_argument("--hash", type=float, default=DEFAULT_TABLE_MB, help="transposition table size in MB")
+    parser.add_argument("moves", nargs="*", help="moves to play from the opening position first, e.g. c10-d8")
+    args = parser.parse_args(argv)
+
+    game = JanggiGame()
+    for move in args.moves:
+        from_location, to_location = move.split("-")
+        if not game.make_move(from_location, to_location):
+            parser.error("illegal move " + move)
+
+    searcher = Searcher(game, TranspositionTable(args.hash))
+    for result in searcher.iterative_deepening(args.depth, args.time, args.nodes):
+        print("depth %2d  score %6d  nodes %9d  time %7.2fs  nps %7d  pv %s" % (
+            result.depth, result.score, result.nodes, result.elapsed, result.nodes_per_second(),
+            " ".join(from_location + "-" + to_location for from_location, to_location in result.principal_variation)))
+    stats = searcher.table.stats()
+    print("hash %d bytes  hits %d  misses %d  collisions %d  hit rate %.1f%%" % (
+        searcher.table.memory_bytes(), stats["hits"], stats["misses"], stats["collisions"], 100 * stats["hit_rate"]))
+
+
+if __name__ == "__main__":
+    main()
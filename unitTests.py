@@ -1,5 +1,18 @@
+import copy
+import io
+import os
+import tempfile
 import unittest
-from Janggi import JanggiGame
+from Janggi import JanggiGame, SQUARE_NAMES, START_FEN, POSITION_BYTES, SETUPS, dump_positions, load_positions, \
+    piece_masks, piece_square_score
+import evaluation
+from evaluation import evaluate, evaluation_terms, evaluate_batch, games_to_array
+from benchmarks import memory_per_game, random_games, make_move_latency
+from archive import ArchiveError, GameArchive, write_archive
+from batch import replay_games, ReplayResult
+from records import GameRecord, RecordError, read_games, write_games
+from perft import perft, divide, position, POSITIONS
+from search import Searcher, TranspositionTable, find_best_move, MATE_SCORE, EXACT, LOWER_BOUND
 
 
 class TestCase(unittest.TestCase):
@@ -30,11 +43,246 @@ class TestCase(unittest.TestCase):
         result = j.is_in_check("blue")
         self.assertFalse(result)
 
+    def test_isInCheck_Chariot(self):
+        j = JanggiGame()
+        j._board_space[3][4] = " "  # clear red soldier from e4
+        j._board_space[4][4] = "BChariot"  # blue chariot on e5 sees the red general on e2
+        self.assertTrue(j.is_in_check("red"))
+        self.assertFalse(j.is_in_check("blue"))
+
+    def test_isInCheck_MovedGeneral(self):
+        j = JanggiGame()
+        j._board_space[8][4] = " "
+        j._board_space[9][4] = "BGeneral"  # blue general placed on e10 without a move
+        j._board_space[6][4] = " "
+        j._board_space[7][4] = "RHorse"  # red horse on e8 attacks d10 and f10, not e10
+        self.assertFalse(j.is_in_check("blue"))
+        j._board_space[7][4] = " "
+        j._board_space[7][3] = "RHorse"  # red horse on d8 attacks e10 through the empty d9
+        self.assertTrue(j.is_in_check("blue"))
+
+    def test_redElephant_SidewaysBackward(self):
+        j = JanggiGame()
+        board = [[" "] * 9 for row in range(10)]
+        board[1][4] = "RGeneral"
+        board[8][4] = "BGeneral"
+        board[9][0] = "RElephant"  # red elephant on a10
+        j._board_space = board
+        self.assertTrue(j.red_elephant_validate_move('a10', 'd8'))
+        board[8][2] = "BSoldier"  # piece on c9 blocks the diagonal movement
+        j._board_space = board
+        self.assertFalse(j.red_elephant_validate_move('a10', 'd8'))
+
+    def test_redSoldier_PalaceDiagonal(self):
+        j = JanggiGame.from_fen("5K3/9/9/2p6/9/9/9/9/4k4/9 r U")  # red soldier on c7
+        self.assertFalse(j.red_soldier_validate_move('c7', 'd8'))  # no diagonal line outside the palace
+        self.assertTrue(j.make_move('c7', 'c8'))
+        j.load_fen("5K3/9/3p5/9/9/9/9/9/4k4/9 r U")  # red soldier on the d8 palace corner
+        self.assertTrue(j.red_soldier_validate_move('d8', 'e9'))
+        self.assertFalse(j.red_soldier_validate_move('d8', 'c9'))
+        self.assertEqual(sorted(j.generate_legal_moves("red"))[:4],
+                         [('d8', 'c8'), ('d8', 'd9'), ('d8', 'e8'), ('d8', 'e9')])
+
+    def test_redCannon_Screens(self):
+        j = JanggiGame.from_fen("5A3/4K4/R2c5/9/C8/9/9/p8/4k4/c8 r U")
+        self.assertTrue(j.red_cannon_validate_move('a1', 'a5'))  # over the red soldier on a3
+        self.assertFalse(j.red_cannon_validate_move('a1', 'a6'))  # cannot capture a cannon
+        self.assertFalse(j.red_cannon_validate_move('a1', 'a8'))  # cannot jump over a cannon
+        self.assertTrue(j.red_cannon_validate_move('d8', 'f10'))  # over the blue general on the palace diagonal
+        self.assertFalse(j.red_cannon_validate_move('d8', 'e9'))
+        j.load_fen("5C3/4K4/R2c5/9/C8/9/9/p8/4k4/c8 r U")
+        self.assertFalse(j.red_cannon_validate_move('d8', 'f10'))
+
+    def test_boardSpace(self):
+        j = JanggiGame()
+        self.assertEqual(j._board_space[0][0], "RChariot")
+        self.assertEqual(j._board_space[8][4], "BGeneral")
+        j.make_move('c10', 'd8')
+        self.assertEqual(j._board_space[7][3], "BHorse")
+        self.assertEqual(j._board_space[9][2], " ")
+        row = j._board_space[0]
+        row[4] = "RCannon"  # writes through to the board
+        self.assertEqual(row, j._board_space[0])
+        self.assertEqual(j.position_hash(), JanggiGame.from_fen(j.to_fen()).position_hash())
+        self.assertRaises(KeyError, row.__setitem__, 0, "RKing")
+        self.assertRaises(TypeError, row.append, " ")
+        with self.assertRaises(TypeError):  # rows cannot be replaced, only their spaces
+            j._board_space[0] = row
+        self.assertRaises(TypeError, j._board_space.append, row)
+
+    def test_boardSpace_EqualsPlainList(self):
+        j = JanggiGame()
+        plain = [list(row) for row in j._board_space]  # a plain list of lists of piece names
+        self.assertIsInstance(j._board_space, list)
+        self.assertEqual(j._board_space, plain)
+        self.assertEqual(plain, j._board_space)
+        self.assertEqual(j._board_space, JanggiGame()._board_space)
+        j.make_move('c7', 'c6')
+        self.assertNotEqual(j._board_space, plain)
+
+    def test_generateLegalMoves_MatchesMakeMove(self):
+        j = JanggiGame()
+        j.make_move('c7', 'c6')
+        j.make_move('c1', 'd3')
+        for team in ("Red", "Blue"):
+            accepted = set()
+            for square, from_location in enumerate(SQUARE_NAMES):
+                if j._board_space[square // 9][square % 9][0] != team[0]:  # only try the team's own pieces
+                    continue
+                for to_location in SQUARE_NAMES:
+                    trial = copy.deepcopy(j)
+                    trial.set_turn(team)
+                    if from_location != to_location and trial.make_move(from_location, to_location):
+                        accepted.add((from_location, to_location))
+            self.assertEqual(set(j.generate_legal_moves(team)), accepted)
+
+    def test_generateLegalMoves_Start(self):
+        j = JanggiGame()
+        moves = j.generate_legal_moves("blue")
+        self.assertIn(('c10', 'd8'), moves)
+        self.assertNotIn(('c10', 'b8'), moves)
+        self.assertEqual(len(moves), len(set(moves)))
+
+    def test_generateLegalMoves_Pinned(self):
+        j = JanggiGame.from_fen("4K4/9/9/4R4/9/9/9/4n4/4k4/9 r U")  # blue chariot on e7 pins the red horse on e3
+        general, checks, pins = j._pins_and_checkers(0)
+        self.assertEqual(checks, [])
+        self.assertEqual(sorted(SQUARE_NAMES[square] for square in pins), ['e3', 'e4', 'e5', 'e6', 'e7'])
+        self.assertEqual({from_location for from_location, to_location in j.generate_legal_moves("red")}, {'e2'})
+        self.assertFalse(j.make_move('e3', 'd5'))
+        for name in POSITIONS:
+            game = position(name)
+            for color in (0, 8):
+                self.assertEqual(game._legal_moves(color), [move for move in game._pseudo_moves(color)
+                                                            if game._is_safe_move(color, move[0], move[1])])
+
+    def test_pass_InCheck(self):
+        j = JanggiGame.from_fen("3K5/9/9/9/9/9/9/9/4k4/4R4 r U")  # blue chariot on e1 checks the red general on e2
+        self.assertFalse(j.make_move('e2', 'e2'))  # red cannot pass out of check
+        self.assertEqual(j.get_turn(), "Red")
+        self.assertFalse(j.make_move('e2', 'e3'))  # still attacked along the e-file
+        self.assertTrue(j.make_move('e2', 'd2'))
+        self.assertTrue(j.make_move('e1', 'e1'))  # blue is not in check and may pass
+
     def test_isInCheckmate_Blue(self):
         j = JanggiGame()
         result = j.is_in_checkmate_blue()
         self.assertFalse(result)
 
+    def test_isInCheckmate_TwoChariots(self):
+        j = JanggiGame()
+        board = [[" "] * 9 for row in range(10)]
+        board[1][4] = "RGeneral"
+        board[9][4] = "BGeneral"  # blue general on e10
+        board[0][0] = "RChariot"  # red chariot on a1 will close rank 10
+        board[8][8] = "RChariot"  # red chariot on i9 covers rank 9
+        j._board_space = board
+        j.set_turn("Red")
+        self.assertTrue(j.make_move('a1', 'a10'))
+        self.assertTrue(j.is_in_check("blue"))
+        self.assertEqual(j.get_game_state(), "RED_WON")
+        self.assertFalse(j.make_move('e10', 'd10'))
+
+    def test_isInCheckmate_BlockAvailable(self):
+        j = JanggiGame()
+        board = [[" "] * 9 for row in range(10)]
+        board[1][4] = "RGeneral"
+        board[9][4] = "BGeneral"
+        board[9][0] = "RChariot"  # red chariot on a10 checks along rank 10
+        board[8][8] = "RChariot"
+        board[0][1] = "BChariot"  # blue chariot on b1 can block on b10
+        j._board_space = board
+        self.assertTrue(j.is_in_check("blue"))
+        self.assertFalse(j.is_in_checkmate_blue())
+        self.assertEqual(j.generate_legal_moves("blue"), [('b1', 'b10')])
+        self.assertEqual(j.get_game_state(), "UNFINISHED")
+
+    def test_rejectedCapture_RestoresPiece(self):
+        j = JanggiGame()
+        board = [[" "] * 9 for row in range(10)]
+        board[1][4] = "RGeneral"
+        board[8][4] = "BGeneral"
+        board[2][4] = "RChariot"  # red chariot on e3 shields the red general
+        board[5][4] = "BChariot"  # blue chariot on e6
+        board[2][0] = "BHorse"  # blue horse on a3
+        j._board_space = board
+        j.set_turn("Red")
+        self.assertFalse(j.make_move('e3', 'a3'))  # capture would expose the red general
+        self.assertEqual(j._board_space[2][0], "BHorse")
+        self.assertEqual(j._board_space[2][4], "RChariot")
+        self.assertEqual(j.get_turn(), "Red")
+
+    def test_undoMove(self):
+        j = JanggiGame()
+        start = j._board_space
+        moves = [('c7', 'c6'), ('c4', 'c5'), ('c6', 'c5'), ('e2', 'e2'), ('b8', 'b8')]
+        for from_location, to_location in moves:
+            self.assertTrue(j.make_move(from_location, to_location))
+        self.assertEqual(j._board_space[4][2], "BSoldier")  # blue soldier captured the red soldier on c5
+        for move in moves:
+            self.assertTrue(j.undo_move())
+        self.assertFalse(j.undo_move())
+        self.assertEqual(j._board_space, start)
+        self.assertEqual(j.get_turn(), "Blue")
+
+    def test_reverseBoard(self):
+        j = JanggiGame()
+        self.assertFalse(j.blue_reverse_board("BSoldier", 'c7', 'c6'))  # nothing to reverse
+        self.assertFalse(j.blue_update_board("BHorse", 'c7', 'c6'))  # no blue horse on c7
+        self.assertTrue(j.blue_update_board("BSoldier", 'c7', 'c6'))
+        self.assertEqual(j.get_turn(), "Red")
+        self.assertFalse(j.blue_reverse_board("BSoldier", 'a7', 'a6'))  # not the last move, so it stays
+        self.assertEqual(j._board_space[5][2], "BSoldier")
+        self.assertFalse(j.blue_reverse_board("BSoldier", 'c7', 'c6'))
+        self.assertEqual(j._board_space[6][2], "BSoldier")
+        self.assertEqual(j.get_turn(), "Blue")
+        self.assertFalse(j.undo_move())
+
+    def test_undoMove_GameState(self):
+        j = JanggiGame()
+        board = [[" "] * 9 for row in range(10)]
+        board[1][4] = "RGeneral"
+        board[9][4] = "BGeneral"
+        board[0][0] = "RChariot"
+        board[8][8] = "RChariot"
+        j._board_space = board
+        j.set_turn("Red")
+        j.make_move('a1', 'a10')
+        self.assertEqual(j.get_game_state(), "RED_WON")
+        j.undo_move()
+        self.assertEqual(j.get_game_state(), "UNFINISHED")
+        self.assertEqual(j.get_turn(), "Red")
+        self.assertEqual(j._board_space[0][0], "RChariot")
+
+    def test_positionHash(self):
+        j = JanggiGame()
+        k = JanggiGame()
+        start = j.position_hash()
+        for from_location, to_location in [('c7', 'c6'), ('c1', 'd3'), ('g7', 'g6'), ('h1', 'g3')]:
+            j.make_move(from_location, to_location)
+        for from_location, to_location in [('g7', 'g6'), ('h1', 'g3'), ('c7', 'c6'), ('c1', 'd3')]:
+            k.make_move(from_location, to_location)
+        self.assertEqual(j.position_hash(), k.position_hash())  # same position reached in a different order
+        self.assertNotEqual(j.position_hash(), start)
+        j._board_space = j._board_space  # recompute the hash from scratch
+        self.assertEqual(j.position_hash(), k.position_hash())
+        while k.undo_move():
+            pass
+        self.assertEqual(k.position_hash(), start)
+
+    def test_positionHash_SideToMove(self):
+        j = JanggiGame()
+        start = j.position_hash()
+        j.make_move('e9', 'e9')  # blue passes, same pieces but red to move
+        self.assertNotEqual(j.position_hash(), start)
+        j.make_move('e2', 'e2')
+        self.assertEqual(j.position_hash(), start)
+
+    def test_isInStalemate(self):
+        j = JanggiGame()
+        self.assertFalse(j.is_in_stalemate("red"))
+        self.assertFalse(j.is_in_checkmate_red())
+
     def test_blueHorse_False(self):
         j = JanggiGame()
         result = j.make_move('c10', 'b8')
@@ -65,5 +313,364 @@ class TestCase(unittest.TestCase):
         result = j.make_move('g7', 'g6')
         self.assertTrue(result)
 
+    def test_reset(self):
+        j = JanggiGame()
+        board = j._board
+        j.make_move('c7', 'c6')
+        j.make_move('b3', 'b10')
+        j.reset()
+        self.assertIs(j._board, board)
+        self.assertEqual(j._board_space, JanggiGame()._board_space)
+        self.assertEqual(j.position_hash(), JanggiGame().position_hash())
+        self.assertEqual(j.get_turn(), "Blue")
+        self.assertFalse(j.undo_move())
+
+    def test_compactGame(self):
+        j = JanggiGame()
+        self.assertFalse(hasattr(j, "__dict__"))
+        self.assertLess(memory_per_game(1000), 800)  # loose bound, object sizes vary between Python versions
+        j.make_move('c7', 'c6')
+        k = copy.deepcopy(j)
+        self.assertEqual(k._board_space, j._board_space)
+        self.assertTrue(k.undo_move())
+        self.assertNotEqual(k._board_space, j._board_space)
+
+    def test_pieceMasks(self):
+        j = JanggiGame()
+        for from_location, to_location in [('c7', 'c6'), ('c1', 'd3'), ('c6', 'c5'), ('c4', 'c5')]:  # red takes
+            self.assertTrue(j.make_move(from_location, to_location))
+            self.assertEqual(j._piece_masks, piece_masks(j._board))
+        self.assertEqual([bin(mask).count('1') for mask in j._piece_masks], [16, 15])
+        self.assertTrue(j.undo_move())
+        self.assertEqual(j._piece_masks, piece_masks(j._board))
+        j.reset()
+        self.assertEqual(j._piece_masks, piece_masks(j._board))
+        self.assertEqual(JanggiGame.from_fen(j.to_fen())._piece_masks, j._piece_masks)
+
+    def test_moveDispatch(self):
+        j = position("horses")
+        latency = make_move_latency(5, j)
+        self.assertEqual(list(latency), ["General", "Guard", "Elephant", "Horse", "Chariot", "Cannon", "Soldier"])
+        self.assertEqual(j.to_fen(), position("horses").to_fen())
+        self.assertFalse(j.make_move('a1', 'a2'))  # red piece on blue's turn
+        self.assertFalse(j.make_move('e5', 'e6'))  # empty space
+        self.assertFalse(j.make_move('z1', 'e9'))  # off the board
+        self.assertFalse(j.make_move('b10', 'b9'))  # elephant move that is not an elephant's
+        self.assertTrue(j.make_move('b10', 'd7'))
+
+    def test_bikjangDraw(self):
+        j = JanggiGame.from_fen("4K4/9/9/9/9/9/9/9/4k4/4c4 b U")  # generals face each other on the e-file
+        self.assertTrue(j._generals_facing())
+        self.assertTrue(j.make_move('e10', 'd10'))  # blue breaks bikjang
+        self.assertEqual(j.get_game_state(), "UNFINISHED")
+        self.assertTrue(j.make_move('e2', 'd2'))  # red makes it again
+        self.assertTrue(j.make_move('d10', 'd9'))  # blue does not break it
+        self.assertEqual(j.get_game_state(), "BIKJANG_DRAW")
+        self.assertFalse(j.make_move('d2', 'e2'))
+        self.assertEqual(JanggiGame.from_bytes(j.to_bytes()).get_game_state(), "BIKJANG_DRAW")
+        self.assertTrue(j.undo_move())
+        self.assertEqual(j.get_game_state(), "UNFINISHED")
+        j.load_fen("4K4/9/9/9/9/9/9/9/4k4/4R4 r U")  # generals facing, and the blue chariot on e1 checks red
+        self.assertFalse(j.make_move('e2', 'e2'))  # no passing into a draw while in check
+        self.assertEqual(j.get_game_state(), "UNFINISHED")
+
+    def test_repetitionDraw(self):
+        j = JanggiGame()
+        moves = [('c10', 'd8'), ('c1', 'd3'), ('d8', 'c10'), ('d3', 'c1')]
+        for from_location, to_location in moves + moves[:3]:
+            self.assertTrue(j.make_move(from_location, to_location))
+        self.assertEqual(j.get_game_state(), "UNFINISHED")
+        self.assertTrue(j.make_move('d3', 'c1'))  # opening position for the third time
+        self.assertEqual(j.get_game_state(), "REPETITION_DRAW")
+        self.assertEqual(JanggiGame.from_fen(j.to_fen()).get_game_state(), "REPETITION_DRAW")
+        self.assertTrue(j.undo_move())
+        self.assertTrue(j.undo_move())
+        self.assertTrue(j.make_move('d8', 'c10'))  # taken back moves no longer count
+        self.assertEqual(j.get_game_state(), "UNFINISHED")
+        j.reset()
+        for from_location, to_location in moves:
+            self.assertTrue(j.make_move(from_location, to_location))
+        self.assertEqual(j.get_game_state(), "UNFINISHED")
+
+    def test_getScore(self):
+        j = JanggiGame()
+        self.assertEqual(j.get_score(), {"Red": 73.5, "Blue": 72})
+        for from_location, to_location in [('c7', 'c6'), ('c1', 'd3'), ('c6', 'c5'), ('c4', 'c5')]:  # red takes
+            self.assertTrue(j.make_move(from_location, to_location))
+        self.assertEqual(j.get_score(), {"Red": 73.5, "Blue": 70})
+        self.assertTrue(j.undo_move())
+        self.assertEqual(j.get_score(), {"Red": 73.5, "Blue": 72})
+        self.assertEqual(JanggiGame.from_fen("4K4/9/9/9/9/9/9/4C4/4k4/9 r U").get_score(), {"Red": 1.5, "Blue": 7})
+
+    def test_moveLimit(self):
+        j = JanggiGame(move_limit=4)
+        for from_location, to_location in [('c7', 'c6'), ('c1', 'd3'), ('c6', 'c5')]:
+            self.assertTrue(j.make_move(from_location, to_location))
+        self.assertEqual(j.get_game_state(), "UNFINISHED")
+        self.assertTrue(j.make_move('c4', 'c5'))  # fourth move, red is ahead on points after taking a soldier
+        self.assertEqual(j.get_game_state(), "RED_WON")
+        self.assertFalse(j.make_move('a7', 'a6'))
+        self.assertTrue(j.undo_move())
+        self.assertTrue(j.make_move('a4', 'a5'))  # red is still ahead by the deom bonus
+        self.assertEqual(j.get_game_state(), "RED_WON")
+        j.reset()
+        self.assertTrue(j.make_move('c7', 'c6'))
+        self.assertEqual(j.get_game_state(), "UNFINISHED")
+
+    def test_setups(self):
+        j = JanggiGame(setup_red="HEEH", setup_blue="EHHE")
+        self.assertEqual(j.to_fen(), "RBNA1ANBR/4K4/1C5C1/P1P1P1P1P/9/9/p1p1p1p1p/1c5c1/4k4/rnba1abnr b U")
+        self.assertEqual(j.position_hash(), JanggiGame.from_fen(j.to_fen()).position_hash())
+        self.assertEqual(j._piece_masks, piece_masks(j._board))
+        moves = j.generate_legal_moves("red")
+        self.assertIn(('b1', 'c3'), moves)
+        moves.clear()  # the cached opening moves must not change
+        self.assertEqual(j._legal_moves(0), list(j._safe_moves(0)))  # cached, and the same as generated
+        j.make_move('c7', 'c6')
+        j.reset(setup_blue="HEHE")
+        self.assertEqual(j.to_fen(), "RNBA1ANBR/4K4/1C5C1/P1P1P1P1P/9/9/p1p1p1p1p/1c5c1/4k4/rbna1abnr b U")
+        openings = {JanggiGame(setup_red=red, setup_blue=blue).to_fen() for red in SETUPS for blue in SETUPS}
+        self.assertEqual(len(openings), 16)
+        self.assertRaises(ValueError, JanggiGame, setup_red="EEHH")
+
+    def test_toBytes(self):
+        j = JanggiGame()
+        j.make_move('c7', 'c6')
+        j.make_move('c1', 'd3')
+        data = j.to_bytes()
+        self.assertEqual(len(data), POSITION_BYTES)
+        k = JanggiGame.from_bytes(data)
+        self.assertEqual(k._board_space, j._board_space)
+        self.assertEqual(k.get_turn(), "Blue")
+        self.assertEqual(k.position_hash(), j.position_hash())
+        self.assertTrue(k.make_move('c6', 'c5'))
+        j.set_game_state("RED_WON")
+        self.assertEqual(JanggiGame.from_bytes(j.to_bytes()).get_game_state(), "RED_WON")
+        self.assertRaises(ValueError, JanggiGame.from_bytes, data[:-1])
+        self.assertRaises(ValueError, JanggiGame.from_bytes, b"\x08" + data[1:])
+
+    def test_loadPositions(self):
+        j = JanggiGame()
+        positions = [j.to_bytes()]
+        j.make_move('a7', 'a6')
+        positions.append(j.to_bytes())
+        games = load_positions(bytearray(dump_positions([JanggiGame(), j])))
+        self.assertEqual([game.to_bytes() for game in games], positions)
+        self.assertEqual(games[1].get_turn(), "Red")
+        self.assertRaises(ValueError, load_positions, b"\x00" * (POSITION_BYTES + 1))
+
+    def test_fen(self):
+        j = JanggiGame()
+        self.assertEqual(j.to_fen(), START_FEN)
+        j.make_move('c10', 'd8')
+        self.assertEqual(j.to_fen(), "RB1A1ABNR/4K4/1C1N3C1/P1P1P1P1P/9/9/p1p1p1p1p/1c5c1/4k4/rbna1abnr r U")
+        k = JanggiGame.from_fen(j.to_fen())
+        self.assertEqual(k._board_space, j._board_space)
+        self.assertEqual(k.position_hash(), j.position_hash())
+        self.assertTrue(k.make_move('c1', 'd3'))
+        k.load_fen("4K4/9/9/9/9/9/9/9/4k4/9 r B")
+        self.assertEqual(k.get_game_state(), "BLUE_WON")
+        self.assertEqual(k._board_space[1][4], "RGeneral")
+        for fen in ("", START_FEN[:-2], START_FEN.replace("4K4", "4K5"), START_FEN.replace("K", "X"),
+                    START_FEN.replace("/9/9/", "/9/"), START_FEN.replace(" b ", " w ")):
+            self.assertRaises(ValueError, JanggiGame.from_fen, fen)
+
+
+class BatchTestCase(unittest.TestCase):
+    """BatchTestCase class tests replaying many games at once with batch.py."""
+
+    games = [[('c7', 'c6'), ('c1', 'd3'), ('b8', 'b1')],  # last move is illegal (cannon has no screen)
+             [('a10', 'a9'), ('a7', 'b7'), ('a4', 'a5')],  # second move is a blue piece on red's turn
+             [('c10', 'd8'), ('c1', 'd3')]]
+
+    def test_replayGames(self):
+        results = replay_games(self.games)
+        self.assertEqual(results[0], ReplayResult([True, True, False], "UNFINISHED", (2, ('b8', 'b1'))))
+        self.assertEqual(results[1].accepted, [True, False, True])
+        self.assertEqual(results[1].first_illegal, (1, ('a7', 'b7')))
+        self.assertEqual(results[2], ReplayResult([True, True], "UNFINISHED", None))
+
+    def test_replayGames_ProcessPool(self):
+        self.assertEqual(replay_games(self.games * 3, processes=2, chunk_size=2), replay_games(self.games * 3))
+
+
+class RecordsTestCase(unittest.TestCase):
+    """RecordsTestCase class tests reading and writing game records with records.py."""
+
+    def test_writeAndReadGames(self):
+        records = [GameRecord({"Event": 'Club "A"', "Result": "UNFINISHED"}, [('c7', 'c6'), ('c1', 'd3')] * 5),
+                   GameRecord({"Event": "No moves"}),
+                   GameRecord({"FEN": "3K5/9/9/9/9/9/9/9/4k4/9 r U"}, [('e2', 'e1'), ('d10', 'd10'), ('e1', 'e1')])]
+        file = io.StringIO()
+        self.assertEqual(write_games(file, records), 3)
+        file.seek(0)
+        games = list(read_games(file))
+        self.assertEqual([game.headers for game in games], [record.headers for record in records])
+        self.assertEqual([game.moves for game in games], [record.moves for record in records])
+        self.assertEqual(games[0].replay.first_illegal, (2, ('c7', 'c6')))
+        self.assertIsNone(games[2].replay.first_illegal)
+
+    def test_readGames_Errors(self):
+        self.assertRaises(RecordError, list, read_games(["[Event Club]"]))
+        self.assertRaises(RecordError, list, read_games(["1. c7-c6 c1-d33"]))
+        self.assertRaises(RecordError, list, read_games(['[FEN "9/9 b U"]', "", "1. c7-c6"]))
+        games = list(read_games(["1. c7-c6 c1-d3", "", "1. c10-d8"], validate=False))
+        self.assertEqual([game.moves for game in games], [[('c7', 'c6'), ('c1', 'd3')], [('c10', 'd8')]])
+        self.assertIsNone(games[0].replay)
+
+
+class ArchiveTestCase(unittest.TestCase):
+    """ArchiveTestCase class tests the memory-mapped game archive in archive.py."""
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_randomAccess(self):
+        games = [[('c7', 'c6'), ('c1', 'd3')], [], [('a10', 'a9'), ('a7', 'b7')], [('e9', 'e9')]]
+        self.assertEqual(write_archive(self.path, iter(games)), 4)
+        with GameArchive(self.path) as archive:
+            self.assertEqual(len(archive), 4)
+            self.assertEqual(archive[2], games[2])
+            self.assertEqual(archive[-1], games[-1])
+            self.assertEqual(list(archive), games)
+            self.assertEqual(bytes(archive.raw_moves(0)), bytes((56, 47, 2, 21)))
+            self.assertRaises(IndexError, archive.raw_moves, 4)
+            self.assertEqual(archive.replay(2).first_illegal, (1, ('a7', 'b7')))
+
+    def test_notAnArchive(self):
+        with open(self.path, "w") as file:
+            file.write("[Event \"Club\"]\n")
+        self.assertRaises(ArchiveError, GameArchive, self.path)
+
+
+class SearchTestCase(unittest.TestCase):
+    """SearchTestCase class tests the alpha-beta search in search.py."""
+
+    def test_findsMateInOne(self):
+        j = JanggiGame()
+        board = [[" "] * 9 for row in range(10)]
+        board[1][4] = "RGeneral"
+        board[9][4] = "BGeneral"
+        board[0][0] = "RChariot"
+        board[8][8] = "RChariot"
+        j._board_space = board
+        j.set_turn("Red")
+        result = Searcher(j).search(max_depth=3)
+        self.assertEqual(result.best_move, ('a1', 'a10'))
+        self.assertEqual(result.score, MATE_SCORE - 1)
+
+    def test_searchLeavesGameUnchanged(self):
+        j = JanggiGame()
+        j.make_move('c7', 'c6')
+        position = j.position_hash()
+        first = Searcher(j).search(max_depth=2)
+        second = Searcher(j).search(max_depth=2)
+        self.assertEqual(j.position_hash(), position)
+        self.assertEqual(len(j._move_stack), 1)
+        self.assertEqual(first.principal_variation, second.principal_variation)
+        self.assertEqual(first.nodes, second.nodes)
+        self.assertTrue(j.make_move(*first.best_move))
+
+    def test_nodeLimit(self):
+        j = JanggiGame()
+        result = Searcher(j).search(max_depth=10, node_limit=3000)
+        self.assertLess(result.depth, 10)
+        self.assertEqual(len(j._move_stack), 0)
+        self.assertIsNotNone(find_best_move(j, max_depth=1))
+
+    def test_transpositionTable(self):
+        table = TranspositionTable(size_mb=0.001)  # 32 buckets
+        self.assertEqual(table.memory_bytes(), 1024)
+        self.assertIsNone(table.probe(5))
+        table.store(5, 3, -MATE_SCORE + 4, EXACT, (13, 22))
+        self.assertEqual(table.probe(5), (3, -MATE_SCORE + 4, EXACT, (13, 22)))
+        table.store(37, 1, 50, LOWER_BOUND, None)  # same bucket, shallower, so it goes in the always-replace slot
+        table.store(69, 2, 60, LOWER_BOUND, None)  # replaces 37
+        self.assertIsNotNone(table.probe(5))
+        self.assertIsNone(table.probe(37))
+        self.assertEqual(table.probe(69), (2, 60, LOWER_BOUND, None))
+        self.assertEqual((table.hits, table.misses, table.collisions), (3, 2, 1))
+        table.new_search()  # entries from an earlier search give way in the depth-preferred slot
+        table.store(101, 1, 0, EXACT, None)
+        self.assertIsNone(table.probe(5))
+
+    def test_tableSharedAcrossSearches(self):
+        j = JanggiGame()
+        searcher = Searcher(j, TranspositionTable(size_mb=1))
+        first = searcher.search(max_depth=3)
+        self.assertGreater(searcher.table.hits, 0)
+        second = searcher.search(max_depth=3)
+        self.assertLess(second.nodes, first.nodes)
+        self.assertEqual(second.score, first.score)
+
+
+class EvaluationTestCase(unittest.TestCase):
+    """EvaluationTestCase class tests the static evaluation in evaluation.py."""
+
+    def test_openingIsEven(self):
+        j = JanggiGame()
+        self.assertEqual(evaluation_terms(j), {"material": 0, "piece_square": 0, "palace": 0, "mobility": 0,
+                                               "total": 0})
+        self.assertEqual(evaluate(j), 0)
+
+    def test_incrementalScore(self):
+        j = JanggiGame()
+        for from_location, to_location in [('c7', 'c6'), ('c1', 'd3'), ('c6', 'c5'), ('c4', 'c5')]:  # red takes
+            self.assertTrue(j.make_move(from_location, to_location))
+            self.assertEqual(j._piece_square_score, piece_square_score(j._board))
+        terms = evaluation_terms(j)
+        self.assertEqual(terms["material"], -200)  # red is a soldier up
+        self.assertEqual(evaluate(j), terms["total"])  # blue to move
+        self.assertTrue(j.undo_move())
+        self.assertEqual(j._piece_square_score, piece_square_score(j._board))
+        self.assertEqual(evaluate(j), -evaluation_terms(j)["total"])  # red to move
+
+
+@unittest.skipIf(evaluation.np is None, "NumPy is not installed")
+class BatchEvaluationTestCase(unittest.TestCase):
+    """BatchEvaluationTestCase class tests the NumPy batch evaluation in evaluation.py."""
+
+    def test_gamesToArray(self):
+        j = JanggiGame()
+        j.make_move('c7', 'c6')
+        boards = games_to_array([JanggiGame(), j])
+        self.assertEqual(boards.shape, (2, 10, 9))
+        self.assertEqual(boards.dtype, evaluation.np.int8)
+        self.assertEqual(bytes(boards[1].ravel()), bytes(j._board))
+        self.assertEqual(boards[1][5][2], 15)  # blue soldier moved to c6, [row][column] like _board_space
+
+    def test_evaluateBatch(self):
+        games = random_games(60, seed=3) + [position(name) for name in POSITIONS]
+        scores, attacks = evaluate_batch(games_to_array(games))
+        for game, score, attack in zip(games, scores, attacks):
+            self.assertEqual(score, piece_square_score(game._board))
+            expected = [len({to_square for from_square, to_square in game._pseudo_moves(color)
+                             if game._board[to_square]}) for color in (0, 8)]  # enemy pieces each color can capture
+            self.assertEqual(list(attack), expected)
+
+
+class PerftTestCase(unittest.TestCase):
+    """PerftTestCase class checks move generation counts from perft.py against known totals."""
+
+    def test_perftPositions(self):
+        expected = {"start": (31, 961), "horses": (42, 1760), "open-files": (49, 2213), "cannons": (42, 1736),
+                    "check": (8, 305), "palace": (3, 60)}
+        self.assertEqual(set(expected), set(POSITIONS))
+        for name, counts in expected.items():
+            j = position(name)
+            self.assertEqual((perft(j, 1), perft(j, 2)), counts, name)
+            self.assertEqual(j.to_fen(), POSITIONS[name])
+
+    def test_divide(self):
+        j = position("check")
+        results = divide(j, 2)
+        self.assertEqual(sum(nodes for from_location, to_location, nodes in results), 305)
+        self.assertEqual(sorted(move[:2] for move in results), sorted(j.generate_legal_moves("red")))
+
+
 if __name__ == '__main__':
     unittest.main()